@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Inmatic.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the app registry is ready; closes the async upstream clients on server shutdown
+from InvoicesAccounting.app.middleware.lifespan_middleware import LifespanMiddleware  # noqa: E402
+
+application = LifespanMiddleware(django_application)
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -31,6 +32,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'InvoicesAccounting.app.middleware.metrics_middleware.MetricsMiddleware',
+    'InvoicesAccounting.app.middleware.tracing_middleware.TracingMiddleware',
+    'InvoicesAccounting.app.middleware.performance_middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,6 +93,61 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+# Cache backend: "redis" when REDIS_URL is set and redis-py is installed, otherwise "locmem" or "file"
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis" if REDIS_URL else "locmem")
+
+if CACHE_BACKEND == "redis" and not (REDIS_URL and importlib.util.find_spec("redis")):
+    CACHE_BACKEND = "locmem"
+
+CACHE_BACKENDS = {
+    "locmem": {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'invoices',
+    },
+    "file": {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("CACHE_DIR", os.path.join(BASE_DIR, '.cache')),
+    },
+    "redis": {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Read-through cache for invoice details, in seconds
+INVOICE_CACHE_TTL = int(os.getenv("INVOICE_CACHE_TTL", "300"))
+INVOICE_CACHE_NEGATIVE_TTL = int(os.getenv("INVOICE_CACHE_NEGATIVE_TTL", "30"))
+
+# Seconds an upstream body is kept for revalidation with If-None-Match
+PAYMENT_API_CONDITIONAL_CACHE_TTL = int(os.getenv("PAYMENT_API_CONDITIONAL_CACHE_TTL", "3600"))
+
+# JSON encoder for API responses: auto (orjson when installed), orjson or stdlib
+JSON_RENDERER = os.getenv("JSON_RENDERER", "auto")
+
+# Per-request phase timings (DB, upstream, validation, rendering) and slow-request logging
+PERFORMANCE_INSTRUMENTATION = os.getenv("PERFORMANCE_INSTRUMENTATION", "True") == "True"
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "True") == "True"
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500"))
+
+# Prometheus metrics at /metrics/; with a multiprocess directory every worker writes its samples there and a scrape merges them
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_MULTIPROCESS_DIR = os.getenv("METRICS_MULTIPROCESS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+# Tracing spans for views, InvoiceService calls, upstream requests (traceparent propagated) and SQL queries
+# TRACING_EXPORTER: none, memory, file (JSON lines at TRACING_FILE_PATH) or a dotted path to a SpanExporter
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "False") == "True"
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "memory")
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "invoices-accounting")
+TRACING_MAX_SPANS_PER_TRACE = int(os.getenv("TRACING_MAX_SPANS_PER_TRACE", "1000"))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # DRF Settings
@@ -106,3 +165,40 @@ SWAGGER_SETTINGS = {
 
 # External API URL
 PAYMENT_API_BASE_URL = os.getenv("PAYMENT_API_BASE_URL", "http://127.0.0.1:8000")
+
+# Shared HTTP connection pool used for the external API
+PAYMENT_API_TIMEOUT = float(os.getenv("PAYMENT_API_TIMEOUT", "30"))
+PAYMENT_API_MAX_CONNECTIONS = int(os.getenv("PAYMENT_API_MAX_CONNECTIONS", "100"))
+PAYMENT_API_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PAYMENT_API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+PAYMENT_API_KEEPALIVE_EXPIRY = float(os.getenv("PAYMENT_API_KEEPALIVE_EXPIRY", "30"))
+PAYMENT_API_HTTP2 = os.getenv("PAYMENT_API_HTTP2", "False") == "True"
+
+# Per-operation timeouts, retries of idempotent calls and the circuit breaker guarding the external API
+PAYMENT_API_CONNECT_TIMEOUT = float(os.getenv("PAYMENT_API_CONNECT_TIMEOUT", "3"))
+PAYMENT_API_READ_TIMEOUT = float(os.getenv("PAYMENT_API_READ_TIMEOUT", "10"))
+PAYMENT_API_SYNC_READ_TIMEOUT = float(os.getenv("PAYMENT_API_SYNC_READ_TIMEOUT", "60"))
+PAYMENT_API_MAX_RETRIES = int(os.getenv("PAYMENT_API_MAX_RETRIES", "2"))
+PAYMENT_API_RETRY_BACKOFF = float(os.getenv("PAYMENT_API_RETRY_BACKOFF", "0.2"))
+PAYMENT_API_RETRY_BACKOFF_MAX = float(os.getenv("PAYMENT_API_RETRY_BACKOFF_MAX", "2"))
+PAYMENT_API_BREAKER_FAILURES = int(os.getenv("PAYMENT_API_BREAKER_FAILURES", "5"))
+PAYMENT_API_BREAKER_RESET_TIMEOUT = float(os.getenv("PAYMENT_API_BREAKER_RESET_TIMEOUT", "30"))
+
+# Upstream calls a fan-out over many invoice ids keeps in flight at once
+PAYMENT_API_MAX_CONCURRENCY = int(os.getenv("PAYMENT_API_MAX_CONCURRENCY", "10"))
+
+# Number of invoices diffed and written per transaction when syncing from the external API
+INVOICE_SYNC_BATCH_SIZE = int(os.getenv("INVOICE_SYNC_BATCH_SIZE", "1000"))
+
+# Seconds after a full sync during which local queries are trusted over the external API
+INVOICE_LOCAL_MAX_AGE = int(os.getenv("INVOICE_LOCAL_MAX_AGE", "300"))
+
+# Seconds after which list and detail views refresh local invoices from the external API in the
+# background while still answering from the local table (0 disables it); 0 workers refresh inline
+INVOICE_STALE_AFTER = int(os.getenv("INVOICE_STALE_AFTER", "0"))
+INVOICE_REFRESH_WORKERS = int(os.getenv("INVOICE_REFRESH_WORKERS", "2"))
+# Consecutive upstream 404s a detail refresh needs before it deletes the local invoice (0 never deletes)
+INVOICE_MISSING_CONFIRMATIONS = int(os.getenv("INVOICE_MISSING_CONFIRMATIONS", "3"))
+
+# Invoices sent per upstream call by the /invoices/bulk/ endpoints, and how many calls run at once
+INVOICE_BULK_CHUNK_SIZE = int(os.getenv("INVOICE_BULK_CHUNK_SIZE", "500"))
+INVOICE_BULK_MAX_WORKERS = int(os.getenv("INVOICE_BULK_MAX_WORKERS", "4"))
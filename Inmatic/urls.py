@@ -9,8 +9,24 @@ from InvoicesAccounting.resources.views.invoice_view import (
     create_invoice,
     update_invoice,
     delete_invoice,
+    bulk_invoices,
     filter_invoices,
+    summarize_invoices,
     generate_accounting_entries,
+    generate_accounting_entries_batch,
+    get_account_ledger,
+    get_trial_balance,
+    upstream_health,
+)
+from InvoicesAccounting.resources.views.metrics_view import metrics
+from InvoicesAccounting.resources.views.async_invoice_view import (
+    async_list_invoices,
+    async_get_invoice_detail,
+    async_create_invoice,
+    async_update_invoice,
+    async_delete_invoice,
+    async_filter_invoices,
+    async_generate_accounting_entries,
 )
 
 schema_view = get_schema_view(
@@ -37,12 +53,42 @@ urlpatterns = [
     # Delete an invoice (DELETE)
     path("invoices/<int:invoice_id>/delete/", delete_invoice, name="invoice-delete"),
 
+    # Create, update or delete many invoices from a JSON array or NDJSON body (POST, PUT, DELETE)
+    path("invoices/bulk/", bulk_invoices, name="invoice-bulk"),
+
     # Filter invoices based on query parameters (GET)
     path("invoices/filter/", filter_invoices, name="invoice-filter"),
 
+    # Counts and sums grouped by state, provider, month or date (GET)
+    path("invoices/summary/", summarize_invoices, name="invoice-summary"),
+
     # Generate accounting entries for an invoice (GET)
     path("invoices/<int:invoice_id>/accounting-entries/", generate_accounting_entries, name="invoice-accounting-entries"),
 
+    # Generate accounting entries for many invoices as NDJSON or CSV (GET, POST)
+    path("invoices/accounting-entries/batch/", generate_accounting_entries_batch, name="invoice-accounting-entries-batch"),
+
+    # Ledger entries of one account, optionally within a date range (GET)
+    path("accounting/ledger/<str:account>/", get_account_ledger, name="accounting-ledger"),
+
+    # Debit and credit totals per account, optionally within a date range (GET)
+    path("accounting/trial-balance/", get_trial_balance, name="accounting-trial-balance"),
+
+    # Circuit breaker state and retry counts of the external API (GET)
+    path("upstream/health/", upstream_health, name="upstream-health"),
+
+    # Request, upstream, cache, sync and connection metrics in Prometheus text format (GET)
+    path("metrics/", metrics, name="metrics"),
+
+    # Async variants of the invoice routes, meant to be served through Inmatic.asgi
+    path("async/invoices/", async_list_invoices, name="async-invoice-list"),
+    path("async/invoices/<int:invoice_id>/", async_get_invoice_detail, name="async-invoice-detail"),
+    path("async/invoices/create/", async_create_invoice, name="async-invoice-create"),
+    path("async/invoices/<int:invoice_id>/update/", async_update_invoice, name="async-invoice-update"),
+    path("async/invoices/<int:invoice_id>/delete/", async_delete_invoice, name="async-invoice-delete"),
+    path("async/invoices/filter/", async_filter_invoices, name="async-invoice-filter"),
+    path("async/invoices/<int:invoice_id>/accounting-entries/", async_generate_accounting_entries, name="async-invoice-accounting-entries"),
+
     # API Documentation UI
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
@@ -0,0 +1,105 @@
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class InvoiceCache:
+    # Entries hold the data and its ETag / Last-Modified, so conditional GETs on hot ids skip the database
+    KEY_PREFIX = "invoice:detail:v2"
+    # Stored for ids the upstream reported as missing, so repeated 404s stay cheap
+    MISSING = "__missing__"
+
+    def __init__(self, alias: str = "default", ttl: int = None, negative_ttl: int = None):
+        self.alias = alias
+        self.ttl = settings.INVOICE_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = settings.INVOICE_CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, invoice_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{invoice_id}"
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def build_entry(loaded) -> Optional[Dict]:
+        # Loaders return a local InvoiceModel (with validators) or an upstream dict (without)
+        if not loaded:
+            return None
+        if hasattr(loaded, "to_dict"):
+            return {"data": loaded.to_dict(), "etag": loaded.etag, "last_modified": loaded.updated_at}
+        return {"data": loaded, "etag": None, "last_modified": None}
+
+    def _store(self, invoice_id: int, entry: Optional[Dict]) -> Dict:
+        if entry:
+            return {"key": self.key(invoice_id), "value": entry, "timeout": self.ttl}
+        return {"key": self.key(invoice_id), "value": self.MISSING, "timeout": self.negative_ttl}
+
+    def get_or_load(self, invoice_id: int, loader: Callable[[int], object]) -> Optional[Dict]:
+        cached = self.cache.get(self.key(invoice_id))
+        self._record(cached is not None)
+
+        if cached is not None:
+            return None if cached == self.MISSING else cached["data"]
+
+        entry = self.build_entry(loader(invoice_id))
+        self.cache.set(**self._store(invoice_id, entry))
+        return entry["data"] if entry else None
+
+    async def aget_or_load(self, invoice_id: int, loader) -> Optional[Dict]:
+        cached = await self.cache.aget(self.key(invoice_id))
+        self._record(cached is not None)
+
+        if cached is not None:
+            return None if cached == self.MISSING else cached["data"]
+
+        entry = self.build_entry(await loader(invoice_id))
+        await self.cache.aset(**self._store(invoice_id, entry))
+        return entry["data"] if entry else None
+
+    def validators(self, invoice_id: int) -> Optional[Tuple[Optional[str], Optional[datetime]]]:
+        # None when nothing is cached; does not count as a lookup
+        cached = self.cache.get(self.key(invoice_id))
+        if cached is None:
+            return None
+        if cached == self.MISSING:
+            return None, None
+        return cached["etag"], cached["last_modified"]
+
+    def invalidate(self, invoice_id: int) -> None:
+        self.cache.delete(self.key(invoice_id))
+
+    def invalidate_many(self, invoice_ids: Iterable[int]) -> None:
+        keys = [self.key(invoice_id) for invoice_id in invoice_ids]
+        if keys:
+            self.cache.delete_many(keys)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+invoice_cache = InvoiceCache()
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class UpstreamResponseCache:
+    KEY_PREFIX = "upstream:response"
+
+    def __init__(self, alias: str = "default", ttl: int = None):
+        self.alias = alias
+        self.ttl = settings.PAYMENT_API_CONDITIONAL_CACHE_TTL if ttl is None else ttl
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, base_url: str, path: str) -> str:
+        # Hashed so arbitrary URLs stay valid keys on every backend
+        digest = hashlib.md5(f"{base_url}|{path}".encode(), usedforsecurity=False).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    def get(self, base_url: str, path: str) -> Optional[Dict]:
+        return self.cache.get(self.key(base_url, path))
+
+    def set(self, base_url: str, path: str, etag: str, body) -> None:
+        self.cache.set(self.key(base_url, path), {"etag": etag, "body": body}, timeout=self.ttl)
+
+
+upstream_response_cache = UpstreamResponseCache()
@@ -0,0 +1,53 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db.models import Count, Max, Sum
+
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+
+def invoice_validators(request, invoice_id: int) -> Tuple[Optional[str], Optional[datetime]]:
+    # etag_func and last_modified_func both need the row, so look it up once per request
+    cache_attribute = f"_invoice_validators_{invoice_id}"
+
+    if not hasattr(request, cache_attribute):
+        # Cached detail entries carry their validators; only a cache miss reads the row
+        validators = invoice_cache.validators(invoice_id)
+        if validators is None:
+            invoice = InvoiceModel.objects.filter(id=invoice_id).only("id", "version", "updated_at").first()
+            validators = (invoice.etag, invoice.updated_at) if invoice else (None, None)
+        setattr(request, cache_attribute, validators)
+
+    return getattr(request, cache_attribute)
+
+
+def invoice_etag(request, invoice_id: int) -> Optional[str]:
+    return invoice_validators(request, invoice_id)[0]
+
+
+def invoice_last_modified(request, invoice_id: int) -> Optional[datetime]:
+    return invoice_validators(request, invoice_id)[1]
+
+
+def accounting_entries_etag(request, invoice_id: int) -> Optional[str]:
+    etag = invoice_etag(request, invoice_id)
+    return f'{etag[:-1]}-entries"' if etag else None
+
+
+def invoice_list_etag(request) -> Optional[str]:
+    # Derived from the table itself, so writes from other workers and the sync command move
+    # it too: count and max(id) catch inserts and deletes, max(updated_at) and sum(version)
+    # catch updates. No Last-Modified for lists since a delete would not move it forward
+    state = InvoiceModel.objects.aggregate(
+        count=Count("id"), last_id=Max("id"), last_updated=Max("updated_at"), versions=Sum("version"),
+    )
+
+    # An empty table serves the upstream list, which is not versioned
+    if not state["count"]:
+        return None
+
+    last_updated = state["last_updated"].isoformat() if state["last_updated"] else ""
+    raw = f"{state['count']}:{state['last_id']}:{last_updated}:{state['versions']}:{request.GET.urlencode()}"
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
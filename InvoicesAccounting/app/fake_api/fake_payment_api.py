@@ -0,0 +1,303 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode
+
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential")
+
+INVOICE_PATH = re.compile(r"^invoices/(\d+)/$")
+ENTRIES_PATH = re.compile(r"^invoices/(\d+)/accounting-entries/$")
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 204: "No Content", 207: "Multi-Status", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 429: "Too Many Requests", 500: "Internal Server Error",
+    502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+def parse_latency(spec: Optional[str]) -> Callable[[random.Random], float]:
+    # "fixed:50", "uniform:10:200", "normal:80:20" or "exponential:50", all in milliseconds
+    if not spec:
+        return lambda rng: 0.0
+
+    name, *raw_args = spec.split(":")
+    if name not in LATENCY_DISTRIBUTIONS:
+        raise ValueError("Invalid latency distribution. Allowed values: " + ", ".join(LATENCY_DISTRIBUTIONS))
+
+    try:
+        args = [float(arg) / 1000 for arg in raw_args]
+    except ValueError:
+        raise ValueError(f"Invalid latency '{spec}'. Arguments must be numbers.")
+
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "exponential": 1}[name]
+    if len(args) != expected or any(arg < 0 for arg in args):
+        raise ValueError(f"Invalid latency '{spec}'. '{name}' takes {expected} non-negative argument(s).")
+
+    if name == "fixed":
+        return lambda rng: args[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if name == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    return lambda rng: rng.expovariate(1 / args[0]) if args[0] else 0.0
+
+
+@dataclass
+class FakePaymentApiConfig:
+    invoices: int = 1_000
+    seed: int = 42
+    latency: Optional[str] = None
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 502, 503)
+    slow_body_ms: float = 0.0
+    chunk_size: int = 16_384
+    page_size: int = 0
+    prefix: str = "/"
+
+
+class FakePaymentApi:
+
+    def __init__(self, config: Optional[FakePaymentApiConfig] = None):
+        self.config = config or FakePaymentApiConfig()
+
+        if not 0 <= self.config.error_rate <= 1:
+            raise ValueError("Error rate must be between 0 and 1.")
+        if self.config.chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than zero.")
+
+        self.latency = parse_latency(self.config.latency)
+        self.rng = random.Random(self.config.seed)
+        self.invoices: Dict[int, Dict] = {}
+        self.next_id = 1
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+        self.seed(self.config.invoices)
+
+    def seed(self, count: int) -> None:
+        states = InvoiceStates.values
+        first_day = date(2024, 1, 1)
+
+        with self._lock:
+            for _ in range(count):
+                base_value = (Decimal(self.rng.randint(100, 1_000_000)) / 100).quantize(Decimal("0.01"))
+                vat = (base_value * Decimal("0.21")).quantize(Decimal("0.01"))
+                self._store({
+                    "provider": f"Provider {self.next_id % 50}",
+                    "concept": f"Fake invoice {self.next_id}",
+                    "base_value": str(base_value),
+                    "vat": str(vat),
+                    "total_value": str(base_value + vat),
+                    "date": (first_day + timedelta(days=self.next_id % 365)).isoformat(),
+                    "state": states[self.next_id % len(states)],
+                })
+
+    def _store(self, data: Dict, invoice_id: Optional[int] = None) -> Dict:
+        invoice_id = invoice_id or self.next_id
+        self.next_id = max(self.next_id, invoice_id + 1)
+
+        invoice = {**self.invoices.get(invoice_id, {}), **data, "id": invoice_id}
+        invoice["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self.invoices[invoice_id] = invoice
+        return invoice
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"invoices": len(self.invoices), **self.counters}
+
+    def __call__(self, environ, start_response):
+        method = environ["REQUEST_METHOD"].upper()
+        path = environ.get("PATH_INFO", "/")
+        prefix = self.config.prefix.rstrip("/") + "/"
+        path = path[len(prefix):] if path.startswith(prefix) else path.lstrip("/")
+
+        with self._lock:
+            self.counters["requests"] += 1
+
+        delay = self.latency(self.rng)
+        if delay:
+            time.sleep(delay)
+
+        if path != "__fake__/stats/" and self.rng.random() < self.config.error_rate:
+            with self._lock:
+                self.counters["injected_errors"] += 1
+            return self._respond(start_response, self.rng.choice(self.config.error_statuses), {"error": "Injected fault"})
+
+        try:
+            status, payload, headers = self.route(method, path, parse_qs(environ.get("QUERY_STRING", "")), environ)
+        except (ValueError, KeyError) as e:
+            status, payload, headers = 400, {"error": str(e)}, {}
+
+        if status == 200 and headers.get("ETag") and environ.get("HTTP_IF_NONE_MATCH") == headers["ETag"]:
+            status, payload = 304, None
+
+        return self._respond(start_response, status, payload, headers)
+
+    def route(self, method: str, path: str, query: Dict[str, List[str]], environ) -> Tuple[int, object, Dict]:
+        if path == "__fake__/stats/":
+            return 200, self.stats(), {}
+
+        if path == "invoices/":
+            if method == "GET":
+                return self.list_invoices(query)
+            if method == "POST":
+                with self._lock:
+                    return 201, self._store(self._read_json(environ)), {}
+
+        elif path == "invoices/filter/" and method == "GET":
+            return 200, self.filter_invoices(query), {}
+
+        elif path == "invoices/bulk/":
+            return self.bulk(method, self._read_json(environ))
+
+        elif INVOICE_PATH.match(path):
+            return self.invoice(method, int(INVOICE_PATH.match(path).group(1)), environ)
+
+        elif ENTRIES_PATH.match(path) and method == "GET":
+            invoice = self.invoices.get(int(ENTRIES_PATH.match(path).group(1)))
+            if invoice is None:
+                return 404, {"error": "Invoice not found"}, {}
+            return 200, {"entries": self.accounting_entries(invoice)}, self._etag(invoice)
+
+        else:
+            return 404, {"error": "Not found"}, {}
+
+        return 405, {"error": f"Method {method} not allowed"}, {}
+
+    def list_invoices(self, query: Dict[str, List[str]]) -> Tuple[int, object, Dict]:
+        with self._lock:
+            invoices = sorted(self.invoices.values(), key=lambda invoice: invoice["id"])
+
+        since_id = int(query.get("since_id", ["0"])[0])
+        updated_since = query.get("updated_since", [""])[0]
+        updated_since = datetime.fromisoformat(updated_since) if updated_since else None
+        after = int(query.get("after", ["0"])[0])
+
+        invoices = [
+            invoice for invoice in invoices
+            if invoice["id"] > max(since_id, after) and (updated_since is None or datetime.fromisoformat(invoice["updated_at"]) > updated_since)
+        ]
+
+        # The whole-collection ETag only changes when some invoice does
+        digest = hashlib.md5(usedforsecurity=False)
+        for invoice in invoices:
+            digest.update(f"{invoice['id']}:{invoice['updated_at']};".encode())
+        headers = {"ETag": f'"{digest.hexdigest()}"'}
+
+        if not self.config.page_size:
+            return 200, invoices, headers
+
+        page = invoices[:self.config.page_size]
+        next_url = None
+        if len(invoices) > self.config.page_size:
+            params = {key: values[0] for key, values in query.items() if key != "after"}
+            next_url = "invoices/?" + urlencode({**params, "after": page[-1]["id"]})
+
+        return 200, {"results": page, "next": next_url}, headers
+
+    def filter_invoices(self, query: Dict[str, List[str]]) -> List[Dict]:
+        with self._lock:
+            invoices = list(self.invoices.values())
+
+        states = [state for raw in query.get("state", []) for state in raw.split(",") if state]
+        providers = query.get("provider", [])
+        start_date = query.get("start_date", [""])[0]
+        end_date = query.get("end_date", [""])[0]
+        min_amount = query.get("min_amount", [None])[0]
+        max_amount = query.get("max_amount", [None])[0]
+
+        if states:
+            invoices = [invoice for invoice in invoices if invoice["state"] in states]
+        if providers:
+            invoices = [invoice for invoice in invoices if invoice["provider"] in providers]
+        if start_date and end_date:
+            invoices = [invoice for invoice in invoices if start_date <= invoice["date"] <= end_date]
+        if min_amount is not None:
+            invoices = [invoice for invoice in invoices if Decimal(invoice["total_value"]) >= Decimal(min_amount)]
+        if max_amount is not None:
+            invoices = [invoice for invoice in invoices if Decimal(invoice["total_value"]) <= Decimal(max_amount)]
+
+        ordering = query.get("ordering", ["id"])[0]
+        key = ordering.lstrip("-")
+        invoices.sort(key=lambda invoice: (Decimal(invoice[key]) if key == "total_value" else invoice[key], invoice["id"]), reverse=ordering.startswith("-"))
+
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["100"])[0])
+        return invoices[offset:offset + limit]
+
+    def invoice(self, method: str, invoice_id: int, environ) -> Tuple[int, object, Dict]:
+        with self._lock:
+            invoice = self.invoices.get(invoice_id)
+
+            if invoice is None:
+                return 404, {"error": "Invoice not found"}, {}
+
+            if method == "GET":
+                return 200, invoice, self._etag(invoice)
+            if method == "PUT":
+                invoice = self._store(self._read_json(environ), invoice_id)
+                return 200, invoice, self._etag(invoice)
+            if method == "DELETE":
+                del self.invoices[invoice_id]
+                return 204, None, {}
+
+        return 405, {"error": f"Method {method} not allowed"}, {}
+
+    def bulk(self, method: str, payload) -> Tuple[int, object, Dict]:
+        with self._lock:
+            if method == "POST":
+                return 201, [self._store(item) for item in payload], {}
+            if method == "PUT":
+                return 200, [self._store(item, item["id"]) for item in payload if item.get("id") in self.invoices], {}
+            if method == "DELETE":
+                deleted = [invoice_id for invoice_id in payload.get("ids", []) if self.invoices.pop(invoice_id, None)]
+                return 200, {"deleted": len(deleted)}, {}
+
+        return 405, {"error": f"Method {method} not allowed"}, {}
+
+    @staticmethod
+    def accounting_entries(invoice: Dict) -> List[Dict]:
+        return [
+            {"account": AccountingCodes.PURCHASES.value, "description": AccountingCodes.PURCHASES.label, "amount": invoice["base_value"]},
+            {"account": AccountingCodes.VAT_SUPPORTED.value, "description": AccountingCodes.VAT_SUPPORTED.label, "amount": invoice["vat"]},
+            {"account": AccountingCodes.SUPPLIERS.value, "description": AccountingCodes.SUPPLIERS.label, "amount": invoice["total_value"]},
+        ]
+
+    @staticmethod
+    def _etag(invoice: Dict) -> Dict:
+        return {"ETag": f'"{invoice["id"]}-{invoice["updated_at"]}"'}
+
+    @staticmethod
+    def _read_json(environ):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _respond(self, start_response, status: int, payload=None, headers: Optional[Dict] = None):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        response_headers = [("Content-Type", "application/json"), ("Content-Length", str(len(body))), *(headers or {}).items()]
+
+        start_response(f"{status} {STATUS_TEXT.get(status, 'Unknown')}", response_headers)
+        return self._body_chunks(body)
+
+    def _body_chunks(self, body: bytes) -> Iterator[bytes]:
+        # A slow body trickles out chunk by chunk, which is what read timeouts are for
+        if not self.config.slow_body_ms:
+            yield body
+            return
+
+        for start in range(0, len(body), self.config.chunk_size):
+            if start:
+                time.sleep(self.config.slow_body_ms / 1000)
+            yield body[start:start + self.config.chunk_size]
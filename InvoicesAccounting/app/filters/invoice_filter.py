@@ -0,0 +1,126 @@
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List
+
+from django.db.models import QuerySet
+from django.utils.dateparse import parse_date
+
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+class InvoiceFilter:
+    ORDERING_FIELDS = ("id", "date", "provider", "total_value", "state")
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
+    def __init__(self, params):
+        self.filters: Dict = {}
+        self.upstream_params: Dict = {}
+
+        states = self._list_param(params, "state")
+        invalid_states = [state for state in states if state not in InvoiceStates.values]
+        if invalid_states:
+            raise InvalidFilter("Invalid state filter. Allowed values: " + ", ".join(InvoiceStates.values))
+
+        if len(states) == 1:
+            self.filters["state"] = states[0]
+        elif states:
+            self.filters["state__in"] = states
+
+        if states:
+            self.upstream_params["state"] = ",".join(states)
+
+        providers = [provider for provider in params.getlist("provider") if provider]
+        if len(providers) == 1:
+            self.filters["provider"] = providers[0]
+        elif providers:
+            self.filters["provider__in"] = providers
+
+        if providers:
+            self.upstream_params["provider"] = providers
+
+        start_date = params.get("start_date")
+        end_date = params.get("end_date")
+
+        if start_date and end_date:
+            start_date = parse_date(start_date)
+            end_date = parse_date(end_date)
+
+            if start_date and end_date:
+                self.filters["date__range"] = (start_date, end_date)
+                self.upstream_params["start_date"] = start_date.isoformat()
+                self.upstream_params["end_date"] = end_date.isoformat()
+
+        min_amount = self._decimal_param(params, "min_amount")
+        if min_amount is not None:
+            self.filters["total_value__gte"] = min_amount
+            self.upstream_params["min_amount"] = str(min_amount)
+
+        max_amount = self._decimal_param(params, "max_amount")
+        if max_amount is not None:
+            self.filters["total_value__lte"] = max_amount
+            self.upstream_params["max_amount"] = str(max_amount)
+
+        ordering = params.get("ordering") or "id"
+        if ordering.lstrip("-") not in self.ORDERING_FIELDS:
+            raise InvalidFilter("Invalid ordering. Allowed values: " + ", ".join(self.ORDERING_FIELDS))
+
+        # "id" breaks ties so offset pages never overlap
+        self.ordering = [ordering] if ordering.lstrip("-") == "id" else [ordering, "id"]
+        self.upstream_params["ordering"] = ordering
+
+        self.limit = self._int_param(params, "limit", self.DEFAULT_LIMIT, minimum=1)
+        self.limit = min(self.limit, self.MAX_LIMIT)
+        self.offset = self._int_param(params, "offset", 0, minimum=0)
+        self.upstream_params["limit"] = self.limit
+        self.upstream_params["offset"] = self.offset
+
+    @staticmethod
+    def _list_param(params, name: str) -> List[str]:
+        values = []
+        for raw_value in params.getlist(name):
+            values.extend(value.strip() for value in raw_value.split(",") if value.strip())
+        return values
+
+    @staticmethod
+    def _decimal_param(params, name: str):
+        raw_value = params.get(name)
+        if raw_value in (None, ""):
+            return None
+
+        try:
+            value = Decimal(raw_value)
+        except InvalidOperation:
+            value = None
+
+        if value is None or not value.is_finite():
+            raise InvalidFilter(f"Invalid {name}. It must be a decimal number.")
+
+        return value
+
+    @staticmethod
+    def _int_param(params, name: str, default: int, minimum: int) -> int:
+        raw_value = params.get(name)
+        if raw_value in (None, ""):
+            return default
+
+        try:
+            value = int(raw_value)
+        except ValueError:
+            raise InvalidFilter(f"Invalid {name}. It must be an integer.")
+
+        if value < minimum:
+            raise InvalidFilter(f"Invalid {name}. It must be at least {minimum}.")
+
+        return value
+
+    def queryset(self) -> QuerySet:
+        # Served by the (state, date), (provider, date) and (date) indexes
+        return InvoiceModel.objects.filter(**self.filters)
+
+    def page(self) -> QuerySet:
+        return self.queryset().order_by(*self.ordering)[self.offset:self.offset + self.limit]
@@ -0,0 +1,96 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class RequestMetrics:
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # phase -> [count, seconds]
+        self.phases: Dict[str, List] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        totals = self.phases.get(phase)
+        if totals is None:
+            self.phases[phase] = [1, seconds]
+        else:
+            totals[0] += 1
+            totals[1] += seconds
+
+    def count(self, phase: str) -> int:
+        return self.phases.get(phase, (0, 0.0))[0]
+
+    def seconds(self, phase: str) -> float:
+        return self.phases.get(phase, (0, 0.0))[1]
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict:
+        return {
+            phase: {"count": count, "ms": round(seconds * 1000, 3)}
+            for phase, (count, seconds) in self.phases.items()
+        }
+
+
+# Copied into sync_to_async threads, so queries run from async views land on the right request
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def start_request() -> Tuple[RequestMetrics, Token]:
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(phase, time.perf_counter() - started)
+
+
+def time_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record("db", time.perf_counter() - started)
+
+
+def install_query_timer(connection, **kwargs) -> None:
+    # Below any wrapper already active: connection.execute_wrapper() pops the last entry on
+    # exit, so appending while one is open (e.g. a query counter) would swap them out
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def install_query_timers() -> None:
+    # Connections are per thread and opened lazily, so hook every new one and the ones already open
+    connection_created.connect(install_query_timer, dispatch_uid="request_metrics_query_timer")
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(connection)
@@ -0,0 +1,169 @@
+import atexit
+import re
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.metrics.metrics_registry import MetricsRegistry
+from InvoicesAccounting.app.services.resilience import CircuitBreaker, circuit_breakers
+from InvoicesAccounting.app.services.single_flight import single_flight
+
+metrics_registry = MetricsRegistry(settings.METRICS_MULTIPROCESS_DIR or None, settings.METRICS_FLUSH_INTERVAL)
+
+http_requests = metrics_registry.counter(
+    "http_requests_total", "Requests served, by route, method and status.", ["route", "method", "status"]
+)
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds", "Time to produce a response, by route and method.", ["route", "method"]
+)
+upstream_requests = metrics_registry.counter(
+    "upstream_requests_total", "Calls to the payment API, by HTTP method, endpoint and status or error.", ["method", "endpoint", "status"]
+)
+upstream_request_duration = metrics_registry.histogram(
+    "upstream_request_duration_seconds", "Payment API call time including retries, by HTTP method and endpoint.", ["method", "endpoint"]
+)
+sync_rows = metrics_registry.counter(
+    "invoice_sync_rows_total", "Invoices processed by the sync, by outcome.", ["result"]
+)
+sync_batch_duration = metrics_registry.histogram(
+    "invoice_sync_batch_duration_seconds", "Time to write one sync batch.", buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+db_connections_created = metrics_registry.counter(
+    "db_connections_created_total", "Database connections opened, by alias.", ["alias"]
+)
+
+# Upstream ids become {id} so every invoice shares one series
+ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/)|^\d+(?=/)")
+
+BREAKER_STATES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+_open_connections = weakref.WeakSet()
+_connections_lock = threading.Lock()
+
+
+def endpoint_template(url: str) -> str:
+    return ID_SEGMENT.sub("{id}", url.split("?", 1)[0].lstrip("/"))
+
+
+def observe_request(route: str, method: str, status: int, seconds: float) -> None:
+    http_requests.inc(route=route, method=method, status=status)
+    http_request_duration.observe(seconds, route=route, method=method)
+
+
+def observe_sync_batch(report, seconds: float) -> None:
+    for result in ("inserted", "updated", "unchanged"):
+        count = getattr(report, result)
+        if count:
+            sync_rows.inc(count, result=result)
+    sync_batch_duration.observe(seconds)
+
+
+class UpstreamTimer:
+    # Records one logical upstream call; the status is the response code or the exception name
+
+    def __init__(self, method: str, url: str):
+        self.method = method.upper()
+        self.endpoint = endpoint_template(url)
+        self.status = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        status = exc_type.__name__ if exc_type is not None else self.status
+        upstream_requests.inc(method=self.method, endpoint=self.endpoint, status=status)
+        upstream_request_duration.observe(time.perf_counter() - self.started, method=self.method, endpoint=self.endpoint)
+        return False
+
+
+def track_connection(sender, connection, **kwargs) -> None:
+    db_connections_created.inc(alias=connection.alias)
+    with _connections_lock:
+        _open_connections.add(connection)
+
+
+connection_created.connect(track_connection, dispatch_uid="invoice_metrics_track_connection")
+
+
+def collect_db_connections() -> Iterable[Dict]:
+    # Django keeps one connection per thread instead of a pool, so count the ones still open
+    counts: Dict[str, int] = {}
+    with _connections_lock:
+        for connection in list(_open_connections):
+            if connection.connection is not None:
+                counts[connection.alias] = counts.get(connection.alias, 0) + 1
+
+    yield {
+        "name": "db_connections_open",
+        "kind": "gauge",
+        "help": "Open database connections, by alias.",
+        "aggregation": "sum",
+        "samples": [[{"alias": alias}, count] for alias, count in counts.items()],
+    }
+
+
+def collect_upstream_health() -> Iterable[Dict]:
+    breakers = circuit_breakers.stats()
+
+    yield {
+        "name": "upstream_circuit_state",
+        "kind": "gauge",
+        "help": "Circuit breaker state per upstream: 0 closed, 1 half-open, 2 open.",
+        "aggregation": "max",
+        "samples": [[{"upstream": stats["name"]}, BREAKER_STATES[stats["state"]]] for stats in breakers],
+    }
+    yield {
+        "name": "upstream_circuit_events_total",
+        "kind": "counter",
+        "help": "Circuit breaker calls, failures, retries, rejections and openings per upstream.",
+        "samples": [
+            [{"upstream": stats["name"], "event": event}, stats[event]]
+            for stats in breakers
+            for event in ("calls", "failures", "retries", "rejected", "opened")
+        ],
+    }
+
+    coalescing = single_flight.stats()
+    yield {
+        "name": "upstream_single_flight_calls_total",
+        "kind": "counter",
+        "help": "Coalesced upstream calls: executed ran the request, shared reused another caller's.",
+        "samples": [[{"result": result}, coalescing[result]] for result in ("executed", "shared")],
+    }
+
+
+def collect_invoice_cache() -> Iterable[Dict]:
+    stats = invoice_cache.stats()
+
+    yield {
+        "name": "invoice_cache_lookups_total",
+        "kind": "counter",
+        "help": "Invoice detail cache lookups, by result.",
+        "samples": [[{"result": "hit"}, stats["hits"]], [{"result": "miss"}, stats["misses"]]],
+    }
+
+
+def derive_cache_hit_ratio(families: Dict[str, Dict]) -> List[Dict]:
+    lookups = {labels["result"]: value for labels, value in families.get("invoice_cache_lookups_total", {}).get("samples", [])}
+    total = lookups.get("hit", 0) + lookups.get("miss", 0)
+
+    return [{
+        "name": "invoice_cache_hit_ratio",
+        "kind": "gauge",
+        "help": "Share of invoice detail lookups served from the cache, across all processes.",
+        "samples": [[{}, lookups.get("hit", 0) / total if total else 0.0]],
+    }]
+
+
+metrics_registry.register_collector(collect_db_connections)
+metrics_registry.register_collector(collect_upstream_health)
+metrics_registry.register_collector(collect_invoice_cache)
+metrics_registry.register_derived(derive_cache_hit_ratio)
+
+atexit.register(metrics_registry.flush)
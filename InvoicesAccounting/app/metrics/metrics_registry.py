@@ -0,0 +1,294 @@
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# How gauges from several processes combine; counters and histograms always add up
+GAUGE_AGGREGATIONS = ("sum", "max")
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames) or '(none)'}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def family(self) -> Dict:
+        with self._lock:
+            samples = [[dict(zip(self.labelnames, key)), value] for key, value in self.values.items()]
+        return {"name": self.name, "kind": self.kind, "help": self.documentation, "samples": samples}
+
+    def clear(self) -> None:
+        with self._lock:
+            self.values.clear()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregation: str = "sum"):
+        super().__init__(name, documentation, labelnames)
+        if aggregation not in GAUGE_AGGREGATIONS:
+            raise ValueError("Invalid gauge aggregation. Allowed values: " + ", ".join(GAUGE_AGGREGATIONS))
+        self.aggregation = aggregation
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def family(self) -> Dict:
+        return {**super().family(), "aggregation": self.aggregation}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts plus the +Inf slot, then sum and count
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def family(self) -> Dict:
+        with self._lock:
+            samples = [
+                [dict(zip(self.labelnames, key)), {**series, "buckets": list(series["buckets"])}]
+                for key, series in self.values.items()
+            ]
+        return {"name": self.name, "kind": self.kind, "help": self.documentation, "bounds": list(self.buckets), "samples": samples}
+
+
+class MetricsRegistry:
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_interval: float = 5.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Dict]]] = []
+        self._derived: List[Callable[[Dict[str, Dict]], Iterable[Dict]]] = []
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind:
+                    raise ValueError(f"Metric {metric.name} is already registered as a {existing.kind}.")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregation: str = "sum") -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, aggregation))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Dict]]) -> None:
+        # Collectors read state that lives elsewhere (breakers, caches) when a snapshot is taken
+        self._collectors.append(collector)
+
+    def register_derived(self, derive: Callable[[Dict[str, Dict]], Iterable[Dict]]) -> None:
+        # Derived families (ratios) are computed after processes are merged, never summed
+        self._derived.append(derive)
+
+    def families(self) -> List[Dict]:
+        families = [metric.family() for metric in list(self._metrics.values())]
+
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.error(f"Error collecting metrics: {str(e)}")
+
+        return families
+
+    def clear(self) -> None:
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    # Multiprocess mode: every worker writes its families to its own file, the scrape merges them
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics-{pid}.json")
+
+    def flush(self) -> None:
+        if not self.multiprocess_dir:
+            return
+
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = self._path(os.getpid())
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+
+        with open(temporary, "w") as output:
+            json.dump({"pid": os.getpid(), "families": self.families()}, output)
+        # Atomic on POSIX, so a scrape never reads half a file
+        os.replace(temporary, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self) -> None:
+        if self.multiprocess_dir and time.monotonic() - self._last_flush >= self.flush_interval:
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"Error writing metrics: {str(e)}")
+
+    def collect(self) -> List[Dict]:
+        if not self.multiprocess_dir:
+            return self.merge([self.families()])
+
+        self.flush()
+
+        snapshots = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*.json")):
+            try:
+                with open(path) as source:
+                    snapshot = json.load(source)
+            except (OSError, ValueError):
+                continue
+
+            # Counters of exited workers still count, their gauges no longer describe anything
+            alive = process_alive(snapshot["pid"])
+            snapshots.append([family for family in snapshot["families"] if alive or family["kind"] != "gauge"])
+
+        return self.merge(snapshots)
+
+    def merge(self, snapshots: List[List[Dict]]) -> List[Dict]:
+        merged: Dict[str, Dict] = {}
+
+        for families in snapshots:
+            for family in families:
+                target = merged.setdefault(family["name"], {**family, "samples": {}})
+
+                for labels, value in family["samples"]:
+                    key = tuple(sorted(labels.items()))
+                    current = target["samples"].get(key)
+
+                    if current is None:
+                        target["samples"][key] = value
+                    elif family["kind"] == "histogram":
+                        current["buckets"] = [left + right for left, right in zip(current["buckets"], value["buckets"])]
+                        current["sum"] += value["sum"]
+                        current["count"] += value["count"]
+                    elif family["kind"] == "gauge" and family.get("aggregation") == "max":
+                        target["samples"][key] = max(current, value)
+                    else:
+                        target["samples"][key] = current + value
+
+        for family in merged.values():
+            family["samples"] = [[dict(key), value] for key, value in family["samples"].items()]
+
+        for derive in self._derived:
+            for family in derive(merged):
+                merged[family["name"]] = family
+
+        return list(merged.values())
+
+    def render(self) -> str:
+        lines = []
+
+        for family in self.collect():
+            lines.append(f"# HELP {family['name']} {escape_help(family['help'])}")
+            lines.append(f"# TYPE {family['name']} {family['kind']}")
+
+            for labels, value in sorted(family["samples"], key=lambda sample: sorted(sample[0].items())):
+                if family["kind"] == "histogram":
+                    lines.extend(render_histogram(family["name"], family["bounds"], labels, value))
+                else:
+                    lines.append(f"{family['name']}{render_labels(labels)} {format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+    return repr(float(value))
+
+
+def render_histogram(name: str, bounds: List[float], labels: Dict, series: Dict) -> List[str]:
+    lines = []
+    cumulative = 0
+
+    for bound, count in zip([*bounds, math.inf], series["buckets"]):
+        cumulative += count
+        le = "+Inf" if math.isinf(bound) else repr(float(bound))
+        lines.append(f"{name}_bucket{render_labels({**labels, 'le': le})} {format_value(cumulative)}")
+
+    lines.append(f"{name}_sum{render_labels(labels)} {format_value(series['sum'])}")
+    lines.append(f"{name}_count{render_labels(labels)} {format_value(series['count'])}")
+    return lines
@@ -0,0 +1,33 @@
+import logging
+
+from InvoicesAccounting.app.services.http_client_registry import async_http_client_registry
+
+logger = logging.getLogger(__name__)
+
+
+class LifespanMiddleware:
+    # Django's ASGI handler rejects lifespan scopes, so answer them here and close the
+    # AsyncClients on shutdown. They are bound to the serving loop, which is the one
+    # running the lifespan protocol, so aclose_all() reaches every pooled connection
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            await self.application(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    await async_http_client_registry.aclose_all()
+                except Exception as e:
+                    logger.error(f"Error closing HTTP clients: {str(e)}")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,44 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from InvoicesAccounting.app.metrics.invoice_metrics import metrics_registry, observe_request
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self.finish(request, response, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self.finish(request, response, time.perf_counter() - started)
+
+    @staticmethod
+    def finish(request, response, elapsed: float):
+        # The URL pattern, not the path, so invoice ids do not explode the label set
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+
+        observe_request(route, request.method, response.status_code, elapsed)
+        metrics_registry.maybe_flush()
+        return response
@@ -0,0 +1,92 @@
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from InvoicesAccounting.app.instrumentation.request_metrics import (
+    RequestMetrics,
+    end_request,
+    start_request,
+)
+from InvoicesAccounting.app.tracing.tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+# Phases listed first in Server-Timing, anything else recorded follows in insertion order
+TIMING_PHASES = ("db", "upstream", "validation", "render")
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.slow_request_threshold = settings.SLOW_REQUEST_THRESHOLD_MS / 1000
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics: RequestMetrics):
+        elapsed = metrics.elapsed()
+
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = self.server_timing(metrics, elapsed)
+
+        if elapsed >= self.slow_request_threshold:
+            self.log_slow_request(request, response, metrics, elapsed)
+
+        return response
+
+    @staticmethod
+    def server_timing(metrics: RequestMetrics, elapsed: float) -> str:
+        phases = [phase for phase in TIMING_PHASES if phase in metrics.phases]
+        phases += [phase for phase in metrics.phases if phase not in TIMING_PHASES]
+
+        entries = [
+            f'{phase};dur={metrics.seconds(phase) * 1000:.1f};desc="{metrics.count(phase)}"'
+            for phase in phases
+        ]
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+        return ", ".join(entries)
+
+    @staticmethod
+    def log_slow_request(request, response, metrics: RequestMetrics, elapsed: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        span = tracer.current_span()
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(elapsed * 1000, 3),
+            "phases": metrics.as_dict(),
+            "trace_id": span.trace_id if span else None,
+        }
+        logger.warning(f"Slow request: {json.dumps(record)}", extra={"performance": record})
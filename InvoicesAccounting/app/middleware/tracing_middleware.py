@@ -0,0 +1,51 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from InvoicesAccounting.app.tracing.tracer import tracer
+
+
+class TracingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TRACING_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with tracer.start_span(f"{request.method} {request.path}", kind="server", traceparent=request.headers.get("traceparent")) as span:
+            response = self.get_response(request)
+            return self.finish(request, response, span)
+
+    async def __acall__(self, request):
+        with tracer.start_span(f"{request.method} {request.path}", kind="server", traceparent=request.headers.get("traceparent")) as span:
+            response = await self.get_response(request)
+            return self.finish(request, response, span)
+
+    @staticmethod
+    def finish(request, response, span):
+        # Renamed to the route once resolved, so spans of one endpoint group together
+        match = getattr(request, "resolver_match", None)
+        if match is not None and span.sampled:
+            span.name = f"{request.method} {match.route}"
+            span.set_attribute("http.route", match.route)
+            span.set_attribute("view", match.view_name)
+
+        span.set_attribute("http.method", request.method)
+        span.set_attribute("http.target", request.get_full_path())
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.status = "error"
+
+        if span.trace_id:
+            response["X-Trace-Id"] = span.trace_id
+        return response
@@ -0,0 +1,21 @@
+from django.db import models
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+
+class AccountingEntryModel(models.Model):
+    invoice = models.ForeignKey(InvoiceModel, on_delete=models.CASCADE, related_name="ledger_entries")
+    account = models.CharField(max_length=10, choices=AccountingCodes.choices)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["invoice", "account"], name="ledger_invoice_account_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["account", "date"], name="ledger_account_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.account} {self.amount} (invoice {self.invoice_id})"
@@ -1,5 +1,7 @@
 from django.db import models
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
 from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.renderers.json_renderer import to_money
 from django.core.exceptions import ValidationError
 from datetime import date 
 
@@ -17,6 +19,36 @@ class InvoiceModel(models.Model):
         default=InvoiceStates.DRAFT.value,  
     )
 
+    # Bumped on every write and exposed as the ETag / Last-Modified of the invoice
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["state", "date"], name="invoice_state_date_idx"),
+            models.Index(fields=["date"], name="invoice_date_idx"),
+            models.Index(fields=["provider", "date"], name="invoice_provider_date_idx"),
+            models.Index(fields=["updated_at"], name="invoice_updated_at_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # An instance built with an existing pk is still "adding" but updates that row, so
+        # only a row that is really new starts at version 1
+        if self.pk is None or kwargs.get("force_insert") or (
+            self._state.adding and not InvoiceModel.objects.filter(pk=self.pk).exists()
+        ):
+            super().save(*args, **kwargs)
+            return
+
+        # Incremented in the UPDATE itself, so concurrent saves never write the same version
+        self.version = models.F("version") + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["version"])
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.pk}-{self.version}"'
+
     def clean(self):
         
         super().clean()  
@@ -39,5 +71,24 @@ class InvoiceModel(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "provider": self.provider,
+            "concept": self.concept,
+            "base_value": self.base_value,
+            "vat": self.vat,
+            "total_value": self.total_value,
+            "date": self.date,
+            "state": self.state,
+        }
+
+    def accounting_entries(self) -> list:
+        return [
+            {"account": AccountingCodes.PURCHASES.value, "description": AccountingCodes.PURCHASES.label, "amount": to_money(self.base_value)},
+            {"account": AccountingCodes.VAT_SUPPORTED.value, "description": AccountingCodes.VAT_SUPPORTED.label, "amount": to_money(self.vat)},
+            {"account": AccountingCodes.SUPPLIERS.value, "description": AccountingCodes.SUPPLIERS.label, "amount": to_money(self.total_value)}
+        ]
+
     def __str__(self):
         return f"Invoice {self.pk or 'New'} - {self.provider} ({self.state})"
@@ -0,0 +1,24 @@
+from django.db import models
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+
+
+class InvoiceRollupModel(models.Model):
+    date = models.DateField()
+    state = models.CharField(max_length=20, choices=InvoiceStates.choices)
+    provider = models.CharField(max_length=255)
+    invoice_count = models.PositiveIntegerField(default=0)
+    base_value = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    vat = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_value = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "state", "provider"], name="rollup_date_state_provider_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["state", "date"], name="rollup_state_date_idx"),
+            models.Index(fields=["provider", "date"], name="rollup_provider_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.state} {self.provider}: {self.invoice_count} invoices"
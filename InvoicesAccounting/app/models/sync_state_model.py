@@ -0,0 +1,62 @@
+from datetime import timedelta
+from typing import Dict, List
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class SyncStateModel(models.Model):
+    source = models.CharField(max_length=255, unique=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    # Watermarks of the last change seen from the source, used for delta syncs
+    last_seen_id = models.BigIntegerField(null=True, blank=True)
+    last_modified = models.DateTimeField(null=True, blank=True)
+    etag = models.CharField(max_length=255, blank=True, default="")
+
+    @classmethod
+    def mark_synced(cls, source: str) -> "SyncStateModel":
+        state, _ = cls.objects.update_or_create(source=source, defaults={"synced_at": timezone.now()})
+        return state
+
+    @classmethod
+    def mark_listed(cls, source: str, invoices: List[Dict]) -> "SyncStateModel":
+        # A full listing is a full sync, so it also moves the delta watermarks
+        state = cls.mark_synced(source)
+        state.advance(invoices)
+        state.save(update_fields=["last_seen_id", "last_modified"])
+        return state
+
+    @classmethod
+    def is_fresh(cls, source: str, max_age: int) -> bool:
+        threshold = timezone.now() - timedelta(seconds=max_age)
+        return cls.objects.filter(source=source, synced_at__gte=threshold).exists()
+
+    def delta_params(self) -> Dict:
+        # A modification timestamp also catches updates, a last id only catches inserts
+        if self.last_modified:
+            return {"updated_since": self.last_modified.isoformat()}
+        if self.last_seen_id is not None:
+            return {"since_id": self.last_seen_id}
+        return {}
+
+    def conditional_headers(self) -> Dict:
+        return {"If-None-Match": self.etag} if self.etag else {}
+
+    def advance(self, invoices: List[Dict]) -> None:
+        for invoice in invoices:
+            # Raw upstream rows, so "5" counts as 5 and ids that are not numbers are ignored
+            try:
+                invoice_id = int(invoice.get("id"))
+            except (TypeError, ValueError):
+                invoice_id = None
+
+            if invoice_id is not None and (self.last_seen_id is None or invoice_id > self.last_seen_id):
+                self.last_seen_id = invoice_id
+
+            updated_at = parse_datetime(str(invoice.get("updated_at") or ""))
+            if updated_at and (self.last_modified is None or updated_at > self.last_modified):
+                self.last_modified = updated_at
+
+    def __str__(self):
+        return f"{self.source} (synced at {self.synced_at})"
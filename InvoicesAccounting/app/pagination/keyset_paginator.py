@@ -0,0 +1,125 @@
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional
+
+from django.db.models import QuerySet
+
+from InvoicesAccounting.app.renderers.json_renderer import dumps
+
+
+class InvalidPagination(ValueError):
+    pass
+
+
+class KeysetPaginator:
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
+    def __init__(self, queryset: QuerySet, key: str = "id"):
+        self.queryset = queryset
+        self.key = key
+
+    @staticmethod
+    def encode_cursor(last_key: int) -> str:
+        raw = json.dumps({"after": last_key}).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return int(payload["after"])
+        except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+            raise InvalidPagination("Invalid cursor.")
+
+    @classmethod
+    def parse_limit(cls, raw_limit: Optional[str]) -> int:
+        if raw_limit in (None, ""):
+            return cls.DEFAULT_LIMIT
+
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise InvalidPagination("Limit must be an integer.")
+
+        if limit <= 0:
+            raise InvalidPagination("Limit must be greater than zero.")
+
+        return min(limit, cls.MAX_LIMIT)
+
+    def _page_queryset(self, limit: int, cursor: Optional[str]) -> QuerySet:
+        queryset = self.queryset.order_by(self.key)
+
+        if cursor:
+            queryset = queryset.filter(**{f"{self.key}__gt": self.decode_cursor(cursor)})
+
+        # Fetch one extra row to know whether another page exists without a COUNT(*)
+        return queryset.values()[: limit + 1]
+
+    def _build_page(self, rows: List[Dict], limit: int) -> Dict:
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "results": rows,
+            "next_cursor": self.encode_cursor(rows[-1][self.key]) if has_more else None,
+        }
+
+    def page(self, limit: int, cursor: Optional[str] = None) -> Dict:
+        return self._build_page(list(self._page_queryset(limit, cursor)), limit)
+
+    async def apage(self, limit: int, cursor: Optional[str] = None) -> Dict:
+        rows = [row async for row in self._page_queryset(limit, cursor)]
+        return self._build_page(rows, limit)
+
+
+class InvoiceStream:
+    CHUNK_SIZE = 2000
+    FORMATS = ("ndjson", "json")
+
+    def __init__(self, queryset: QuerySet, stream_format: str = "ndjson", chunk_size: int = CHUNK_SIZE):
+        if stream_format not in self.FORMATS:
+            raise InvalidPagination("Invalid stream format. Allowed values: " + ", ".join(self.FORMATS))
+
+        self.queryset = queryset.order_by("id").values()
+        self.stream_format = stream_format
+        self.chunk_size = chunk_size
+
+    @property
+    def content_type(self) -> str:
+        return "application/x-ndjson" if self.stream_format == "ndjson" else "application/json"
+
+    def _encode(self, row: Dict) -> str:
+        return dumps(row).decode()
+
+    def iter_chunks(self):
+        rows = self.queryset.iterator(chunk_size=self.chunk_size)
+
+        if self.stream_format == "ndjson":
+            for row in rows:
+                yield self._encode(row) + "\n"
+            return
+
+        yield "["
+        separator = ""
+        for row in rows:
+            yield separator + self._encode(row)
+            separator = ","
+        yield "]"
+
+    async def aiter_chunks(self):
+        rows = self.queryset.aiterator(chunk_size=self.chunk_size)
+
+        if self.stream_format == "ndjson":
+            async for row in rows:
+                yield self._encode(row) + "\n"
+            return
+
+        yield "["
+        separator = ""
+        async for row in rows:
+            yield separator + self._encode(row)
+            separator = ","
+        yield "]"
@@ -0,0 +1,104 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+WHITESPACE = " \t\n\r"
+DELIMITERS = WHITESPACE + ",]"
+
+
+class JsonArrayStreamError(ValueError):
+    pass
+
+
+class JsonArrayStream:
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str = "utf-8"):
+        self.chunks = chunks
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+
+        self.buffer = ""
+        self.position = 0
+        self.started = False
+        self.finished = False
+        self.expect_value = True
+        self.seen_value = False
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk)
+            if not text:
+                continue
+
+            # Drop what was already consumed so the buffer only holds the pending element
+            self.buffer = self.buffer[self.position:] + text
+            self.position = 0
+            yield from self._drain(final=False)
+
+        self.buffer = self.buffer[self.position:] + self.text_decoder.decode(b"", final=True)
+        self.position = 0
+        yield from self._drain(final=True)
+
+        if not self.finished:
+            raise JsonArrayStreamError("Unexpected end of JSON array.")
+
+    def _skip_whitespace(self) -> None:
+        while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+            self.position += 1
+
+    def _drain(self, final: bool) -> Iterator[Any]:
+        while True:
+            self._skip_whitespace()
+
+            if self.position >= len(self.buffer):
+                return
+
+            char = self.buffer[self.position]
+
+            if self.finished:
+                raise JsonArrayStreamError("Unexpected data after the end of the JSON array.")
+
+            if not self.started:
+                if char != "[":
+                    raise JsonArrayStreamError("Expected a JSON array.")
+                self.started = True
+                self.position += 1
+                continue
+
+            if char == "]":
+                if self.expect_value and self.seen_value:
+                    raise JsonArrayStreamError("Trailing comma in JSON array.")
+                self.finished = True
+                self.position += 1
+                continue
+
+            if char == ",":
+                if self.expect_value:
+                    raise JsonArrayStreamError("Unexpected comma in JSON array.")
+                self.expect_value = True
+                self.position += 1
+                continue
+
+            if not self.expect_value:
+                raise JsonArrayStreamError("Expected ',' or ']' between array elements.")
+
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                if final:
+                    raise JsonArrayStreamError(f"Invalid JSON array element: {e.msg}")
+                return
+
+            # A number cut by the chunk boundary ("45." of "45.6") decodes as a shorter
+            # value, so only accept it once a delimiter follows
+            if not final and (end == len(self.buffer) or self.buffer[end] not in DELIMITERS):
+                return
+
+            self.position = end
+            self.expect_value = False
+            self.seen_value = True
+            yield value
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    return iter(JsonArrayStream(chunks))
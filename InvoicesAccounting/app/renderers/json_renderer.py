@@ -0,0 +1,75 @@
+import json
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from InvoicesAccounting.app.instrumentation.request_metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CENTS = Decimal("0.01")
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def to_money(value) -> Decimal:
+    # Money leaves the API as a two-decimal string whatever the source sent
+    return Decimal(str(value)).quantize(CENTS)
+
+
+def _orjson_default(value):
+    # orjson handles dates, UUIDs and str/dict subclasses natively; Decimals and lazy strings land here
+    if isinstance(value, Decimal):
+        return str(value)
+    return _django_encoder.default(value)
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+JSON_ENCODERS: Dict[str, Callable[[Any], bytes]] = {"stdlib": _stdlib_dumps}
+
+if orjson is not None:
+    JSON_ENCODERS["orjson"] = _orjson_dumps
+
+
+def get_encoder(name: Optional[str] = None) -> Callable[[Any], bytes]:
+    name = name or settings.JSON_RENDERER
+
+    if name == "auto":
+        return JSON_ENCODERS.get("orjson", _stdlib_dumps)
+
+    if name not in JSON_ENCODERS:
+        raise ValueError(f"Unknown JSON renderer '{name}'. Available: auto, " + ", ".join(JSON_ENCODERS))
+
+    return JSON_ENCODERS[name]
+
+
+def dumps(data: Any) -> bytes:
+    return get_encoder()(data)
+
+
+class FastJsonResponse(HttpResponse):
+
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+
+        with timed("render"):
+            content = dumps(data)
+
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=content, **kwargs)
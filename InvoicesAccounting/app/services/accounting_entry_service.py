@@ -0,0 +1,100 @@
+import csv
+import logging
+import time
+from typing import Dict, Iterator
+
+from django.db.models import QuerySet
+
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.renderers.json_renderer import dumps
+
+logger = logging.getLogger(__name__)
+
+# Journal lines generated for every invoice, and the invoice column each one books
+ENTRY_ACCOUNTS = (
+    (AccountingCodes.PURCHASES, "base_value"),
+    (AccountingCodes.VAT_SUPPORTED, "vat"),
+    (AccountingCodes.SUPPLIERS, "total_value"),
+)
+
+CSV_COLUMNS = ["invoice_id", "date", "account", "description", "amount"]
+
+
+class InvalidExportFormat(ValueError):
+    pass
+
+
+class EchoBuffer:
+    def write(self, value):
+        return value
+
+
+class AccountingEntryService:
+    CHUNK_SIZE = 2000
+    FORMATS = ("ndjson", "csv")
+
+    def __init__(self, queryset: QuerySet, chunk_size: int = CHUNK_SIZE):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+        self.invoices = 0
+        self.entries = 0
+        self.elapsed = 0.0
+
+    def iter_entries(self) -> Iterator[Dict]:
+        started = time.perf_counter()
+
+        # Plain tuples straight from the cursor, no model instances
+        rows = (
+            self.queryset.order_by("id")
+            .values_list("id", "date", "base_value", "vat", "total_value")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        try:
+            for invoice_id, invoice_date, base_value, vat, total_value in rows:
+                self.invoices += 1
+                amounts = {"base_value": base_value, "vat": vat, "total_value": total_value}
+
+                for code, column in ENTRY_ACCOUNTS:
+                    self.entries += 1
+                    yield {
+                        "invoice_id": invoice_id,
+                        "date": invoice_date.isoformat(),
+                        "account": code.value,
+                        "description": code.label,
+                        "amount": str(amounts[column]),
+                    }
+        finally:
+            self.elapsed = time.perf_counter() - started
+            logger.info("Generated accounting entries: %s", self.stats())
+
+    def stats(self) -> Dict:
+        return {
+            "invoices": self.invoices,
+            "entries": self.entries,
+            "seconds": round(self.elapsed, 3),
+            "invoices_per_second": round(self.invoices / self.elapsed, 1) if self.elapsed else 0.0,
+        }
+
+    def iter_ndjson(self) -> Iterator[str]:
+        for entry in self.iter_entries():
+            yield dumps(entry).decode() + "\n"
+
+        yield dumps({"summary": self.stats()}).decode() + "\n"
+
+    def iter_csv(self) -> Iterator[str]:
+        writer = csv.DictWriter(EchoBuffer(), fieldnames=CSV_COLUMNS)
+
+        yield writer.writeheader()
+        for entry in self.iter_entries():
+            yield writer.writerow(entry)
+
+    def render(self, output_format: str) -> Iterator[str]:
+        if output_format not in self.FORMATS:
+            raise InvalidExportFormat("Invalid format. Allowed values: " + ", ".join(self.FORMATS))
+
+        return self.iter_csv() if output_format == "csv" else self.iter_ndjson()
+
+    @classmethod
+    def content_type(cls, output_format: str) -> str:
+        return "text/csv" if output_format == "csv" else "application/x-ndjson"
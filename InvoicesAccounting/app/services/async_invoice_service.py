@@ -0,0 +1,118 @@
+import asyncio
+from typing import List, Dict
+import httpx
+from asgiref.sync import sync_to_async
+from Inmatic import settings
+from InvoicesAccounting.app.metrics.invoice_metrics import UpstreamTimer
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.renderers.json_renderer import JSON_HEADERS, dumps
+from InvoicesAccounting.app.services.fan_out_executor import FanOutResult, agather
+from InvoicesAccounting.app.services.http_client_registry import async_http_client_registry
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+from InvoicesAccounting.app.services.single_flight import acoalesced
+from InvoicesAccounting.app.services.resilience import asend_with_retries, circuit_breakers, operation_timeout
+from InvoicesAccounting.app.tracing.tracer import traced, tracer
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+
+class AsyncInvoiceService:
+    BASE_URL = settings.PAYMENT_API_BASE_URL
+
+    def __init__(self, base_url=None, sync_batch_size=None):
+        self.base_url = base_url or self.BASE_URL
+        self.sync_batch_size = sync_batch_size
+
+        if not self.base_url:
+            raise ValueError("BASE_URL is not configured. Please check your settings.")
+
+        # One AsyncClient per event loop and base_url, shared by every request on that loop
+        self.client = async_http_client_registry.get_client(self.base_url)
+        # Shared with InvoiceService, both talk to the same upstream
+        self.breaker = circuit_breakers.get(self.base_url)
+        # Backoff between retries, replaceable so tests don't wait it out
+        self.sleep = asyncio.sleep
+
+    async def _send(self, method: str, url: str, operation: str = "default", **kwargs) -> httpx.Response:
+        request = getattr(self.client, method)
+
+        with UpstreamTimer(method, url) as timer, tracer.start_span(f"HTTP {method.upper()}", kind="client") as span:
+            span.set_attribute("http.method", method.upper())
+            span.set_attribute("http.url", f"{self.base_url.rstrip('/')}/{url.lstrip('/')}")
+            response = await asend_with_retries(
+                self.breaker, method, lambda: request(url, timeout=operation_timeout(operation), **kwargs), sleep=self.sleep,
+            )
+            timer.status = response.status_code
+            span.set_attribute("http.status_code", response.status_code)
+
+        return response
+
+    @traced
+    async def list_invoices(self) -> List[Dict]:
+        response = await self._send("get", "invoices/", operation="sync")
+        response.raise_for_status()
+
+        # Validation and the bulk upsert are ORM-bound, run them off the event loop
+        raw_invoices = response.json()
+        sync_service = InvoiceSyncService(self.sync_batch_size)
+        invoices, _ = await sync_to_async(sync_service.sync_payload)(raw_invoices)
+        await sync_to_async(SyncStateModel.mark_listed)(self.base_url, raw_invoices)
+
+        return invoices
+
+    @traced
+    async def create_invoice(self, invoice: Dict) -> Dict:
+        serializer = ValidateInvoice(instance=invoice)
+
+        response = await self._send("post", "invoices/", json=serializer.data)
+        response.raise_for_status()
+
+        return response.json()
+
+    @traced
+    @acoalesced
+    async def get_invoice(self, invoice_id: int) -> Dict:
+        response = await self._send("get", f"invoices/{invoice_id}/")
+        response.raise_for_status()
+
+        return response.json()
+
+    @traced
+    async def update_invoice(self, invoice_id: int, data: Dict) -> Dict:
+        response = await self._send("put", f"invoices/{invoice_id}/", content=dumps(data), headers=JSON_HEADERS)
+        response.raise_for_status()
+
+        return response.json()
+
+    @traced
+    async def delete_invoice(self, invoice_id: int) -> Dict:
+        response = await self._send("delete", f"invoices/{invoice_id}/")
+        response.raise_for_status()
+
+        return {"message": f"Invoice {invoice_id} deleted successfully"}
+
+    @traced
+    async def filter_invoices(self, **params) -> List[Dict]:
+        response = await self._send("get", "invoices/filter/", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @traced
+    @acoalesced
+    async def generate_accounting_entries(self, invoice_id: int) -> Dict:
+        response = await self._send("get", f"invoices/{invoice_id}/accounting-entries/")
+        response.raise_for_status()
+
+        return InvoiceService.normalize_accounting_entries(response.json())
+
+    @traced
+    async def get_invoices(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return await agather(self.get_invoice, invoice_ids, max_concurrency)
+
+    @traced
+    async def delete_invoices(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return await agather(self.delete_invoice, invoice_ids, max_concurrency)
+
+    @traced
+    async def generate_accounting_entries_many(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return await agather(self.generate_accounting_entries, invoice_ids, max_concurrency)
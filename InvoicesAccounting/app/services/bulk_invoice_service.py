@@ -0,0 +1,137 @@
+import logging
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from InvoicesAccounting.app.services.fan_out_executor import FanOutExecutor
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_sync_service import chunked
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+logger = logging.getLogger(__name__)
+
+
+class BulkInvoiceService:
+
+    def __init__(self, invoice_service: Optional[InvoiceService] = None, chunk_size: Optional[int] = None, max_workers: Optional[int] = None):
+        self.invoice_service = invoice_service or InvoiceService()
+        self.chunk_size = settings.INVOICE_BULK_CHUNK_SIZE if chunk_size is None else chunk_size
+        self.max_workers = settings.INVOICE_BULK_MAX_WORKERS if max_workers is None else max_workers
+
+        if self.chunk_size <= 0 or self.max_workers <= 0:
+            raise ValueError("Bulk chunk size and max workers must be greater than zero.")
+
+    def create(self, items: List) -> Dict:
+        valid, results = self._validate(items)
+        self._forward(valid, self.invoice_service.bulk_create_invoices, "created", results)
+        return self._report(results)
+
+    def update(self, items: List) -> Dict:
+        results = {}
+        with_id = []
+
+        for index, item in enumerate(items):
+            invoice_id = item.get("id") if isinstance(item, dict) else None
+            if isinstance(invoice_id, int) and not isinstance(invoice_id, bool):
+                with_id.append((index, item))
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": {"id": ["This field is required."]}}
+
+        valid, invalid = self._validate([item for _, item in with_id], partial=True)
+
+        # Map positions inside with_id back to the request, keeping the ids the serializer drops
+        for position, result in invalid.items():
+            index = with_id[position][0]
+            results[index] = {**result, "index": index}
+
+        valid = [(with_id[position][0], {**data, "id": with_id[position][1]["id"]}) for position, data in valid]
+        self._forward(valid, self.invoice_service.bulk_update_invoices, "updated", results)
+        return self._report(results)
+
+    def delete(self, items: List) -> Dict:
+        results = {}
+        valid = []
+
+        for index, item in enumerate(items):
+            invoice_id = item.get("id") if isinstance(item, dict) else item
+            if isinstance(invoice_id, int) and not isinstance(invoice_id, bool):
+                valid.append((index, invoice_id))
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": {"id": ["A valid integer is required."]}}
+
+        self._forward(valid, self.invoice_service.bulk_delete_invoices, "deleted", results)
+        return self._report(results)
+
+    def _validate(self, items: List, partial: bool = False) -> Tuple[List[Tuple[int, Dict]], Dict[int, Dict]]:
+        serializer = ValidateInvoice(data=items, many=True, partial=partial)
+
+        if serializer.is_valid():
+            return list(enumerate(serializer.validated_data)), {}
+
+        # A ListSerializer keeps no validated_data once any item fails, so re-validate the rest
+        errors = serializer.errors if isinstance(serializer.errors, list) else [serializer.errors] * len(items)
+        invalid = {
+            index: {"index": index, "status": "invalid", "errors": item_errors}
+            for index, item_errors in enumerate(errors) if item_errors
+        }
+
+        valid_indexes = [index for index in range(len(items)) if index not in invalid]
+        if not valid_indexes:
+            return [], invalid
+
+        serializer = ValidateInvoice(data=[items[index] for index in valid_indexes], many=True, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        return list(zip(valid_indexes, serializer.validated_data)), invalid
+
+    def _forward(self, valid: List[Tuple[int, object]], send: Callable, status: str, results: Dict[int, Dict]) -> None:
+        chunks = chunked(valid, self.chunk_size)
+        outcomes = FanOutExecutor(self.max_workers).map(lambda chunk: send([payload for _, payload in chunk]), chunks)
+
+        for outcome in outcomes:
+            indexes = [index for index, _ in outcome.item]
+
+            if not outcome.ok:
+                # A failed chunk only fails its own items, the other chunks carry on
+                logger.error(f"Error forwarding {len(indexes)} invoices upstream: {str(outcome.error)}")
+                results.update({index: {"index": index, "status": "failed", "error": str(outcome.error)} for index in indexes})
+
+            else:
+                results.update(self._reconcile(outcome.item, outcome.value, status))
+
+    @staticmethod
+    def _reconcile(chunk: List[Tuple[int, object]], answer, status: str) -> Dict[int, Dict]:
+        # Only what upstream confirms is reported as applied, the rest is "unknown"
+        indexes = [index for index, _ in chunk]
+
+        # One item per invoice sent, in the same order
+        if isinstance(answer, list) and len(answer) == len(indexes):
+            return {index: {"index": index, "status": status, "invoice": item} for index, item in zip(indexes, answer)}
+
+        # Fewer items than sent (e.g. unknown ids skipped on update): match them by id
+        if isinstance(answer, list) and all(isinstance(payload, dict) and "id" in payload for _, payload in chunk):
+            returned = {item.get("id"): item for item in answer if isinstance(item, dict)}
+            return {
+                index: {"index": index, "status": status, "invoice": returned[payload["id"]]}
+                if payload["id"] in returned else
+                {"index": index, "status": "unknown", "error": "Upstream did not confirm this invoice."}
+                for index, payload in chunk
+            }
+
+        # A count covering the whole chunk, e.g. {"deleted": n}
+        if isinstance(answer, dict) and answer.get(status) == len(indexes):
+            return {index: {"index": index, "status": status} for index in indexes}
+
+        applied = answer.get(status) if isinstance(answer, dict) else None
+        error = f"Upstream confirmed {applied} of {len(indexes)} invoices in this chunk." if applied is not None else "Upstream did not confirm these invoices."
+        return {index: {"index": index, "status": "unknown", "error": error} for index in indexes}
+
+    @staticmethod
+    def _report(results: Dict[int, Dict]) -> Dict:
+        ordered = [results[index] for index in sorted(results)]
+
+        return {
+            "results": ordered,
+            "summary": dict(Counter(result["status"] for result in ordered)),
+        }
@@ -0,0 +1,65 @@
+import asyncio
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from django.conf import settings
+
+
+@dataclass
+class FanOutResult:
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def resolve_concurrency(max_concurrency: Optional[int]) -> int:
+    max_concurrency = settings.PAYMENT_API_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+
+    if max_concurrency <= 0:
+        raise ValueError("Fan-out concurrency must be greater than zero.")
+
+    return max_concurrency
+
+
+class FanOutExecutor:
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = resolve_concurrency(max_concurrency)
+
+    def map(self, func: Callable[[Any], Any], items: Iterable) -> List[FanOutResult]:
+        items = list(items)
+        if not items:
+            return []
+
+        # Each call runs in a copy of the caller's context, so its spans and timings attach to the request
+        calls = [(copy_context(), item) for item in items]
+
+        # Results keep the order of items, whatever order the calls finish in
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as executor:
+            return list(executor.map(lambda call: call[0].run(self.call, func, call[1]), calls))
+
+    @staticmethod
+    def call(func: Callable[[Any], Any], item) -> FanOutResult:
+        try:
+            return FanOutResult(item=item, value=func(item))
+        except Exception as e:
+            return FanOutResult(item=item, error=e)
+
+
+async def agather(func: Callable[[Any], Awaitable], items: Iterable, max_concurrency: Optional[int] = None) -> List[FanOutResult]:
+    semaphore = asyncio.Semaphore(resolve_concurrency(max_concurrency))
+
+    async def call(item) -> FanOutResult:
+        async with semaphore:
+            try:
+                return FanOutResult(item=item, value=await func(item))
+            except Exception as e:
+                return FanOutResult(item=item, error=e)
+
+    return list(await asyncio.gather(*(call(item) for item in items)))
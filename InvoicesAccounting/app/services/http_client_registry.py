@@ -0,0 +1,125 @@
+import asyncio
+import atexit
+import importlib.util
+import logging
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from django.conf import settings
+
+from InvoicesAccounting.app.tracing.tracer import ainject_traceparent, inject_traceparent
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientRegistry:
+    client_class = httpx.Client
+    request_hook = staticmethod(inject_traceparent)
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.PAYMENT_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PAYMENT_API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.PAYMENT_API_KEEPALIVE_EXPIRY,
+        )
+
+    @staticmethod
+    def http2_enabled() -> bool:
+        if not settings.PAYMENT_API_HTTP2:
+            return False
+
+        # httpx only speaks HTTP/2 when the optional "h2" package is installed
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("PAYMENT_API_HTTP2 is enabled but the 'h2' package is not installed, using HTTP/1.1.")
+            return False
+
+        return True
+
+    def build_client(self, base_url: str) -> httpx.Client:
+        return self.client_class(
+            base_url=base_url,
+            timeout=settings.PAYMENT_API_TIMEOUT,
+            limits=self.build_limits(),
+            http2=self.http2_enabled(),
+            event_hooks={"request": [self.request_hook]},
+        )
+
+    def get_client(self, base_url: str) -> httpx.Client:
+        client = self._clients.get(base_url)
+        if client is not None and not client.is_closed:
+            return client
+
+        with self._lock:
+            client = self._clients.get(base_url)
+            if client is None or client.is_closed:
+                client = self.build_client(base_url)
+                self._clients[base_url] = client
+
+        return client
+
+    def register(self, base_url: str, client: Optional[httpx.Client]) -> Optional[httpx.Client]:
+        # Swaps in a prebuilt client (e.g. a stub transport) and hands back the previous one to restore
+        with self._lock:
+            previous = self._clients.pop(base_url, None)
+            if client is not None:
+                self._clients[base_url] = client
+
+        return previous
+
+    def close_all(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client: {str(e)}")
+
+
+class AsyncHttpClientRegistry(HttpClientRegistry):
+    client_class = httpx.AsyncClient
+    request_hook = staticmethod(ainject_traceparent)
+
+    def __init__(self):
+        super().__init__()
+        # An AsyncClient is bound to the event loop that opened its connections
+        self._clients_by_loop = weakref.WeakKeyDictionary()
+
+    def get_client(self, base_url: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            clients = self._clients_by_loop.setdefault(loop, {})
+            client = clients.get(base_url)
+            if client is None or client.is_closed:
+                client = self.build_client(base_url)
+                clients[base_url] = client
+
+        return client
+
+    async def aclose_all(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            clients = list(self._clients_by_loop.pop(loop, {}).values())
+
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client: {str(e)}")
+
+
+http_client_registry = HttpClientRegistry()
+async_http_client_registry = AsyncHttpClientRegistry()
+
+atexit.register(http_client_registry.close_all)
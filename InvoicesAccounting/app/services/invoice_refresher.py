@@ -0,0 +1,151 @@
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import httpx
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils import timezone
+
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+logger = logging.getLogger(__name__)
+
+
+class InvoiceRefresher:
+    KEY_PREFIX = "invoice:refresh"
+
+    def __init__(self, stale_after: Optional[int] = None, max_workers: Optional[int] = None, alias: str = "default", missing_confirmations: Optional[int] = None):
+        self.stale_after = settings.INVOICE_STALE_AFTER if stale_after is None else stale_after
+        self.max_workers = settings.INVOICE_REFRESH_WORKERS if max_workers is None else max_workers
+        self.missing_confirmations = settings.INVOICE_MISSING_CONFIRMATIONS if missing_confirmations is None else missing_confirmations
+        self.alias = alias
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.stale_after > 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, name) -> str:
+        return f"{self.KEY_PREFIX}:{name}"
+
+    def refresh_list_if_stale(self) -> bool:
+        if not self.enabled or SyncStateModel.is_fresh(InvoiceService.BASE_URL, self.stale_after):
+            return False
+
+        return self.schedule("list", self.refresh_list)
+
+    def refresh_invoice_if_stale(self, invoice_id: int) -> bool:
+        if not self.enabled or not self.is_stale(self.last_updated(invoice_id)):
+            return False
+
+        return self.schedule(invoice_id, lambda: self.refresh_invoice(invoice_id))
+
+    def is_stale(self, updated_at: Optional[datetime]) -> bool:
+        # Invoices only known upstream have no local age and are always worth storing
+        return updated_at is None or updated_at < timezone.now() - timedelta(seconds=self.stale_after)
+
+    @staticmethod
+    def last_updated(invoice_id: int) -> Optional[datetime]:
+        # The detail cache entry carries Last-Modified, so hot ids are judged without a query
+        validators = invoice_cache.validators(invoice_id)
+        if validators is not None:
+            return validators[1]
+        return InvoiceModel.objects.filter(id=invoice_id).values_list("updated_at", flat=True).first()
+
+    def schedule(self, name, refresh: Callable[[], None]) -> bool:
+        # cache.add only succeeds for the first caller until the marker expires, which
+        # coalesces refreshes across processes; _in_flight covers a refresh outliving it.
+        # A refresh that finds nothing new leaves updated_at alone, so the marker is also
+        # what records that the row was checked less than stale_after ago
+        if not self.cache.add(self.key(name), True, timeout=self.stale_after):
+            return False
+
+        with self._lock:
+            if name in self._in_flight:
+                return False
+            self._in_flight.add(name)
+
+        if self.max_workers == 0:
+            self._run(name, refresh)
+        else:
+            self._get_executor().submit(self._run, name, refresh)
+
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="invoice-refresh")
+            return self._executor
+
+    def _run(self, name, refresh: Callable[[], None]) -> None:
+        try:
+            refresh()
+        except Exception as e:
+            # Let the next request retry instead of waiting out the marker
+            self.cache.delete(self.key(name))
+            logger.error(f"Error refreshing invoices ({name}): {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(name)
+            # Worker threads outlive requests, so nothing else closes their connections
+            if self.max_workers:
+                for connection in connections.all(initialized_only=True):
+                    connection.close()
+
+    @staticmethod
+    def refresh_list() -> None:
+        InvoiceService().sync_invoices(incremental=True)
+
+    def refresh_invoice(self, invoice_id: int) -> None:
+        try:
+            invoice = InvoiceService().get_invoice(invoice_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            self.record_missing(invoice_id)
+            return
+
+        self.cache.delete(self.key(f"missing:{invoice_id}"))
+        InvoiceSyncService().sync_batch([invoice])
+
+    def record_missing(self, invoice_id: int) -> None:
+        # A single 404 may be transient or misrouted, so the local copy is only dropped once
+        # consecutive refreshes (at least stale_after apart) agree; 0 confirmations never deletes
+        key = self.key(f"missing:{invoice_id}")
+        self.cache.add(key, 0, timeout=None)
+        misses = self.cache.incr(key)
+
+        logger.warning(f"Invoice {invoice_id} not found upstream during refresh ({misses}/{self.missing_confirmations or '-'}).")
+
+        if self.missing_confirmations and misses >= self.missing_confirmations:
+            InvoiceModel.objects.filter(id=invoice_id).delete()
+            self.cache.delete(key)
+
+    def shutdown(self, wait: bool = False) -> None:
+        # Workers take the lock when they finish, so never wait for them while holding it
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+invoice_refresher = InvoiceRefresher()
+
+atexit.register(invoice_refresher.shutdown)
@@ -1,89 +1,287 @@
-from typing import List, Dict
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Dict, Iterator, List, Tuple
 import httpx
+from django.utils import timezone
 from Inmatic import settings
+from InvoicesAccounting.app.cache.upstream_response_cache import upstream_response_cache
+from InvoicesAccounting.app.metrics.invoice_metrics import UpstreamTimer
 from InvoicesAccounting.app.models.invoice_model import InvoiceModel
-from django.db import transaction
-
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.fan_out_executor import FanOutExecutor, FanOutResult
+from InvoicesAccounting.app.services.http_client_registry import http_client_registry
+from InvoicesAccounting.app.parsers.json_array_stream import iter_json_array
+from InvoicesAccounting.app.renderers.json_renderer import JSON_HEADERS, dumps, to_money
+from InvoicesAccounting.app.services.resilience import (
+    circuit_breakers,
+    operation_timeout,
+    send_with_retries,
+)
+from InvoicesAccounting.app.services.single_flight import coalesced
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService, SyncReport, chunked
+from InvoicesAccounting.app.tracing.tracer import traced, tracer
 from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
 
 
 class InvoiceService:
     BASE_URL = settings.PAYMENT_API_BASE_URL
 
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, sync_batch_size=None):
         self.base_url = base_url or self.BASE_URL
+        self.sync_batch_size = sync_batch_size
+        self.last_sync_report = None
 
         if not self.base_url:
             raise ValueError("BASE_URL is not configured. Please check your settings.")
 
-        self.client = httpx.Client(base_url=self.base_url, timeout=30)
+        # Shared per base_url so every request reuses the same keep-alive pool
+        self.client = http_client_registry.get_client(self.base_url)
+        self.breaker = circuit_breakers.get(self.base_url)
+        # Backoff between retries, replaceable so tests don't wait it out
+        self.sleep = time.sleep
+
+    def _send(self, method: str, url: str, operation: str = "default", **kwargs) -> httpx.Response:
+        if method == "delete" and ("content" in kwargs or "json" in kwargs):
+            # httpx.Client.delete() takes no body
+            request = partial(self.client.request, "DELETE")
+        else:
+            # Looked up on the client at call time so tests can patch httpx.Client.get and friends
+            request = getattr(self.client, method)
+
+        with self._instrument(method, url) as (timer, span):
+            response = send_with_retries(
+                self.breaker, method, lambda: request(url, timeout=operation_timeout(operation), **kwargs), sleep=self.sleep,
+            )
+            timer.status = response.status_code
+            span.set_attribute("http.status_code", response.status_code)
+
+        return response
+
+    @contextmanager
+    def _stream(self, method: str, url: str, operation: str = "default", **kwargs) -> Iterator[httpx.Response]:
+        # Same metric, span, traceparent and retries as _send, but the body is left unread.
+        # Only opening the response is retried: a body that fails halfway cannot be replayed,
+        # so it just reports to the breaker
+        def send():
+            request = self.client.build_request(method.upper(), url, timeout=operation_timeout(operation), **kwargs)
+            return self.client.send(request, stream=True)
+
+        with self._instrument(method, url) as (timer, span):
+            response = send_with_retries(self.breaker, method, send, sleep=self.sleep)
+            timer.status = response.status_code
+            span.set_attribute("http.status_code", response.status_code)
+
+            try:
+                yield response
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                raise
+            finally:
+                response.close()
+
+    @contextmanager
+    def _instrument(self, method: str, url: str) -> Iterator[Tuple[UpstreamTimer, object]]:
+        with UpstreamTimer(method, url) as timer, tracer.start_span(f"HTTP {method.upper()}", kind="client") as span:
+            span.set_attribute("http.method", method.upper())
+            span.set_attribute("http.url", f"{self.base_url.rstrip('/')}/{url.lstrip('/')}")
+            yield timer, span
+
+    def _get_json(self, url: str):
+        # Revalidate with the upstream ETag and reuse the cached body on 304
+        cached = upstream_response_cache.get(self.base_url, url)
+        kwargs = {"headers": {"If-None-Match": cached["etag"]}} if cached else {}
+
+        response = self._send("get", url, **kwargs)
+
+        if response.status_code == 304 and cached:
+            return cached["body"]
+
+        response.raise_for_status()
+        body = response.json()
+
+        etag = response.headers.get("ETag")
+        if etag:
+            upstream_response_cache.set(self.base_url, url, etag, body)
 
+        return body
+
+    @traced
     def list_invoices(self) -> List[Dict]:
-        response = self.client.get("invoices/")
+        response = self._send("get", "invoices/", operation="sync")
         response.raise_for_status()
 
-        invoices = response.json()
+        raw_invoices = response.json()
+        invoices, self.last_sync_report = InvoiceSyncService(self.sync_batch_size).sync_payload(raw_invoices)
+
+        SyncStateModel.mark_listed(self.base_url, raw_invoices)
+
+        return invoices
+
+    @traced
+    def sync_invoices(self, incremental: bool = True) -> SyncReport:
+        state, _ = SyncStateModel.objects.get_or_create(source=self.base_url)
+        report = SyncReport()
+
+        url = "invoices/"
+        params = state.delta_params() if incremental else {}
+        headers = state.conditional_headers() if incremental else {}
+        etag = None
+        watermarks = (state.last_seen_id, state.last_modified)
+
+        while url:
+            response = self._send("get", url, operation="sync", params=params, headers=headers)
+
+            if response.status_code == 304:
+                break
+
+            response.raise_for_status()
+            etag = etag or response.headers.get("ETag")
+
+            # Upstream answers either a bare list or a page with a "next" link
+            payload = response.json()
+            if isinstance(payload, list):
+                invoices, url = payload, None
+            else:
+                invoices, url = payload.get("results", []), payload.get("next")
+
+            # The "next" link already carries the delta query; httpx drops a URL's query when given params={}
+            params, headers = None, {}
+
+            report.merge(InvoiceSyncService(self.sync_batch_size).sync_batch(invoices))
+            state.advance(invoices)
 
-        serializer = ValidateInvoice(data=invoices, many=True)
-        serializer.is_valid(raise_exception=True)
+        if report.invalid:
+            # Skipped rows can be older than the newest ones seen: keep the previous watermarks
+            # and ETag so the next delta sync fetches them again
+            state.last_seen_id, state.last_modified = watermarks
+        elif etag:
+            state.etag = etag
+        state.synced_at = timezone.now()
+        state.save()
 
-        with transaction.atomic():
-            for invoice_data in serializer.validated_data:
-                InvoiceModel.objects.update_or_create(
-                    id=invoice_data.get("id"),
-                    defaults=invoice_data,
-                )
+        self.last_sync_report = report
+        return report
 
-        return serializer.data
+    @traced
+    def stream_sync_invoices(self, incremental: bool = False) -> SyncReport:
+        state, _ = SyncStateModel.objects.get_or_create(source=self.base_url)
+        sync_service = InvoiceSyncService(self.sync_batch_size)
+        report = SyncReport()
 
+        params = state.delta_params() if incremental else {}
+        watermarks = (state.last_seen_id, state.last_modified)
+
+        # Parse the array element by element so only one batch is held in memory
+        with self._stream("get", "invoices/", operation="sync", params=params) as response:
+            response.raise_for_status()
+
+            invoices = iter_json_array(response.iter_bytes())
+            for batch in chunked(invoices, sync_service.batch_size):
+                report.merge(sync_service.sync_batch(batch))
+                state.advance(batch)
+
+        if report.invalid:
+            # Same as sync_invoices: skipped rows must stay above the watermark
+            state.last_seen_id, state.last_modified = watermarks
+
+        state.synced_at = timezone.now()
+        state.save()
+
+        self.last_sync_report = report
+        return report
+
+    @traced
     def create_invoice(self, invoice: InvoiceModel) -> dict:
         serializer = ValidateInvoice(instance=invoice)
 
-        response = self.client.post("invoices/", json=serializer.data)
+        response = self._send("post", "invoices/", json=serializer.data)
         response.raise_for_status()
 
         return response.json()
 
+    @traced
+    @coalesced
     def get_invoice(self, invoice_id: int) -> Dict:
-        response = self.client.get(f"invoices/{invoice_id}/")
-        response.raise_for_status()
-
-        return response.json()
+        return self._get_json(f"invoices/{invoice_id}/")
 
+    @traced
     def update_invoice(self, invoice_id: int, data: Dict) -> Dict:
-        response = self.client.put(f"invoices/{invoice_id}/", json=data)
+        response = self._send("put", f"invoices/{invoice_id}/", content=dumps(data), headers=JSON_HEADERS)
         response.raise_for_status()
 
         return response.json()
 
+    @traced
     def delete_invoice(self, invoice_id: int) -> Dict:
-        response = self.client.delete(f"invoices/{invoice_id}/")
+        response = self._send("delete", f"invoices/{invoice_id}/")
         response.raise_for_status()
 
         return {"message": f"Invoice {invoice_id} deleted successfully"}
 
-    def filter_invoices(self, **params) -> List[Dict]:
-        response = self.client.get("invoices/filter/", params=params)
+    @traced
+    def get_invoices(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return FanOutExecutor(max_concurrency).map(self.get_invoice, invoice_ids)
+
+    @traced
+    def delete_invoices(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return FanOutExecutor(max_concurrency).map(self.delete_invoice, invoice_ids)
+
+    @traced
+    def generate_accounting_entries_many(self, invoice_ids: List[int], max_concurrency=None) -> List[FanOutResult]:
+        return FanOutExecutor(max_concurrency).map(self.generate_accounting_entries, invoice_ids)
+
+    @traced
+    def bulk_create_invoices(self, invoices: List[Dict]) -> List[Dict]:
+        serializer = ValidateInvoice(instance=invoices, many=True)
+
+        response = self._send("post", "invoices/bulk/", json=serializer.data)
         response.raise_for_status()
+
         return response.json()
 
-    def generate_accounting_entries(self, invoice_id: int) -> Dict:
-        response = self.client.get(f"invoices/{invoice_id}/accounting-entries/")
+    @traced
+    def bulk_update_invoices(self, invoices: List[Dict]) -> List[Dict]:
+        # Items are partial updates, so they are sent as given rather than re-serialized
+        response = self._send("put", "invoices/bulk/", content=dumps(invoices), headers=JSON_HEADERS)
+        response.raise_for_status()
+
+        return response.json()
+
+    @traced
+    def bulk_delete_invoices(self, invoice_ids: List[int]) -> Dict:
+        response = self._send("delete", "invoices/bulk/", json={"ids": invoice_ids})
         response.raise_for_status()
 
-        external_entries = response.json()
+        # Ids upstream does not know are skipped, so trust its count when it sends one
+        body = response.json() if response.content else {}
+        deleted = body.get("deleted", len(invoice_ids)) if isinstance(body, dict) else len(invoice_ids)
+        return {"message": f"{deleted} invoices deleted successfully", "deleted": deleted}
+
+    @traced
+    def filter_invoices(self, **params) -> List[Dict]:
+        response = self._send("get", "invoices/filter/", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @traced
+    @coalesced
+    def generate_accounting_entries(self, invoice_id: int) -> Dict:
+        return self.normalize_accounting_entries(self._get_json(f"invoices/{invoice_id}/accounting-entries/"))
 
+    @staticmethod
+    def normalize_accounting_entries(external_entries) -> Dict:
         if isinstance(external_entries, list):
             entries = external_entries
         else:
-            entries = external_entries.get("entries", []) 
+            entries = external_entries.get("entries", [])
 
         return {
             "entries": [
                 {
                     "account": entry.get("account", ""),
                     "description": entry.get("description", ""),
-                    "amount": float(entry.get("amount", 0))
+                    "amount": to_money(entry.get("amount", 0))
                 } for entry in entries
             ]
         }
@@ -0,0 +1,116 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Count, QuerySet, Sum
+from django.db.models.functions import TruncMonth
+
+from InvoicesAccounting.app.filters.invoice_filter import InvalidFilter, InvoiceFilter
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.invoice_rollup_model import InvoiceRollupModel
+from InvoicesAccounting.app.services.invoice_sync_service import chunked
+
+GROUP_BY_FIELDS = ("state", "provider", "month", "date")
+SUM_FIELDS = ("base_value", "vat", "total_value")
+CENTS = Decimal("0.01")
+
+# Filters the rollup can answer; anything else (e.g. amount ranges) needs the invoice rows
+ROLLUP_FILTERS = {"state", "state__in", "provider", "provider__in", "date__range"}
+
+
+class InvoiceSummaryService:
+    BATCH_SIZE = 500
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def refresh_dates(self, dates: Iterable) -> int:
+        written = 0
+
+        for chunk in chunked({day for day in dates if day is not None}, self.batch_size):
+            groups = (
+                InvoiceModel.objects.filter(date__in=chunk)
+                .values("date", "state", "provider")
+                .annotate(invoice_count=Count("id"), **{field: Sum(field) for field in SUM_FIELDS})
+                .order_by()
+            )
+
+            with transaction.atomic():
+                InvoiceRollupModel.objects.filter(date__in=chunk).delete()
+                rollups = InvoiceRollupModel.objects.bulk_create(
+                    [InvoiceRollupModel(**group) for group in groups], batch_size=self.batch_size
+                )
+
+            written += len(rollups)
+
+        return written
+
+    def rebuild(self) -> int:
+        InvoiceRollupModel.objects.all().delete()
+
+        dates = InvoiceModel.objects.order_by("date").values_list("date", flat=True).distinct()
+        return self.refresh_dates(dates)
+
+    @staticmethod
+    def parse_group_by(raw_group_by) -> List[str]:
+        group_by = [field.strip() for field in (raw_group_by or "state").split(",") if field.strip()]
+
+        invalid_fields = [field for field in group_by if field not in GROUP_BY_FIELDS]
+        if invalid_fields or not group_by:
+            raise InvalidFilter("Invalid group_by. Allowed values: " + ", ".join(GROUP_BY_FIELDS))
+
+        return list(dict.fromkeys(group_by))
+
+    def summary(self, params) -> Dict:
+        group_by = self.parse_group_by(params.get("group_by"))
+        filters = InvoiceFilter(params).filters
+
+        if set(filters) <= ROLLUP_FILTERS:
+            source = "rollup"
+            queryset = InvoiceRollupModel.objects.filter(**filters)
+            count = Sum("invoice_count")
+        else:
+            source = "invoices"
+            queryset = InvoiceModel.objects.filter(**filters)
+            count = Count("id")
+
+        groups = self.aggregate(queryset, group_by, count)
+
+        return {
+            "group_by": group_by,
+            "source": source,
+            "groups": groups,
+            "totals": self.totals(groups),
+        }
+
+    @staticmethod
+    def aggregate(queryset: QuerySet, group_by: List[str], count) -> List[Dict]:
+        if "month" in group_by:
+            queryset = queryset.annotate(month=TruncMonth("date"))
+
+        rows = (
+            queryset.values(*group_by)
+            .annotate(count=count, **{field: Sum(field) for field in SUM_FIELDS})
+            .order_by(*group_by)
+        )
+
+        groups = []
+        for row in rows:
+            group = {field: row[field] for field in group_by}
+
+            if "month" in group:
+                group["month"] = group["month"].strftime("%Y-%m")
+            if "date" in group:
+                group["date"] = group["date"].isoformat()
+
+            group["count"] = row["count"]
+            group.update({field: str((row[field] or Decimal("0")).quantize(CENTS)) for field in SUM_FIELDS})
+            groups.append(group)
+
+        return groups
+
+    @staticmethod
+    def totals(groups: List[Dict]) -> Dict:
+        totals = {"count": sum(group["count"] for group in groups)}
+        totals.update({field: str(sum((Decimal(group[field]) for group in groups), Decimal("0.00"))) for field in SUM_FIELDS})
+        return totals
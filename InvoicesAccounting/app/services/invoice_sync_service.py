@@ -0,0 +1,160 @@
+import logging
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from InvoicesAccounting.app.metrics.invoice_metrics import observe_sync_batch, sync_rows
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.signals.sync_signals import invoices_synced
+from InvoicesAccounting.app.validators.batch_invoice_validator import BatchInvoiceValidator
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+logger = logging.getLogger(__name__)
+
+SYNC_FIELDS = ["provider", "concept", "base_value", "vat", "total_value", "date", "state"]
+
+
+@dataclass
+class SyncReport:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    invalid: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def merge(self, other: "SyncReport") -> None:
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.invalid += other.invalid
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "unchanged": self.unchanged, "invalid": self.invalid}
+
+
+def chunked(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class InvoiceSyncService:
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = settings.INVOICE_SYNC_BATCH_SIZE if batch_size is None else batch_size
+
+        if self.batch_size <= 0:
+            raise ValueError("Batch size must be greater than zero.")
+
+    def sync_payload(self, invoices: List[Dict]) -> Tuple[List[Dict], SyncReport]:
+        serializer, rows = self._validate(invoices)
+        return serializer.data, self.sync(rows)
+
+    def sync_batch(self, invoices: List[Dict]) -> SyncReport:
+        # Bulk ingest path: invalid rows are skipped and counted instead of failing the batch
+        rows, errors = BatchInvoiceValidator().validate(invoices)
+
+        if errors:
+            first_index = next(iter(errors))
+            logger.warning(
+                "Skipping %s invalid invoices, first at position %s: %s",
+                len(errors), first_index, errors[first_index],
+            )
+
+        report = self.sync(rows)
+        report.invalid = len(errors)
+        if errors:
+            sync_rows.inc(len(errors), result="invalid")
+        return report
+
+    def _validate(self, invoices: List[Dict]) -> Tuple[ValidateInvoice, List[Dict]]:
+        serializer = ValidateInvoice(data=invoices, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        # "id" is read-only on the serializer, so take it from the raw payload
+        rows = [
+            {**invoice_data, "id": raw_invoice.get("id")}
+            for raw_invoice, invoice_data in zip(invoices, serializer.validated_data)
+        ]
+
+        return serializer, rows
+
+    def sync(self, rows: Iterable[Dict]) -> SyncReport:
+        report = SyncReport()
+
+        for chunk in chunked(rows, self.batch_size):
+            started = time.perf_counter()
+            chunk_report = SyncReport()
+            self._sync_chunk(chunk, chunk_report)
+            observe_sync_batch(chunk_report, time.perf_counter() - started)
+            report.merge(chunk_report)
+
+        logger.info("Invoice sync finished: %s", report.as_dict())
+        return report
+
+    def _sync_chunk(self, chunk: List[Dict], report: SyncReport) -> None:
+        # Later rows win when the upstream repeats an id inside one chunk
+        rows_by_id = {}
+        rows_without_id = []
+        for row in chunk:
+            if row.get("id") is None:
+                rows_without_id.append(row)
+            else:
+                rows_by_id[row["id"]] = row
+
+        now = timezone.now()
+
+        with transaction.atomic():
+            existing = {
+                current["id"]: current
+                for current in InvoiceModel.objects.filter(id__in=list(rows_by_id)).values("id", *SYNC_FIELDS)
+            }
+
+            to_create = [InvoiceModel(**row) for row in rows_without_id]
+            to_update = []
+
+            for invoice_id, row in rows_by_id.items():
+                current = existing.get(invoice_id)
+
+                if current is None:
+                    to_create.append(InvoiceModel(**row))
+                elif any(current[field] != row[field] for field in SYNC_FIELDS if field in row):
+                    # bulk_update skips save(), so bump the version (in SQL) and timestamp here
+                    to_update.append(InvoiceModel(**{**current, **row, "version": F("version") + 1, "updated_at": now}))
+                else:
+                    report.unchanged += 1
+
+            if to_create:
+                to_create = InvoiceModel.objects.bulk_create(to_create, batch_size=self.batch_size)
+
+            if to_update:
+                InvoiceModel.objects.bulk_update(to_update, [*SYNC_FIELDS, "version", "updated_at"], batch_size=self.batch_size)
+
+        report.inserted += len(to_create)
+        report.updated += len(to_update)
+
+        # Backends that cannot return ids from bulk_create (MySQL) leave pk unset on new
+        # rows without an upstream id; rebuild_accounting_ledger covers those
+        created_ids = [invoice.pk for invoice in to_create if invoice.pk is not None]
+
+        # Updated invoices may have moved to another day, so their previous dates are stale too
+        dates = {invoice.date for invoice in to_create + to_update}
+        dates.update(existing[invoice.id]["date"] for invoice in to_update)
+
+        invoices_synced.send(
+            sender=self.__class__,
+            invoice_ids=list(set(rows_by_id) | set(created_ids)),
+            dates=dates,
+        )
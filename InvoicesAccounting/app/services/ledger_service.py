@@ -0,0 +1,123 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import QuerySet, Sum
+
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.models.accounting_entry_model import AccountingEntryModel
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.renderers.json_renderer import to_money
+from InvoicesAccounting.app.services.accounting_entry_service import ENTRY_ACCOUNTS
+from InvoicesAccounting.app.services.invoice_sync_service import chunked
+
+CREDIT_ACCOUNTS = {AccountingCodes.SUPPLIERS.value}
+ACCOUNT_ORDER = {code.value: position for position, (code, _) in enumerate(ENTRY_ACCOUNTS)}
+
+
+class LedgerService:
+    BATCH_SIZE = 1000
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def build_entries(self, invoices: Iterable) -> List[AccountingEntryModel]:
+        entries = []
+
+        for invoice_id, invoice_date, base_value, vat, total_value in invoices:
+            amounts = {"base_value": base_value, "vat": vat, "total_value": total_value}
+            for code, column in ENTRY_ACCOUNTS:
+                entries.append(AccountingEntryModel(
+                    invoice_id=invoice_id,
+                    account=code.value,
+                    amount=amounts[column],
+                    date=invoice_date,
+                ))
+
+        return entries
+
+    def refresh_invoices(self, invoice_ids: Iterable[int]) -> int:
+        written = 0
+
+        for chunk in chunked(invoice_ids, self.batch_size):
+            invoices = InvoiceModel.objects.filter(id__in=chunk).values_list(
+                "id", "date", "base_value", "vat", "total_value"
+            )
+
+            with transaction.atomic():
+                AccountingEntryModel.objects.filter(invoice_id__in=chunk).delete()
+                entries = AccountingEntryModel.objects.bulk_create(
+                    self.build_entries(invoices), batch_size=self.batch_size
+                )
+
+            written += len(entries)
+
+        return written
+
+    def rebuild(self) -> int:
+        AccountingEntryModel.objects.all().delete()
+
+        invoice_ids = InvoiceModel.objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=self.batch_size)
+        return self.refresh_invoices(invoice_ids)
+
+    @staticmethod
+    def entries_for_invoice(invoice_id: int) -> List[Dict]:
+        entries = AccountingEntryModel.objects.filter(invoice_id=invoice_id).values_list("account", "amount")
+        return LedgerService.format_entries(entries)
+
+    @staticmethod
+    async def aentries_for_invoice(invoice_id: int) -> List[Dict]:
+        entries = AccountingEntryModel.objects.filter(invoice_id=invoice_id).values_list("account", "amount")
+        return LedgerService.format_entries([entry async for entry in entries])
+
+    @staticmethod
+    def format_entries(entries: Iterable) -> List[Dict]:
+        # Same shape and order as InvoiceModel.accounting_entries
+        return [
+            {"account": account, "description": AccountingCodes(account).label, "amount": to_money(amount)}
+            for account, amount in sorted(entries, key=lambda entry: ACCOUNT_ORDER[entry[0]])
+        ]
+
+    @staticmethod
+    def ledger(account: str, start_date=None, end_date=None) -> QuerySet:
+        queryset = AccountingEntryModel.objects.filter(account=account)
+
+        if start_date and end_date:
+            queryset = queryset.filter(date__range=(start_date, end_date))
+
+        return queryset
+
+    @staticmethod
+    def trial_balance(start_date=None, end_date=None) -> Dict:
+        queryset = AccountingEntryModel.objects.all()
+
+        if start_date and end_date:
+            queryset = queryset.filter(date__range=(start_date, end_date))
+
+        balances = {row["account"]: row["balance"] for row in queryset.values("account").annotate(balance=Sum("amount"))}
+
+        accounts = []
+        total_debit = total_credit = Decimal("0.00")
+
+        for code, _ in ENTRY_ACCOUNTS:
+            balance = balances.get(code.value) or Decimal("0.00")
+            is_credit = code.value in CREDIT_ACCOUNTS
+
+            accounts.append({
+                "account": code.value,
+                "description": code.label,
+                "debit": str(Decimal("0.00") if is_credit else balance),
+                "credit": str(balance if is_credit else Decimal("0.00")),
+            })
+
+            if is_credit:
+                total_credit += balance
+            else:
+                total_debit += balance
+
+        return {
+            "accounts": accounts,
+            "total_debit": str(total_debit),
+            "total_credit": str(total_credit),
+            "balanced": total_debit == total_credit,
+        }
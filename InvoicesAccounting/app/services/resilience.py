@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from django.conf import settings
+
+from InvoicesAccounting.app.instrumentation.request_metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Verbs that can be replayed without creating a second invoice
+IDEMPOTENT_METHODS = frozenset({"get", "head", "options", "put", "delete"})
+
+# Statuses worth another attempt; 429 is retried but does not count against the breaker
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = settings.PAYMENT_API_BREAKER_FAILURES if failure_threshold is None else failure_threshold
+        self.reset_timeout = settings.PAYMENT_API_BREAKER_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self.counters = {"calls": 0, "failures": 0, "retries": 0, "rejected": 0, "opened": 0}
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probe_started_at = 0.0
+
+            # Half-open lets a single probe through; a probe that never reports back expires
+            if self.state == self.HALF_OPEN and now - self.probe_started_at >= self.reset_timeout:
+                self.probe_started_at = now
+                self.counters["calls"] += 1
+                return True
+
+            if self.state != self.CLOSED:
+                self.counters["rejected"] += 1
+                return False
+
+            self.counters["calls"] += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened for {self.name} after {self.consecutive_failures} failures")
+                    self.counters["opened"] += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.counters["retries"] += 1
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                **self.counters,
+            }
+
+
+class CircuitBreakerRegistry:
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is not None:
+            return breaker
+
+        with self._lock:
+            return self._breakers.setdefault(name, CircuitBreaker(name))
+
+    def stats(self) -> List[Dict]:
+        return [breaker.stats() for breaker in list(self._breakers.values())]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakerRegistry()
+
+
+def operation_timeout(operation: str) -> httpx.Timeout:
+    # Listing and syncing move whole exports, everything else should answer quickly
+    read = settings.PAYMENT_API_SYNC_READ_TIMEOUT if operation == "sync" else settings.PAYMENT_API_READ_TIMEOUT
+    return httpx.Timeout(settings.PAYMENT_API_TIMEOUT, connect=settings.PAYMENT_API_CONNECT_TIMEOUT, read=read)
+
+
+def backoff_delay(attempt: int) -> float:
+    # Full jitter keeps workers that failed together from retrying together
+    ceiling = min(settings.PAYMENT_API_RETRY_BACKOFF_MAX, settings.PAYMENT_API_RETRY_BACKOFF * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def max_retries(method: str) -> int:
+    return settings.PAYMENT_API_MAX_RETRIES if method.lower() in IDEMPOTENT_METHODS else 0
+
+
+def send_with_retries(
+    breaker: CircuitBreaker,
+    method: str,
+    send: Callable[[], httpx.Response],
+    sleep: Callable[[float], None] = time.sleep,
+) -> httpx.Response:
+    if not breaker.allow():
+        raise CircuitOpenError(f"Upstream {breaker.name} is unavailable, circuit open.")
+
+    retries = max_retries(method)
+    attempt = 0
+
+    while True:
+        try:
+            with timed("upstream"):
+                response = send()
+        except httpx.TransportError:
+            if attempt < retries:
+                breaker.record_retry()
+                sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            breaker.record_failure()
+            raise
+
+        if response.status_code in RETRYABLE_STATUSES and attempt < retries:
+            # Streamed responses hold their connection until closed
+            response.close()
+            breaker.record_retry()
+            sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        if response.status_code in FAILURE_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return response
+
+
+async def asend_with_retries(
+    breaker: CircuitBreaker,
+    method: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> httpx.Response:
+    if not breaker.allow():
+        raise CircuitOpenError(f"Upstream {breaker.name} is unavailable, circuit open.")
+
+    retries = max_retries(method)
+    attempt = 0
+
+    while True:
+        try:
+            with timed("upstream"):
+                response = await send()
+        except httpx.TransportError:
+            if attempt < retries:
+                breaker.record_retry()
+                await sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            breaker.record_failure()
+            raise
+
+        if response.status_code in RETRYABLE_STATUSES and attempt < retries:
+            breaker.record_retry()
+            await sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        if response.status_code in FAILURE_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return response
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import weakref
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # asyncio futures belong to one loop, so every loop gets its own table
+        self._tasks = weakref.WeakKeyDictionary()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable]) -> Any:
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.setdefault(loop, {})
+
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = loop.create_task(func())
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+            self.executed += 1
+        else:
+            self.shared += 1
+
+        # A caller that gets cancelled must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict:
+        return {"executed": self.executed, "shared": self.shared}
+
+
+single_flight = SingleFlight()
+
+
+def call_key(service, method: Callable, args, kwargs) -> Hashable:
+    return (service.base_url, method.__name__, args, tuple(sorted(kwargs.items())))
+
+
+def coalesced(method: Callable) -> Callable:
+    # Concurrent identical calls share one upstream request; callers get the same object back
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return single_flight.do(call_key(self, method, args, kwargs), lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def acoalesced(method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await single_flight.ado(call_key(self, method, args, kwargs), lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.invoice_summary_service import InvoiceSummaryService
+from InvoicesAccounting.app.services.ledger_service import LedgerService
+from InvoicesAccounting.app.signals.sync_signals import invoices_synced
+
+
+def invalidate_now_and_on_commit(invoice_ids):
+    # Drop the entry right away and again once committed, so a reader racing the
+    # transaction cannot leave the pre-write value cached
+    invoice_cache.invalidate_many(invoice_ids)
+    transaction.on_commit(lambda: invoice_cache.invalidate_many(invoice_ids))
+
+
+@receiver(post_save, sender=InvoiceModel)
+@receiver(post_delete, sender=InvoiceModel)
+def invalidate_invoice_cache(sender, instance, **kwargs):
+    invalidate_now_and_on_commit([instance.pk])
+
+
+@receiver(invoices_synced)
+def invalidate_synced_invoices_cache(sender, invoice_ids, **kwargs):
+    invalidate_now_and_on_commit(list(invoice_ids))
+
+
+@receiver(post_save, sender=InvoiceModel)
+def refresh_invoice_ledger(sender, instance, **kwargs):
+    # Deletes need no receiver, the ledger rows cascade with the invoice
+    LedgerService().refresh_invoices([instance.pk])
+
+
+@receiver(invoices_synced)
+def refresh_synced_invoices_ledger(sender, invoice_ids, **kwargs):
+    LedgerService().refresh_invoices(invoice_ids)
+
+
+@receiver(pre_save, sender=InvoiceModel)
+def remember_previous_invoice_date(sender, instance, **kwargs):
+    # The rollup of the old day must be recomputed when an invoice changes date
+    instance._previous_date = None
+    if instance.pk:
+        instance._previous_date = InvoiceModel.objects.filter(pk=instance.pk).values_list("date", flat=True).first()
+
+
+@receiver(post_save, sender=InvoiceModel)
+@receiver(post_delete, sender=InvoiceModel)
+def refresh_invoice_rollups(sender, instance, **kwargs):
+    InvoiceSummaryService().refresh_dates([instance.date, getattr(instance, "_previous_date", None)])
+
+
+@receiver(invoices_synced)
+def refresh_synced_invoices_rollups(sender, invoice_ids, dates=(), **kwargs):
+    InvoiceSummaryService().refresh_dates(dates)
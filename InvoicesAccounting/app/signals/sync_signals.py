@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by InvoiceSyncService after each chunk with the affected invoice_ids and
+# dates, since bulk writes skip post_save
+invoices_synced = Signal()
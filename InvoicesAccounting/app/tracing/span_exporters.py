@@ -0,0 +1,73 @@
+import json
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class SpanExporter:
+
+    def export(self, spans: List) -> None:
+        raise NotImplementedError
+
+
+class NoopSpanExporter(SpanExporter):
+
+    def export(self, spans: List) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    # Keeps the most recent spans for tests and the shell; the oldest fall off once full
+
+    def __init__(self, max_spans: int = 10_000):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List) -> None:
+        with self._lock:
+            self._spans.extend(span.as_dict() for span in spans)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span["trace_id"] == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    # One JSON object per line, so traces can be inspected offline with jq or loaded into a collector
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List) -> None:
+        lines = "".join(json.dumps(span.as_dict(), default=str) + "\n" for span in spans)
+
+        with self._lock:
+            with open(self.path, "a") as output:
+                output.write(lines)
+
+
+SPAN_EXPORTERS = {
+    "none": NoopSpanExporter,
+    "memory": InMemorySpanExporter,
+}
+
+
+def build_exporter(name: str) -> SpanExporter:
+    if name == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if name in SPAN_EXPORTERS:
+        return SPAN_EXPORTERS[name]()
+
+    # Any other value is a dotted path to a SpanExporter subclass, e.g. an OTLP bridge
+    try:
+        return import_string(name)()
+    except ImportError:
+        raise ValueError(f"Invalid tracing exporter '{name}'. Use none, memory, file or a dotted path to a SpanExporter.")
@@ -0,0 +1,297 @@
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from InvoicesAccounting.app.tracing.span_exporters import SpanExporter, build_exporter
+
+logger = logging.getLogger(__name__)
+
+# W3C Trace Context: version-trace_id-parent_id-flags
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+SAMPLED_FLAG = 0x01
+
+MAX_STATEMENT_LENGTH = 1_000
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    match = TRACEPARENT.match((header or "").strip().lower())
+    if not match:
+        return None
+
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == INVALID_TRACE_ID or parent_id == INVALID_SPAN_ID:
+        return None
+
+    return trace_id, parent_id, bool(int(flags, 16) & SAMPLED_FLAG)
+
+
+class Span:
+    __slots__ = (
+        "name", "kind", "trace_id", "span_id", "parent_id", "sampled", "attributes",
+        "started", "start_time", "duration", "status", "error", "trace",
+    )
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], sampled: bool, trace: "TraceBuffer"):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes: Dict = {}
+        self.started = time.perf_counter()
+        self.start_time = time.time()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.trace = trace
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{SAMPLED_FLAG if self.sampled else 0:02x}"
+
+    def as_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": self.trace.service,
+            "start_time": self.start_time,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class NonRecordingSpan:
+    # Stands in when tracing is off, so callers can set attributes without checking
+    trace_id = None
+    sampled = False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = NonRecordingSpan()
+
+
+class TraceBuffer:
+    # Spans of one trace in this process, exported together when the local root ends
+
+    def __init__(self, service: str, max_spans: int):
+        self.service = service
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self.started = 0
+        self.dropped = 0
+        self.exported = False
+
+
+class Sampler:
+
+    def __init__(self, rate: float):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Sample rate must be between 0 and 1.")
+        self.rate = rate
+        self.threshold = int(rate * (1 << 64))
+
+    def should_sample(self, trace_id: str, parent_sampled: Optional[bool] = None) -> bool:
+        # Follow the caller's decision, otherwise decide on the trace id so every service agrees
+        if parent_sampled is not None:
+            return parent_sampled
+        return int(trace_id[16:], 16) < self.threshold
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+
+    def __init__(self, exporter: SpanExporter, sampler: Sampler, service: str, max_spans_per_trace: int):
+        self.exporter = exporter
+        self.sampler = sampler
+        self.service = service
+        self.max_spans_per_trace = max_spans_per_trace
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def start_span(self, name: str, kind: str = "internal", attributes: Optional[Dict] = None, traceparent: Optional[str] = None):
+        parent = _current_span.get()
+
+        if parent is None:
+            if not settings.TRACING_ENABLED:
+                yield NON_RECORDING_SPAN
+                return
+            span = self._start_root(name, kind, traceparent)
+        elif not parent.sampled:
+            # Unsampled traces only carry their context so upstream calls inherit the decision
+            yield parent
+            return
+        elif parent.trace.started >= parent.trace.max_spans:
+            parent.trace.dropped += 1
+            yield NON_RECORDING_SPAN
+            return
+        else:
+            span = Span(name, kind, parent.trace_id, parent.span_id, True, parent.trace)
+            span.trace.started += 1
+
+        if attributes and span.sampled:
+            span.attributes.update(attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._end(span, parent)
+
+    def _start_root(self, name: str, kind: str, traceparent: Optional[str]) -> Span:
+        incoming = parse_traceparent(traceparent)
+        trace = TraceBuffer(self.service, self.max_spans_per_trace)
+
+        if incoming:
+            trace_id, parent_id, parent_sampled = incoming
+            sampled = self.sampler.should_sample(trace_id, parent_sampled)
+        else:
+            trace_id, parent_id = new_trace_id(), None
+            sampled = self.sampler.should_sample(trace_id)
+
+        trace.started = 1
+        return Span(name, kind, trace_id, parent_id, sampled, trace)
+
+    def _end(self, span: Span, parent: Optional[Span]) -> None:
+        span.duration = time.perf_counter() - span.started
+        if not span.sampled:
+            return
+
+        trace = span.trace
+        if trace.exported:
+            # Finished after its local root, e.g. a background thread, so it goes out on its own
+            self._export([span])
+            return
+
+        trace.spans.append(span)
+
+        if parent is None:
+            if trace.dropped:
+                span.attributes["tracing.dropped_spans"] = trace.dropped
+            trace.exported = True
+            self._export(trace.spans)
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.error(f"Error exporting spans: {str(e)}")
+
+
+def build_tracer() -> Tracer:
+    return Tracer(
+        exporter=build_exporter(settings.TRACING_EXPORTER),
+        sampler=Sampler(settings.TRACING_SAMPLE_RATE),
+        service=settings.TRACING_SERVICE_NAME,
+        max_spans_per_trace=settings.TRACING_MAX_SPANS_PER_TRACE,
+    )
+
+
+tracer = build_tracer()
+
+
+def traced(function: Callable) -> Callable:
+    # Spans are named after the qualified name, e.g. InvoiceService.get_invoice
+    name = function.__qualname__
+
+    if iscoroutinefunction(function):
+        @wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.start_span(name):
+                return await function(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with tracer.start_span(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_query(execute, sql, params, many, context):
+    # Only queries inside a sampled trace get a span, the rest pay one contextvar lookup
+    parent = _current_span.get()
+    if parent is None or not parent.sampled:
+        return execute(sql, params, many, context)
+
+    connection = context["connection"]
+    operation = sql.lstrip().split(" ", 1)[0].upper()
+
+    with tracer.start_span(f"SQL {operation}", kind="client") as span:
+        span.set_attribute("db.system", connection.vendor)
+        span.set_attribute("db.alias", connection.alias)
+        span.set_attribute("db.statement", sql[:MAX_STATEMENT_LENGTH])
+        if many:
+            span.set_attribute("db.executemany", True)
+        return execute(sql, params, many, context)
+
+
+def install_query_tracer(connection, **kwargs) -> None:
+    # Below any active wrapper, same as install_query_timer: execute_wrapper() pops the last entry
+    if trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, trace_query)
+
+
+def install_query_tracers() -> None:
+    connection_created.connect(install_query_tracer, dispatch_uid="tracing_query_tracer")
+    for connection in connections.all(initialized_only=True):
+        install_query_tracer(connection)
+
+
+def inject_traceparent(request) -> None:
+    # httpx request hook: upstream continues the trace under the current (client) span
+    span = _current_span.get()
+    if span is not None:
+        request.headers["traceparent"] = span.traceparent()
+
+
+async def ainject_traceparent(request) -> None:
+    inject_traceparent(request)
@@ -0,0 +1,231 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Tuple
+
+from django.utils.dateparse import parse_date
+
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+REQUIRED = "This field is required."
+NOT_NULL = "This field may not be null."
+NOT_BLANK = "This field may not be blank."
+INVALID_NUMBER = "A valid number is required."
+INVALID_DATE = "Date has wrong format. Use one of these formats instead: YYYY-MM-DD."
+INVALID_INTEGER = "A valid integer is required."
+MIN_ID = "Ensure this value is greater than or equal to 1."
+
+MONEY_FIELDS = ("base_value", "vat", "total_value")
+TEXT_FIELDS = ("provider", "concept")
+
+
+class BatchInvoiceValidator:
+    # Same field rules as ValidateInvoice + InvoiceModel.clean, without building a
+    # serializer field tree or a model instance per row
+
+    def __init__(self):
+        money_field = InvoiceModel._meta.get_field("base_value")
+        self.max_digits = money_field.max_digits
+        self.decimal_places = money_field.decimal_places
+        self.max_whole_digits = self.max_digits - self.decimal_places
+        self.quantum = Decimal(1).scaleb(-self.decimal_places)
+        self.provider_max_length = InvoiceModel._meta.get_field("provider").max_length
+        self.states = set(InvoiceStates.values)
+
+    def validate(self, rows: List[Dict]) -> Tuple[List[Dict], Dict[int, Dict[str, List[str]]]]:
+        valid_rows = []
+        errors = {}
+
+        for index, row in enumerate(rows):
+            cleaned, row_errors = self.validate_row(row)
+
+            if row_errors:
+                errors[index] = row_errors
+            else:
+                valid_rows.append(cleaned)
+
+        return valid_rows, errors
+
+    def validate_row(self, row: Dict) -> Tuple[Optional[Dict], Dict[str, List[str]]]:
+        if not isinstance(row, dict):
+            return None, {"non_field_errors": ["Invalid data. Expected a dictionary, but got {}.".format(type(row).__name__)]}
+
+        cleaned = {}
+        errors = {}
+
+        # Ids come from upstream JSON, so "5" must match invoice 5 and junk must fail only its row
+        invoice_id, error = self._id(row.get("id"))
+        if error:
+            errors["id"] = [error]
+        else:
+            cleaned["id"] = invoice_id
+
+        for field in TEXT_FIELDS:
+            value, error = self._text(row, field)
+            if error:
+                errors[field] = [error]
+            else:
+                cleaned[field] = value
+
+        for field in MONEY_FIELDS:
+            if field not in row:
+                errors[field] = [REQUIRED]
+                continue
+
+            value, error = self._money(row[field])
+            if error:
+                errors[field] = [error]
+            else:
+                cleaned[field] = value
+
+        if "date" in row:
+            value, error = self._date(row["date"])
+            if error:
+                errors["date"] = [error]
+            else:
+                cleaned["date"] = value
+
+        if "state" in row:
+            state = row["state"]
+            if state is None:
+                errors["state"] = [NOT_NULL]
+            elif str(state) not in self.states:
+                errors["state"] = [f'"{state}" is not a valid choice.']
+            else:
+                cleaned["state"] = str(state)
+
+        # Field errors stop the row before the object-level rules, as in DRF
+        if errors:
+            return None, errors
+
+        # Mirrors ValidateInvoice.validate, which treats falsy values (including 0) as missing
+        for field in ("date", "vat", "base_value", "total_value"):
+            if not cleaned.get(field):
+                return None, {field: [REQUIRED]}
+
+        return cleaned, self._business_rules(cleaned)
+
+    def _business_rules(self, cleaned: Dict) -> Dict[str, List[str]]:
+        # Same checks and messages as InvoiceModel.clean
+        errors = {}
+
+        if cleaned["base_value"] <= 0:
+            errors["base_value"] = ["Base value must be greater than zero."]
+
+        if cleaned["vat"] < 0:
+            errors["vat"] = ["VAT cannot be negative."]
+
+        if cleaned["total_value"] <= 0:
+            errors["total_value"] = ["Total value must be greater than zero."]
+
+        expected_total = cleaned["base_value"] + cleaned["vat"]
+        if cleaned["total_value"] != expected_total:
+            errors["total_value"] = [f"Total value must be {expected_total}."]
+
+        return errors
+
+    def _id(self, value) -> Tuple[Optional[int], Optional[str]]:
+        if value is None:
+            return None, None
+
+        if isinstance(value, bool):
+            return None, INVALID_INTEGER
+
+        if isinstance(value, float):
+            if not value.is_integer():
+                return None, INVALID_INTEGER
+            value = int(value)
+        elif not isinstance(value, int):
+            text = str(value).strip()
+            if not text.isdigit():
+                return None, INVALID_INTEGER
+            value = int(text)
+
+        if value < 1:
+            return None, MIN_ID
+
+        return value, None
+
+    def _text(self, row: Dict, field: str) -> Tuple[Optional[str], Optional[str]]:
+        if field not in row:
+            return None, REQUIRED
+
+        value = row[field]
+        if value is None:
+            return None, NOT_NULL
+
+        if isinstance(value, (dict, list, bool)):
+            return None, "Not a valid string."
+
+        value = str(value).strip()
+        if not value:
+            return None, NOT_BLANK
+
+        if field == "provider" and len(value) > self.provider_max_length:
+            return None, f"Ensure this field has no more than {self.provider_max_length} characters."
+
+        return value, None
+
+    def _money(self, value) -> Tuple[Optional[Decimal], Optional[str]]:
+        if value is None:
+            return None, NOT_NULL
+
+        if isinstance(value, bool):
+            return None, INVALID_NUMBER
+
+        if not isinstance(value, Decimal):
+            text = str(value).strip()
+            if len(text) > 1000:
+                return None, "String value too large."
+            try:
+                value = Decimal(text)
+            except InvalidOperation:
+                return None, INVALID_NUMBER
+
+        if not value.is_finite():
+            return None, INVALID_NUMBER
+
+        _, digits, exponent = value.as_tuple()
+        if exponent >= 0:
+            total_digits = len(digits) + exponent
+            whole_digits = total_digits
+            decimal_places = 0
+        elif len(digits) > abs(exponent):
+            total_digits = len(digits)
+            whole_digits = total_digits - abs(exponent)
+            decimal_places = abs(exponent)
+        else:
+            decimal_places = abs(exponent)
+            total_digits = decimal_places
+            whole_digits = 0
+
+        if total_digits > self.max_digits:
+            return None, f"Ensure that there are no more than {self.max_digits} digits in total."
+
+        if decimal_places > self.decimal_places:
+            return None, f"Ensure that there are no more than {self.decimal_places} decimal places."
+
+        if whole_digits > self.max_whole_digits:
+            return None, f"Ensure that there are no more than {self.max_whole_digits} digits before the decimal point."
+
+        return value.quantize(self.quantum), None
+
+    def _date(self, value) -> Tuple[Optional[date], Optional[str]]:
+        if value is None:
+            return None, NOT_NULL
+
+        if isinstance(value, datetime):
+            return None, "Expected a date but got a datetime."
+
+        if isinstance(value, date):
+            return value, None
+
+        try:
+            parsed = parse_date(str(value))
+        except ValueError:
+            parsed = None
+
+        if parsed is None:
+            return None, INVALID_DATE
+
+        return parsed, None
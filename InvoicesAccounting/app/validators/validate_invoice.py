@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError  
 from rest_framework import serializers
+from InvoicesAccounting.app.instrumentation.request_metrics import timed
 from InvoicesAccounting.app.models.invoice_model import InvoiceModel
 
 class ValidateInvoice(serializers.ModelSerializer):
@@ -8,6 +9,10 @@ class ValidateInvoice(serializers.ModelSerializer):
         model = InvoiceModel
         fields = [field.name for field in InvoiceModel._meta.fields] 
 
+    def is_valid(self, *, raise_exception=False):
+        with timed("validation"):
+            return super().is_valid(raise_exception=raise_exception)
+
     def validate(self, data):
 
         if 'date' not in data or not data['date']:
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class InvoicesaccountingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'InvoicesAccounting'
+
+    def ready(self):
+        from InvoicesAccounting.app.signals import invoice_signals  # noqa: F401
+        from InvoicesAccounting.app.instrumentation.request_metrics import install_query_timers
+        from InvoicesAccounting.app.tracing.tracer import install_query_tracers
+
+        # Hooked before any request, so connections opened on other threads (sync_to_async,
+        # test setup) are timed too; the wrapper is a no-op outside an instrumented request
+        install_query_timers()
+        install_query_tracers()
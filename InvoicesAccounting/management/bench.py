@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import QuerySet
+
+from InvoicesAccounting.app.models.accounting_entry_model import AccountingEntryModel
+from InvoicesAccounting.app.services.invoice_summary_service import InvoiceSummaryService
+
+
+@contextmanager
+def throwaway_database():
+    # Same creation path as the test runner, so the benchmark never writes to the configured database
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def purge_invoices(queryset: QuerySet) -> int:
+    # A plain delete() loads every row and fires the cache, ledger and rollup receivers per
+    # invoice; raw deletes skip them and the rollups of the touched days are rebuilt once.
+    # Detail cache entries are left to expire, the bench commands drop them when seeding
+    queryset = queryset.order_by()
+    dates = list(queryset.values_list("date", flat=True).distinct())
+
+    with transaction.atomic():
+        ledger_entries = AccountingEntryModel.objects.filter(invoice__in=queryset.values("id"))
+        ledger_entries._raw_delete(ledger_entries.db)
+        deleted = queryset._raw_delete(queryset.db)
+
+    InvoiceSummaryService().refresh_dates(dates)
+    return deleted
@@ -0,0 +1,265 @@
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.renderers.json_renderer import dumps
+from InvoicesAccounting.app.services.http_client_registry import http_client_registry
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.resilience import circuit_breakers
+from InvoicesAccounting.management.bench import purge_invoices
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCH_PROVIDER_PREFIX = "bench-endpoints-"
+BENCH_USERNAME = "bench-endpoints"
+STUB_BASE_URL = "http://bench-upstream.local/"
+
+ENDPOINTS = ("list", "detail", "filter", "accounting_entries", "create", "update", "delete")
+
+INVOICE_PATH = re.compile(r"^/invoices/(\d+)/$")
+ENTRIES_PATH = re.compile(r"^/invoices/(\d+)/accounting-entries/$")
+
+
+class StubUpstream:
+
+    def __init__(self, invoices, latency_ms=0.0):
+        self.invoices = {invoice["id"]: invoice for invoice in invoices}
+        self.filter_page = json.dumps(invoices[:50]).encode()
+        self.latency = latency_ms / 1000
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = request.url.path
+
+        if path == "/invoices/filter/":
+            return httpx.Response(200, content=self.filter_page, headers={"Content-Type": "application/json"})
+
+        if path == "/invoices/" and request.method == "POST":
+            return httpx.Response(201, json={**json.loads(request.content), "id": len(self.invoices) + self.requests})
+
+        match = ENTRIES_PATH.match(path)
+        if match:
+            invoice = self.invoices.get(int(match.group(1)))
+            if invoice is None:
+                return httpx.Response(404, json={"error": "Invoice not found"})
+            return httpx.Response(200, json={"entries": [
+                {"account": "6000", "description": "Purchases", "amount": invoice["base_value"]},
+                {"account": "4720", "description": "VAT Supported", "amount": invoice["vat"]},
+                {"account": "4000", "description": "Suppliers", "amount": invoice["total_value"]},
+            ]})
+
+        match = INVOICE_PATH.match(path)
+        if match:
+            invoice = self.invoices.get(int(match.group(1)))
+            if request.method == "DELETE":
+                return httpx.Response(204)
+            if request.method == "PUT":
+                return httpx.Response(200, json={**(invoice or {}), **json.loads(request.content)})
+            return httpx.Response(200, json=invoice) if invoice else httpx.Response(404, json={"error": "Invoice not found"})
+
+        return httpx.Response(200, json=[])
+
+
+class Command(BaseCommand):
+    help = "Seed invoices and drive every invoice endpoint in-process against a stub upstream."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--invoices", type=int, default=1_000, help="Number of invoices to seed.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint.")
+        parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints to run.")
+        parser.add_argument("--upstream-latency", type=float, default=0.0, help="Milliseconds the stub upstream waits per call.")
+        parser.add_argument("--batch-size", type=int, default=1_000, help="Rows per INSERT while seeding.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows afterwards.")
+
+    def handle(self, *args, **options):
+        endpoints = [name.strip() for name in options["endpoints"].split(",") if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError("Unknown endpoints: " + ", ".join(sorted(unknown)) + ". Allowed values: " + ", ".join(ENDPOINTS))
+
+        if options["invoices"] <= 0 or options["requests"] <= 0:
+            raise CommandError("--invoices and --requests must be greater than zero.")
+
+        invoice_ids = self.seed(options["invoices"], options["batch_size"])
+        user = get_user_model().objects.create_user(username=BENCH_USERNAME, password=None)
+
+        try:
+            rows = [invoice.to_dict() for invoice in InvoiceModel.objects.filter(id__in=invoice_ids[:1_000])]
+            stub = StubUpstream(json.loads(dumps(rows)), options["upstream_latency"])
+
+            with self.stub_upstream(stub):
+                client = Client()
+                client.force_login(user)
+
+                results = {
+                    "invoices": options["invoices"],
+                    "requests": options["requests"],
+                    "upstream_latency_ms": options["upstream_latency"],
+                    "vendor": connection.vendor,
+                    "endpoints": {},
+                }
+
+                random_generator = random.Random(42)
+                for name in endpoints:
+                    request = self.build_request(name, client, invoice_ids, random_generator)
+                    results["endpoints"][name] = self.measure(request, options["requests"], options["warmup"])
+
+                results["upstream_calls"] = stub.requests
+                results["peak_rss_mb"] = self.peak_rss_mb()
+        finally:
+            user.delete()
+            if not options["keep"]:
+                purge_invoices(InvoiceModel.objects.filter(provider__startswith=BENCH_PROVIDER_PREFIX))
+
+        for name, result in results["endpoints"].items():
+            self.stdout.write(
+                f"{name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+                f"{result['requests_per_second']:.0f} req/s, {result['queries_per_request']:.1f} queries/req"
+            )
+        self.stdout.write(f"peak RSS: {results['peak_rss_mb']} MB")
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def seed(self, rows, batch_size):
+        random_generator = random.Random(42)
+        states = InvoiceStates.values
+        first_day = date(2024, 1, 1)
+
+        self.stdout.write(f"Seeding {rows} invoices...")
+
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for index in range(offset, min(offset + batch_size, rows)):
+                base_value = (Decimal(random_generator.randint(100, 1_000_000)) / 100).quantize(Decimal("0.01"))
+                vat = (base_value * Decimal("0.21")).quantize(Decimal("0.01"))
+                batch.append(InvoiceModel(
+                    provider=f"{BENCH_PROVIDER_PREFIX}{index % 50}",
+                    concept="Benchmark invoice",
+                    base_value=base_value,
+                    vat=vat,
+                    total_value=base_value + vat,
+                    date=first_day + timedelta(days=index % 365),
+                    state=states[index % len(states)],
+                ))
+            InvoiceModel.objects.bulk_create(batch)
+
+        invoice_ids = list(InvoiceModel.objects.filter(provider__startswith=BENCH_PROVIDER_PREFIX).values_list("id", flat=True))
+
+        # Ids of rows deleted by an earlier run can come back, drop whatever was cached for them
+        invoice_cache.invalidate_many(invoice_ids)
+        return invoice_ids
+
+    @contextmanager
+    def stub_upstream(self, stub):
+        # The views build their own InvoiceService, so the stub goes where they look the client up
+        previous_base_url = InvoiceService.BASE_URL
+        base_url = previous_base_url or STUB_BASE_URL
+        InvoiceService.BASE_URL = base_url
+
+        previous_client = http_client_registry.register(base_url, httpx.Client(base_url=base_url, transport=httpx.MockTransport(stub)))
+        circuit_breakers.reset()
+        setup_test_environment()
+
+        try:
+            yield
+        finally:
+            teardown_test_environment()
+            http_client_registry.register(base_url, previous_client).close()
+            InvoiceService.BASE_URL = previous_base_url
+            circuit_breakers.reset()
+
+    def build_request(self, name, client, invoice_ids, random_generator):
+        payload = {
+            "provider": f"{BENCH_PROVIDER_PREFIX}new",
+            "concept": "Benchmark invoice",
+            "base_value": "100.00",
+            "vat": "21.00",
+            "total_value": "121.00",
+            "date": "2025-02-10",
+            "state": InvoiceStates.PENDING.value,
+        }
+
+        def pick():
+            return random_generator.choice(invoice_ids)
+
+        requests = {
+            "list": lambda: client.get(reverse("invoice-list"), {"limit": 100}),
+            "detail": lambda: client.get(reverse("invoice-detail", args=[pick()])),
+            "filter": lambda: client.get(reverse("invoice-filter"), {"state": InvoiceStates.PENDING.value, "limit": 50}),
+            "accounting_entries": lambda: client.get(reverse("invoice-accounting-entries", args=[pick()])),
+            "create": lambda: client.post(reverse("invoice-create"), payload, content_type="application/json"),
+            "update": lambda: client.put(reverse("invoice-update", args=[pick()]), {**payload, "state": InvoiceStates.PAID.value}, content_type="application/json"),
+            "delete": lambda: client.delete(reverse("invoice-delete", args=[pick()])),
+        }
+        return requests[name]
+
+    def measure(self, request, count, warmup):
+        for _ in range(warmup):
+            request()
+
+        timings = []
+        query_counts = []
+        statuses = {}
+
+        def count_queries(execute, sql, params, many, context):
+            query_counts[-1] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            for _ in range(count):
+                query_counts.append(0)
+                request_started = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - request_started) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        elapsed = time.perf_counter() - started
+
+        percentiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+        return {
+            "p50_ms": percentiles[49],
+            "p95_ms": percentiles[94],
+            "p99_ms": percentiles[98],
+            "max_ms": max(timings),
+            "requests_per_second": count / elapsed if elapsed else 0.0,
+            "queries_per_request": statistics.mean(query_counts),
+            "max_queries": max(query_counts),
+            "statuses": {str(status): total for status, total in sorted(statuses.items())},
+        }
+
+    @staticmethod
+    def peak_rss_mb():
+        if resource is None:
+            return None
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
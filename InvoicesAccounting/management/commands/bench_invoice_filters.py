@@ -0,0 +1,140 @@
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.management.bench import purge_invoices, throwaway_database
+
+BENCH_PROVIDER_PREFIX = "bench-provider-"
+
+# Only the indexes behind the benchmarked filters are dropped and recreated
+FILTER_INDEXES = ("invoice_state_date_idx", "invoice_date_idx", "invoice_provider_date_idx")
+
+
+class Command(BaseCommand):
+    help = "Seed invoices and compare filter query plans and latency with and without the filter indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Number of invoices to seed.")
+        parser.add_argument("--providers", type=int, default=500, help="Number of distinct providers.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query and phase.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per INSERT while seeding.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows afterwards (with --live-database).")
+        parser.add_argument(
+            "--live-database",
+            action="store_true",
+            help="Run against the configured database instead of a throwaway one. Seeds rows there and drops the filter indexes while measuring.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] <= 0:
+            raise CommandError("--rows must be greater than zero.")
+
+        if options["live_database"]:
+            results = self.run(options)
+        else:
+            with throwaway_database():
+                results = self.run(options)
+
+        for name, result in results["queries"].items():
+            self.stdout.write(
+                f"{name}: {result['before']['median_ms']:.2f} ms -> {result['after']['median_ms']:.2f} ms"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def run(self, options):
+        self.seed(options["rows"], options["providers"], options["batch_size"])
+
+        try:
+            queries = self.build_queries(options["providers"])
+            indexes = [index for index in InvoiceModel._meta.indexes if index.name in FILTER_INDEXES]
+
+            with connection.schema_editor() as schema_editor:
+                for index in indexes:
+                    schema_editor.remove_index(InvoiceModel, index)
+
+            try:
+                before = self.measure(queries, options["repeat"])
+            finally:
+                with connection.schema_editor() as schema_editor:
+                    for index in indexes:
+                        schema_editor.add_index(InvoiceModel, index)
+
+            after = self.measure(queries, options["repeat"])
+        finally:
+            # A throwaway database is dropped as a whole
+            if options["live_database"] and not options["keep"]:
+                purge_invoices(InvoiceModel.objects.filter(provider__startswith=BENCH_PROVIDER_PREFIX))
+
+        return {
+            "rows": options["rows"],
+            "vendor": connection.vendor,
+            "queries": {
+                name: {"before": before[name], "after": after[name]}
+                for name in queries
+            },
+        }
+
+    def seed(self, rows, providers, batch_size):
+        random_generator = random.Random(42)
+        states = InvoiceStates.values
+        first_day = date(2020, 1, 1)
+
+        self.stdout.write(f"Seeding {rows} invoices...")
+
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for _ in range(min(batch_size, rows - offset)):
+                base_value = Decimal(random_generator.randint(100, 1_000_000)) / 100
+                vat = (base_value * Decimal("0.21")).quantize(Decimal("0.01"))
+                batch.append(InvoiceModel(
+                    provider=f"{BENCH_PROVIDER_PREFIX}{random_generator.randrange(providers)}",
+                    concept="Benchmark invoice",
+                    base_value=base_value,
+                    vat=vat,
+                    total_value=base_value + vat,
+                    date=first_day + timedelta(days=random_generator.randrange(5 * 365)),
+                    state=random_generator.choice(states),
+                ))
+            InvoiceModel.objects.bulk_create(batch)
+
+    def build_queries(self, providers):
+        month = (date(2023, 3, 1), date(2023, 3, 31))
+        return {
+            "state_and_date_range": InvoiceModel.objects.filter(state=InvoiceStates.PAID.value, date__range=month),
+            "date_range": InvoiceModel.objects.filter(date__range=month),
+            "provider_and_date_range": InvoiceModel.objects.filter(
+                provider=f"{BENCH_PROVIDER_PREFIX}{providers // 2}", date__range=month
+            ),
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                queryset.count()
+                list(queryset.order_by("date").values()[:100])
+                timings.append((time.perf_counter() - started) * 1000)
+
+            results[name] = {
+                "median_ms": statistics.median(timings),
+                "min_ms": min(timings),
+                "max_ms": max(timings),
+                "plan": queryset.order_by("date").explain(),
+            }
+
+        return results
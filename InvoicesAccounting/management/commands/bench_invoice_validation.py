@@ -0,0 +1,88 @@
+import json
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.validators.batch_invoice_validator import BatchInvoiceValidator
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+
+class Command(BaseCommand):
+    help = "Compare ValidateInvoice(many=True) with BatchInvoiceValidator on generated rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Rows per run.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per validator.")
+        parser.add_argument("--invalid-ratio", type=float, default=0.0, help="Share of rows with a wrong total.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        rows = self.build_rows(options["rows"], options["invalid_ratio"])
+
+        def run_serializer():
+            serializer = ValidateInvoice(data=rows, many=True)
+            serializer.is_valid()
+
+        def run_batch_validator():
+            BatchInvoiceValidator().validate(rows)
+
+        results = {
+            "rows": options["rows"],
+            "serializer": self.measure(run_serializer, len(rows), options["repeat"]),
+            "batch_validator": self.measure(run_batch_validator, len(rows), options["repeat"]),
+        }
+        results["speedup"] = results["serializer"]["median_ms"] / results["batch_validator"]["median_ms"]
+
+        for name in ("serializer", "batch_validator"):
+            result = results[name]
+            self.stdout.write(
+                f"{name}: {result['median_ms']:.1f} ms median, {result['rows_per_second']:.0f} rows/s"
+            )
+        self.stdout.write(f"speedup: {results['speedup']:.1f}x")
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def build_rows(self, count, invalid_ratio):
+        random_generator = random.Random(42)
+        rows = []
+
+        for index in range(count):
+            base_value = Decimal(random_generator.randint(100, 1_000_000)) / 100
+            vat = (base_value * Decimal("0.21")).quantize(Decimal("0.01"))
+            total_value = base_value + vat
+            if random_generator.random() < invalid_ratio:
+                total_value += 1
+
+            rows.append({
+                "id": index + 1,
+                "provider": f"Provider {index % 100}",
+                "concept": "Benchmark invoice",
+                "base_value": str(base_value),
+                "vat": str(vat),
+                "total_value": str(total_value),
+                "date": "2025-02-08",
+                "state": InvoiceStates.PENDING.value,
+            })
+
+        return rows
+
+    def measure(self, run, row_count, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        median_ms = statistics.median(timings)
+        return {
+            "median_ms": median_ms,
+            "min_ms": min(timings),
+            "max_ms": max(timings),
+            "rows_per_second": row_count / (median_ms / 1000) if median_ms else 0.0,
+        }
@@ -0,0 +1,102 @@
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.renderers.json_renderer import JSON_ENCODERS, FastJsonResponse, get_encoder
+
+
+class Command(BaseCommand):
+    help = "Compare the old JsonResponse path with FastJsonResponse when rendering generated invoices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--invoices", type=int, default=10_000, help="Invoices per run.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per renderer.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        invoices = self.build_invoices(options["invoices"])
+
+        def run_json_response():
+            # What the views did before: str() every field by hand, then the stdlib encoder
+            rows = [
+                {
+                    "id": invoice.id,
+                    "provider": invoice.provider,
+                    "concept": invoice.concept,
+                    "base_value": str(invoice.base_value),
+                    "vat": str(invoice.vat),
+                    "total_value": str(invoice.total_value),
+                    "date": str(invoice.date),
+                    "state": invoice.state,
+                }
+                for invoice in invoices
+            ]
+            JsonResponse({"results": rows})
+
+        runs = {"json_response": run_json_response}
+
+        for name in JSON_ENCODERS:
+            encoder = get_encoder(name)
+            runs[f"fast_{name}"] = lambda encoder=encoder: encoder({"results": [invoice.to_dict() for invoice in invoices]})
+
+        runs["fast_json_response"] = lambda: FastJsonResponse({"results": [invoice.to_dict() for invoice in invoices]})
+
+        results = {"invoices": options["invoices"]}
+        for name, run in runs.items():
+            results[name] = self.measure(run, options["invoices"], options["repeat"])
+
+        baseline = results["json_response"]["median_ms"]
+        for name in runs:
+            result = results[name]
+            result["speedup"] = baseline / result["median_ms"] if result["median_ms"] else 0.0
+            self.stdout.write(
+                f"{name}: {result['ms_per_10k']:.1f} ms per 10k invoices, {result['speedup']:.1f}x"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+
+    def build_invoices(self, count):
+        random_generator = random.Random(42)
+        invoices = []
+
+        for index in range(count):
+            base_value = (Decimal(random_generator.randint(100, 1_000_000)) / 100).quantize(Decimal("0.01"))
+            vat = (base_value * Decimal("0.21")).quantize(Decimal("0.01"))
+
+            invoices.append(InvoiceModel(
+                id=index + 1,
+                provider=f"Provider {index % 100}",
+                concept="Benchmark invoice",
+                base_value=base_value,
+                vat=vat,
+                total_value=base_value + vat,
+                date=date(2025, 1, 1) + timedelta(days=index % 365),
+                state=InvoiceStates.PENDING.value,
+            ))
+
+        return invoices
+
+    def measure(self, run, invoice_count, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        median_ms = statistics.median(timings)
+        return {
+            "median_ms": median_ms,
+            "min_ms": min(timings),
+            "max_ms": max(timings),
+            "ms_per_10k": median_ms * 10_000 / invoice_count if invoice_count else 0.0,
+        }
@@ -0,0 +1,44 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from InvoicesAccounting.app.filters.invoice_filter import InvalidFilter, InvoiceFilter
+from InvoicesAccounting.app.services.accounting_entry_service import AccountingEntryService, InvalidExportFormat
+
+
+class Command(BaseCommand):
+    help = "Export journal entries for every invoice matching the filters as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="ndjson", help="'ndjson' (default) or 'csv'.")
+        parser.add_argument("--file", help="Write to this file instead of stdout.")
+        parser.add_argument("--state", help="Comma separated invoice states.")
+        parser.add_argument("--start-date", help="Start date (YYYY-MM-DD).")
+        parser.add_argument("--end-date", help="End date (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        for option, param in (("state", "state"), ("start_date", "start_date"), ("end_date", "end_date")):
+            if options[option]:
+                params[param] = options[option]
+
+        try:
+            service = AccountingEntryService(InvoiceFilter(params).queryset())
+            chunks = service.render(options["output"])
+        except (InvalidFilter, InvalidExportFormat) as e:
+            raise CommandError(str(e))
+
+        output = open(options["file"], "w", newline="") if options["file"] else sys.stdout
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if options["file"]:
+                output.close()
+
+        stats = service.stats()
+        self.stderr.write(
+            f"{stats['entries']} entries for {stats['invoices']} invoices in {stats['seconds']}s "
+            f"({stats['invoices_per_second']} invoices/s)"
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from InvoicesAccounting.app.services.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized accounting ledger from the local invoices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=LedgerService.BATCH_SIZE, help="Invoices rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be greater than zero.")
+
+        started = time.perf_counter()
+        written = LedgerService(batch_size=options["batch_size"]).rebuild()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Wrote {written} ledger entries in {elapsed:.2f}s")
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from InvoicesAccounting.app.services.invoice_summary_service import InvoiceSummaryService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily state/provider invoice rollups behind /invoices/summary/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=InvoiceSummaryService.BATCH_SIZE, help="Days rebuilt per transaction.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be greater than zero.")
+
+        started = time.perf_counter()
+        written = InvoiceSummaryService(batch_size=options["batch_size"]).rebuild()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Wrote {written} rollup rows in {elapsed:.2f}s")
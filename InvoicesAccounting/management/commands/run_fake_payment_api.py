@@ -0,0 +1,65 @@
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.core.management.base import BaseCommand, CommandError
+
+from InvoicesAccounting.app.fake_api.fake_payment_api import FakePaymentApi, FakePaymentApiConfig
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Serve a fake payment API with configurable dataset, latency, errors, slow bodies and pagination."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+        parser.add_argument("--port", type=int, default=8001, help="Port to bind.")
+        parser.add_argument("--invoices", type=int, default=1_000, help="Invoices in the fake dataset.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed for the dataset, latency and faults.")
+        parser.add_argument("--latency", help="Latency per request in ms: fixed:50, uniform:10:200, normal:80:20 or exponential:50.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an injected error.")
+        parser.add_argument("--error-statuses", default="500,502,503", help="Comma-separated statuses the injected errors pick from.")
+        parser.add_argument("--slow-body-ms", type=float, default=0.0, help="Pause between body chunks in ms.")
+        parser.add_argument("--chunk-size", type=int, default=16_384, help="Bytes per body chunk.")
+        parser.add_argument("--page-size", type=int, default=0, help="Invoices per invoices/ page; 0 answers a bare list.")
+        parser.add_argument("--prefix", default="/", help="Path prefix the API is mounted under.")
+        parser.add_argument("--verbose-requests", action="store_true", help="Log every request.")
+
+    def handle(self, *args, **options):
+        try:
+            error_statuses = tuple(int(status) for status in options["error_statuses"].split(",") if status)
+            api = FakePaymentApi(FakePaymentApiConfig(
+                invoices=options["invoices"],
+                seed=options["seed"],
+                latency=options["latency"],
+                error_rate=options["error_rate"],
+                error_statuses=error_statuses,
+                slow_body_ms=options["slow_body_ms"],
+                chunk_size=options["chunk_size"],
+                page_size=options["page_size"],
+                prefix=options["prefix"],
+            ))
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        handler_class = WSGIRequestHandler if options["verbose_requests"] else QuietRequestHandler
+        server = make_server(options["host"], options["port"], api, server_class=ThreadingWSGIServer, handler_class=handler_class)
+
+        base_url = f"http://{options['host']}:{server.server_port}{options['prefix'].rstrip('/')}/"
+        self.stdout.write(f"Fake payment API with {options['invoices']} invoices at {base_url}")
+        self.stdout.write(f"Point PAYMENT_API_BASE_URL at it; counters are at {base_url}__fake__/stats/")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
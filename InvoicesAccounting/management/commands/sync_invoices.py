@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+
+
+class Command(BaseCommand):
+    help = "Pull invoice changes from the external API since the last stored watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Ignore the watermark and re-pull every invoice.")
+        parser.add_argument("--stream", action="store_true", help="Parse the response incrementally, for very large exports.")
+        parser.add_argument("--batch-size", type=int, help="Rows written per transaction.")
+        parser.add_argument("--base-url", help="External API to sync from (defaults to PAYMENT_API_BASE_URL).")
+
+    def handle(self, *args, **options):
+        service = InvoiceService(base_url=options["base_url"], sync_batch_size=options["batch_size"])
+
+        started = time.perf_counter()
+        if options["stream"]:
+            report = service.stream_sync_invoices(incremental=not options["full"])
+        else:
+            report = service.sync_invoices(incremental=not options["full"])
+        elapsed = time.perf_counter() - started
+
+        mode = "full" if options["full"] else "incremental"
+        self.stdout.write(
+            f"{mode} sync of {service.base_url} in {elapsed:.2f}s: "
+            f"{report.inserted} inserted, {report.updated} updated, {report.unchanged} unchanged, {report.invalid} invalid"
+        )
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0005_alter_invoicemodel_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoicemodel',
+            index=models.Index(fields=['state', 'date'], name='invoice_state_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoicemodel',
+            index=models.Index(fields=['date'], name='invoice_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoicemodel',
+            index=models.Index(fields=['provider', 'date'], name='invoice_provider_date_idx'),
+        ),
+    ]
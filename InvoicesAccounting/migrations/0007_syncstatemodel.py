@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0006_invoicemodel_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncStateModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
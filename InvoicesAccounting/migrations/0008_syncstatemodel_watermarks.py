@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0007_syncstatemodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncstatemodel',
+            name='etag',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='syncstatemodel',
+            name='last_modified',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='syncstatemodel',
+            name='last_seen_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0008_syncstatemodel_watermarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountingEntryModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('account', models.CharField(choices=[('6000', 'Purchases (DEBIT)'), ('4720', 'VAT Supported (DEBIT)'), ('4000', 'Suppliers (CREDIT)')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateField()),
+                ('invoice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='InvoicesAccounting.invoicemodel')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['account', 'date'], name='ledger_account_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('invoice', 'account'), name='ledger_invoice_account_unique')],
+            },
+        ),
+    ]
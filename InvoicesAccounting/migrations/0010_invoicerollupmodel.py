@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0009_accountingentrymodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceRollupModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('state', models.CharField(choices=[('DRAFT', 'Draft'), ('ACCOUNTED', 'Accounted'), ('PAID', 'Paid'), ('CANCELED', 'Canceled'), ('PENDING', 'Pending')], max_length=20)),
+                ('provider', models.CharField(max_length=255)),
+                ('invoice_count', models.PositiveIntegerField(default=0)),
+                ('base_value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('vat', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['state', 'date'], name='rollup_state_date_idx'), models.Index(fields=['provider', 'date'], name='rollup_provider_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'state', 'provider'), name='rollup_date_state_provider_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0010_invoicerollupmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoicemodel',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemodel',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='invoicemodel',
+            index=models.Index(fields=['updated_at'], name='invoice_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# Same accounts and amount columns as accounting_entry_service.ENTRY_ACCOUNTS, frozen here
+ENTRY_ACCOUNTS = (("6000", "base_value"), ("4720", "vat"), ("4000", "total_value"))
+
+
+def backfill_accounting_ledger(apps, schema_editor):
+    # Historical models rather than LedgerService, so this keeps working as the models change;
+    # the result matches rebuild_accounting_ledger
+    InvoiceModel = apps.get_model("InvoicesAccounting", "InvoiceModel")
+    AccountingEntryModel = apps.get_model("InvoicesAccounting", "AccountingEntryModel")
+    db_alias = schema_editor.connection.alias
+
+    AccountingEntryModel.objects.using(db_alias).all().delete()
+
+    invoices = (
+        InvoiceModel.objects.using(db_alias)
+        .order_by("id")
+        .values("id", "date", "base_value", "vat", "total_value")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    entries = []
+    for invoice in invoices:
+        for account, column in ENTRY_ACCOUNTS:
+            entries.append(AccountingEntryModel(
+                invoice_id=invoice["id"], account=account, amount=invoice[column], date=invoice["date"],
+            ))
+
+        if len(entries) >= BATCH_SIZE:
+            AccountingEntryModel.objects.using(db_alias).bulk_create(entries)
+            entries = []
+
+    AccountingEntryModel.objects.using(db_alias).bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0011_invoicemodel_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_accounting_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+BATCH_SIZE = 500
+
+
+def backfill_invoice_rollups(apps, schema_editor):
+    # Historical models rather than InvoiceSummaryService, so this keeps working as the models
+    # change; the result matches rebuild_invoice_rollups
+    InvoiceModel = apps.get_model("InvoicesAccounting", "InvoiceModel")
+    InvoiceRollupModel = apps.get_model("InvoicesAccounting", "InvoiceRollupModel")
+    db_alias = schema_editor.connection.alias
+
+    InvoiceRollupModel.objects.using(db_alias).all().delete()
+
+    groups = (
+        InvoiceModel.objects.using(db_alias)
+        .values("date", "state", "provider")
+        .annotate(invoice_count=Count("id"), base_value=Sum("base_value"), vat=Sum("vat"), total_value=Sum("total_value"))
+        .order_by("date")
+    )
+
+    InvoiceRollupModel.objects.using(db_alias).bulk_create(
+        (InvoiceRollupModel(**group) for group in groups.iterator(chunk_size=BATCH_SIZE)), batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('InvoicesAccounting', '0012_backfill_accounting_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_invoice_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,240 @@
+import json
+import logging
+import httpx
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.filters.invoice_filter import InvalidFilter, InvoiceFilter
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.pagination.keyset_paginator import InvalidPagination, InvoiceStream, KeysetPaginator
+from InvoicesAccounting.app.renderers.json_renderer import FastJsonResponse
+from InvoicesAccounting.app.services.async_invoice_service import AsyncInvoiceService
+from InvoicesAccounting.app.services.invoice_refresher import invoice_refresher
+from InvoicesAccounting.app.services.ledger_service import LedgerService
+from InvoicesAccounting.app.services.resilience import CircuitOpenError, circuit_breakers
+from InvoicesAccounting.app.tracing.tracer import traced
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+logger = logging.getLogger(__name__)
+
+
+def authenticate(request):
+    # Same authenticators as the DRF views: session auth (with DRF's CSRF check) and basic auth
+    authenticators = [authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    return Request(request, authenticators=authenticators).user
+
+
+def async_login_required(view):
+    # Mirrors IsAuthenticated on the sync views. Like api_view, the route is exempt from
+    # Django's CSRF middleware and only session-authenticated requests must carry a token
+    @csrf_exempt
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user = await sync_to_async(authenticate)(request)
+        except exceptions.APIException as e:
+            # DRF answers 403 here as well, SessionAuthentication sends no WWW-Authenticate
+            return FastJsonResponse({"detail": str(e.detail)}, status=403)
+
+        if not user.is_authenticated:
+            return FastJsonResponse({"detail": "Authentication credentials were not provided."}, status=403)
+
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@require_http_methods(["GET"])
+@traced
+async def async_list_invoices(request):
+    try:
+        stream_format = request.GET.get("stream")
+
+        if stream_format:
+            stream = InvoiceStream(InvoiceModel.objects.all(), stream_format=stream_format)
+            return StreamingHttpResponse(stream.aiter_chunks(), content_type=stream.content_type)
+
+        limit = KeysetPaginator.parse_limit(request.GET.get("limit"))
+        cursor = request.GET.get("cursor")
+
+        paginator = KeysetPaginator(InvoiceModel.objects.all())
+        page = await paginator.apage(limit, cursor)
+
+        if not page["results"] and not cursor:
+            # Listing upstream stores the invoices locally, so the first page and its cursor
+            # come from the table like on any later request
+            await AsyncInvoiceService().list_invoices()
+            page = await paginator.apage(limit)
+        else:
+            await sync_to_async(invoice_refresher.refresh_list_if_stale)()
+
+        return FastJsonResponse(page)
+
+    except InvalidPagination as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error listing invoices: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while listing invoices."}, status=500)
+
+@require_http_methods(["GET"])
+@traced
+async def async_get_invoice_detail(request, invoice_id):
+    try:
+        data = await invoice_cache.aget_or_load(invoice_id, aload_invoice_detail)
+
+        if data:
+            await sync_to_async(invoice_refresher.refresh_invoice_if_stale)(invoice_id)
+            return FastJsonResponse(data)
+
+        return FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error retrieving invoice: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while retrieving the invoice."}, status=500)
+
+async def aload_invoice_detail(invoice_id):
+    invoice = await InvoiceModel.objects.filter(id=invoice_id).afirst()
+
+    if invoice:
+        # The cache keeps the data together with the invoice's ETag and Last-Modified
+        return invoice
+
+    try:
+        return await AsyncInvoiceService().get_invoice(invoice_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+
+@require_http_methods(["POST"])
+@async_login_required
+@traced
+async def async_create_invoice(request):
+    try:
+        data = json.loads(request.body)
+        serializer = ValidateInvoice(data=data)
+
+        if not serializer.is_valid():
+            return FastJsonResponse(serializer.errors, status=400)
+
+        created_invoice = await AsyncInvoiceService().create_invoice(serializer.validated_data)
+        return FastJsonResponse(created_invoice, status=201)
+
+    except json.JSONDecodeError:
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error creating invoice: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while creating the invoice."}, status=500)
+
+@require_http_methods(["PUT"])
+@async_login_required
+@traced
+async def async_update_invoice(request, invoice_id):
+    try:
+        data = json.loads(request.body)
+        serializer = ValidateInvoice(data=data, partial=True)
+
+        if not serializer.is_valid():
+            return FastJsonResponse(serializer.errors, status=400)
+
+        updated_invoice = await AsyncInvoiceService().update_invoice(invoice_id, serializer.validated_data)
+        return FastJsonResponse(updated_invoice) if updated_invoice else FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+    except json.JSONDecodeError:
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error updating invoice: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while updating the invoice."}, status=500)
+
+@require_http_methods(["DELETE"])
+@async_login_required
+@traced
+async def async_delete_invoice(request, invoice_id):
+    try:
+        result = await AsyncInvoiceService().delete_invoice(invoice_id)
+        return FastJsonResponse({"message": "Invoice deleted successfully"}) if result else FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error deleting invoice: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while deleting the invoice."}, status=500)
+
+@require_http_methods(["GET"])
+@traced
+async def async_filter_invoices(request):
+    try:
+        invoice_filter = InvoiceFilter(request.GET)
+
+        # An open breaker means upstream is failing, a stale local answer beats an error
+        if circuit_breakers.get(AsyncInvoiceService.BASE_URL).is_open or await sync_to_async(SyncStateModel.is_fresh)(
+            AsyncInvoiceService.BASE_URL, settings.INVOICE_LOCAL_MAX_AGE
+        ):
+            filtered_data = [row async for row in invoice_filter.page().values()]
+        else:
+            filtered_data = await AsyncInvoiceService().filter_invoices(**invoice_filter.upstream_params)
+
+        return FastJsonResponse(filtered_data, safe=False)
+
+    except InvalidFilter as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error filtering invoices: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while filtering invoices."}, status=500)
+
+@require_http_methods(["GET"])
+@traced
+async def async_generate_accounting_entries(request, invoice_id):
+    try:
+        entries = await LedgerService.aentries_for_invoice(invoice_id)
+
+        if entries:
+            return FastJsonResponse({"entries": entries})
+
+        invoice = await InvoiceModel.objects.filter(id=invoice_id).afirst()
+
+        if invoice:
+            return FastJsonResponse({"entries": invoice.accounting_entries()})
+
+        accounting_entries = await AsyncInvoiceService().generate_accounting_entries(invoice_id)
+
+        if not accounting_entries.get("entries"):
+            return FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+        return FastJsonResponse(accounting_entries)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error generating accounting entries: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while generating accounting entries."}, status=500)
@@ -1,26 +1,51 @@
 import json
 import logging
-from django.http import JsonResponse
+from itertools import chain
+import httpx
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django.utils.dateparse import parse_date
+from django.views.decorators.http import condition
+from InvoicesAccounting.app.cache.invoice_cache import invoice_cache
+from InvoicesAccounting.app.conditional.invoice_conditions import (
+    accounting_entries_etag,
+    invoice_etag,
+    invoice_last_modified,
+    invoice_list_etag,
+)
 from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
-from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.filters.invoice_filter import InvalidFilter, InvoiceFilter
 from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.pagination.keyset_paginator import InvalidPagination, InvoiceStream, KeysetPaginator
+from InvoicesAccounting.app.parsers.json_array_stream import iter_json_array
+from InvoicesAccounting.app.renderers.json_renderer import FastJsonResponse
+from InvoicesAccounting.app.services.bulk_invoice_service import BulkInvoiceService
+from InvoicesAccounting.app.services.accounting_entry_service import AccountingEntryService, InvalidExportFormat
+from InvoicesAccounting.app.services.invoice_refresher import invoice_refresher
 from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_summary_service import InvoiceSummaryService
+from InvoicesAccounting.app.services.ledger_service import LedgerService
+from InvoicesAccounting.app.services.resilience import CircuitOpenError, circuit_breakers
+from InvoicesAccounting.app.services.single_flight import single_flight
+from InvoicesAccounting.app.tracing.tracer import traced
 from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
 
 logger = logging.getLogger(__name__)
 
+BULK_READ_CHUNK_SIZE = 64 * 1024
+
 # Swagger Parameters
 invoice_id_param = openapi.Parameter(
     'invoice_id', in_=openapi.IN_PATH, description="Invoice ID", type=openapi.TYPE_INTEGER
 )
 
 state_param = openapi.Parameter(
-    'state', in_=openapi.IN_QUERY, description="Filter by invoice state", type=openapi.TYPE_STRING
+    'state', in_=openapi.IN_QUERY, description="Filter by invoice state (comma separated for several)", type=openapi.TYPE_STRING
 )
 
 start_date_param = openapi.Parameter(
@@ -31,168 +56,430 @@ end_date_param = openapi.Parameter(
     'end_date', in_=openapi.IN_QUERY, description="End date (YYYY-MM-DD)", type=openapi.TYPE_STRING
 )
 
-@swagger_auto_schema(method='get', responses={200: "List of invoices"})
+provider_param = openapi.Parameter(
+    'provider', in_=openapi.IN_QUERY, description="Filter by provider (repeatable)", type=openapi.TYPE_STRING
+)
+
+min_amount_param = openapi.Parameter(
+    'min_amount', in_=openapi.IN_QUERY, description="Minimum total value", type=openapi.TYPE_NUMBER
+)
+
+max_amount_param = openapi.Parameter(
+    'max_amount', in_=openapi.IN_QUERY, description="Maximum total value", type=openapi.TYPE_NUMBER
+)
+
+ordering_param = openapi.Parameter(
+    'ordering', in_=openapi.IN_QUERY, description="Order by id, date, provider, total_value or state (prefix '-' for descending)", type=openapi.TYPE_STRING
+)
+
+ids_param = openapi.Parameter(
+    'ids', in_=openapi.IN_QUERY, description="Comma separated invoice ids (otherwise the filter parameters apply)", type=openapi.TYPE_STRING
+)
+
+output_param = openapi.Parameter(
+    'output', in_=openapi.IN_QUERY, description="'ndjson' (default) or 'csv'", type=openapi.TYPE_STRING
+)
+
+offset_param = openapi.Parameter(
+    'offset', in_=openapi.IN_QUERY, description="Number of invoices to skip", type=openapi.TYPE_INTEGER
+)
+
+limit_param = openapi.Parameter(
+    'limit', in_=openapi.IN_QUERY, description="Page size (max 1000)", type=openapi.TYPE_INTEGER
+)
+
+cursor_param = openapi.Parameter(
+    'cursor', in_=openapi.IN_QUERY, description="Opaque cursor returned as next_cursor", type=openapi.TYPE_STRING
+)
+
+group_by_param = openapi.Parameter(
+    'group_by', in_=openapi.IN_QUERY, description="Comma separated state, provider, month or date (default state)", type=openapi.TYPE_STRING
+)
+
+account_param = openapi.Parameter(
+    'account', in_=openapi.IN_PATH, description="Account code", type=openapi.TYPE_STRING
+)
+
+stream_param = openapi.Parameter(
+    'stream', in_=openapi.IN_QUERY, description="Stream every invoice as 'ndjson' or 'json'", type=openapi.TYPE_STRING
+)
+
+@swagger_auto_schema(method='get', manual_parameters=[limit_param, cursor_param, stream_param], responses={200: "List of invoices"})
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=invoice_list_etag)
+@traced
 def list_invoices(request):
     try:
-        invoices = list(InvoiceModel.objects.all().values())
+        stream_format = request.GET.get("stream")
 
-        if not invoices:
-            invoices = InvoiceService().list_invoices()
+        if stream_format:
+            stream = InvoiceStream(InvoiceModel.objects.all(), stream_format=stream_format)
+            return StreamingHttpResponse(stream.iter_chunks(), content_type=stream.content_type)
 
-        return JsonResponse(invoices, safe=False)
+        limit = KeysetPaginator.parse_limit(request.GET.get("limit"))
+        cursor = request.GET.get("cursor")
+
+        paginator = KeysetPaginator(InvoiceModel.objects.all())
+        page = paginator.page(limit, cursor)
+
+        if not page["results"] and not cursor:
+            # Listing upstream stores the invoices locally, so the first page and its cursor
+            # come from the table like on any later request
+            InvoiceService().list_invoices()
+            page = paginator.page(limit)
+        else:
+            # Serve what we have now, refresh in the background when it is older than INVOICE_STALE_AFTER
+            invoice_refresher.refresh_list_if_stale()
+
+        return FastJsonResponse(page)
+
+    except InvalidPagination as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
     except Exception as e:
         logger.error(f"Error listing invoices: {str(e)}")
-        return JsonResponse({"error": "An error occurred while listing invoices."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while listing invoices."}, status=500)
 
 @swagger_auto_schema(method='get', manual_parameters=[invoice_id_param], responses={200: "Invoice details"})
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=invoice_etag, last_modified_func=invoice_last_modified)
+@traced
 def get_invoice_detail(request, invoice_id):
     try:
-        invoice = InvoiceModel.objects.filter(id=invoice_id).first()
+        data = invoice_cache.get_or_load(invoice_id, load_invoice_detail)
 
-        if invoice:
-            data = {
-                "id": invoice.id,
-                "provider": invoice.provider,
-                "concept": invoice.concept,
-                "base_value": str(invoice.base_value),
-                "vat": str(invoice.vat),
-                "total_value": str(invoice.total_value),
-                "date": str(invoice.date),
-                "state": invoice.state,
-            }
-            return JsonResponse(data)
-        
-        data = InvoiceService().get_invoice(invoice_id)
         if data:
-            return JsonResponse(data)
+            invoice_refresher.refresh_invoice_if_stale(invoice_id)
+            return FastJsonResponse(data)
 
-        return JsonResponse({"error": "Invoice not found"}, status=404)
+        return FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
     except Exception as e:
         logger.error(f"Error retrieving invoice: {str(e)}")
-        return JsonResponse({"error": "An error occurred while retrieving the invoice."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while retrieving the invoice."}, status=500)
 
+def load_invoice_detail(invoice_id):
+    invoice = InvoiceModel.objects.filter(id=invoice_id).first()
 
-    except Exception as e:
-        logger.error(f"Error retrieving invoice: {str(e)}")
-        return JsonResponse({"error": "An error occurred while retrieving the invoice."}, status=500)
+    if invoice:
+        # The cache keeps the data together with the invoice's ETag and Last-Modified
+        return invoice
+
+    try:
+        return InvoiceService().get_invoice(invoice_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
 
 @swagger_auto_schema(method='post', request_body=ValidateInvoice, responses={201: "Invoice Created"})
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@traced
 def create_invoice(request):
     try:
         data = json.loads(request.body)
         serializer = ValidateInvoice(data=data)
 
         if not serializer.is_valid():
-            return JsonResponse(serializer.errors, status=400)
+            return FastJsonResponse(serializer.errors, status=400)
 
         created_invoice = InvoiceService().create_invoice(serializer.validated_data)
-        return JsonResponse(created_invoice, status=201)
+        return FastJsonResponse(created_invoice, status=201)
 
     except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON"}, status=400)
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
     except Exception as e:
         logger.error(f"Error creating invoice: {str(e)}")
-        return JsonResponse({"error": "An error occurred while creating the invoice."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while creating the invoice."}, status=500)
 
 
 @swagger_auto_schema(method='put', manual_parameters=[invoice_id_param], request_body=ValidateInvoice, responses={200: "Invoice Updated"})
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
+@traced
 def update_invoice(request, invoice_id):
     try:
         data = json.loads(request.body)
         serializer = ValidateInvoice(data=data, partial=True)
 
         if not serializer.is_valid():
-            return JsonResponse(serializer.errors, status=400)
+            return FastJsonResponse(serializer.errors, status=400)
 
         updated_invoice = InvoiceService().update_invoice(invoice_id, serializer.validated_data)
-        return JsonResponse(updated_invoice) if updated_invoice else JsonResponse({"error": "Invoice not found"}, status=404)
+        return FastJsonResponse(updated_invoice) if updated_invoice else FastJsonResponse({"error": "Invoice not found"}, status=404)
 
     except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON"}, status=400)
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
     except Exception as e:
         logger.error(f"Error updating invoice: {str(e)}")
-        return JsonResponse({"error": "An error occurred while updating the invoice."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while updating the invoice."}, status=500)
 
 @swagger_auto_schema(method='delete', manual_parameters=[invoice_id_param], responses={200: "Invoice Deleted"})
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
+@traced
 def delete_invoice(request, invoice_id):
     try:
         result = InvoiceService().delete_invoice(invoice_id)
-        return JsonResponse({"message": "Invoice deleted successfully"}) if result else JsonResponse({"error": "Invoice not found"}, status=404)
+        return FastJsonResponse({"message": "Invoice deleted successfully"}) if result else FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
     except Exception as e:
         logger.error(f"Error deleting invoice: {str(e)}")
-        return JsonResponse({"error": "An error occurred while deleting the invoice."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while deleting the invoice."}, status=500)
+
+def read_bulk_items(request) -> list:
+    # Both formats are parsed from request.stream: request.body would refuse anything above
+    # DATA_UPLOAD_MAX_MEMORY_SIZE. The parsed items are still collected into one list, since
+    # the report answers per position
+    stream = request.stream
+    if stream is None:
+        raise ValueError("Expected a JSON array or an NDJSON body.")
+
+    if request.content_type.split(";")[0].strip() == "application/x-ndjson":
+        return [json.loads(line) for line in stream if line.strip()]
+
+    chunks = iter(lambda: stream.read(BULK_READ_CHUNK_SIZE), b"")
+    first_chunk = next(chunks, b"")
+
+    # {"ids": [...]} is the only object accepted, everything else must be an array
+    if first_chunk.lstrip()[:1] == b"{":
+        data = json.loads(first_chunk + b"".join(chunks))
+        if not isinstance(data, dict) or not isinstance(data.get("ids"), list):
+            raise ValueError("Expected a JSON array or an NDJSON body.")
+        return data["ids"]
+
+    return list(iter_json_array(chain([first_chunk], chunks)))
+
+@swagger_auto_schema(method='post', request_body=ValidateInvoice(many=True), responses={200: "Invoices Created", 207: "Partially Created"})
+@swagger_auto_schema(method='put', request_body=ValidateInvoice(many=True), responses={200: "Invoices Updated", 207: "Partially Updated"})
+@swagger_auto_schema(method='delete', responses={200: "Invoices Deleted", 207: "Partially Deleted"})
+@api_view(['POST', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@traced
+def bulk_invoices(request):
+    try:
+        items = read_bulk_items(request)
+        service = BulkInvoiceService()
+
+        if request.method == "POST":
+            report = service.create(items)
+        elif request.method == "PUT":
+            report = service.update(items)
+        else:
+            report = service.delete(items)
+
+        succeeded = sum(count for status, count in report["summary"].items() if status not in ("invalid", "failed", "unknown"))
+        return FastJsonResponse(report, status=200 if succeeded == len(items) else 207)
 
-@swagger_auto_schema(method='get', manual_parameters=[state_param, start_date_param, end_date_param], responses={200: "Filtered invoices"})
+    except json.JSONDecodeError:
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except ValueError as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except Exception as e:
+        logger.error(f"Error processing bulk invoices: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while processing the invoices."}, status=500)
+
+@swagger_auto_schema(method='get', manual_parameters=[state_param, start_date_param, end_date_param, provider_param, min_amount_param, max_amount_param, ordering_param, limit_param, offset_param], responses={200: "Filtered invoices"})
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@traced
 def filter_invoices(request):
     try:
-        filters = {}
+        invoice_filter = InvoiceFilter(request.GET)
 
-        state = request.GET.get("state")
-        if state and state not in InvoiceStates.values:
-            return JsonResponse({"error": "Invalid state filter. Allowed values: " + ", ".join(InvoiceStates.values)}, status=400)
+        # An open breaker means upstream is failing, a stale local answer beats an error
+        if circuit_breakers.get(InvoiceService.BASE_URL).is_open or SyncStateModel.is_fresh(InvoiceService.BASE_URL, settings.INVOICE_LOCAL_MAX_AGE):
+            filtered_data = list(invoice_filter.page().values())
+        else:
+            filtered_data = InvoiceService().filter_invoices(**invoice_filter.upstream_params)
 
-        if state:
-            filters["state"] = state
+        return FastJsonResponse(filtered_data, safe=False)
 
-        start_date = request.GET.get("start_date")
-        end_date = request.GET.get("end_date")
+    except InvalidFilter as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
 
-        if start_date and end_date:
-            start_date = parse_date(start_date)
-            end_date = parse_date(end_date)
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
 
-            if start_date and end_date:
-                filters["date__range"] = (start_date, end_date)
+    except Exception as e:
+        logger.error(f"Error filtering invoices: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while filtering invoices."}, status=500)
 
-        filtered_data = InvoiceService().filter_invoices(**filters)
+@swagger_auto_schema(method='get', manual_parameters=[group_by_param, state_param, start_date_param, end_date_param, provider_param, min_amount_param, max_amount_param], responses={200: "Invoice summary"})
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@traced
+def summarize_invoices(request):
+    try:
+        return FastJsonResponse(InvoiceSummaryService().summary(request.GET))
 
-        return JsonResponse(filtered_data, safe=False)
+    except InvalidFilter as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
 
     except Exception as e:
-        logger.error(f"Error filtering invoices: {str(e)}")
-        return JsonResponse({"error": "An error occurred while filtering invoices."}, status=500)
+        logger.error(f"Error summarizing invoices: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while summarizing invoices."}, status=500)
 
 @swagger_auto_schema(method='get', manual_parameters=[invoice_id_param], responses={200: "Accounting entries"})
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=accounting_entries_etag, last_modified_func=invoice_last_modified)
+@traced
 def generate_accounting_entries(request, invoice_id):
     try:
+        entries = LedgerService.entries_for_invoice(invoice_id)
+
+        if entries:
+            return FastJsonResponse({"entries": entries})
+
         invoice = InvoiceModel.objects.filter(id=invoice_id).first()
 
         if invoice:
-            return JsonResponse({
-                "entries": [
-                    {"account": AccountingCodes.PURCHASES.value, "description": AccountingCodes.PURCHASES.label, "amount": float(invoice.base_value)},
-                    {"account": AccountingCodes.VAT_SUPPORTED.value, "description": AccountingCodes.VAT_SUPPORTED.label, "amount": float(invoice.vat)},
-                    {"account": AccountingCodes.SUPPLIERS.value, "description": AccountingCodes.SUPPLIERS.label, "amount": float(invoice.total_value)}
-                ]
-            })
+            return FastJsonResponse({"entries": invoice.accounting_entries()})
 
         accounting_entries = InvoiceService().generate_accounting_entries(invoice_id)
 
         if not accounting_entries.get("entries"):
-            return JsonResponse({"error": "Invoice not found"}, status=404)
+            return FastJsonResponse({"error": "Invoice not found"}, status=404)
+
+        return FastJsonResponse(accounting_entries)
+
+    except CircuitOpenError as e:
+        return FastJsonResponse({"error": str(e)}, status=503)
+
+    except Exception as e:
+        logger.error(f"Error generating accounting entries: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while generating accounting entries."}, status=500)
+
 
-        return JsonResponse(accounting_entries)
+@swagger_auto_schema(method='get', manual_parameters=[ids_param, output_param, state_param, start_date_param, end_date_param, provider_param], responses={200: "Accounting entries stream"})
+@swagger_auto_schema(method='post', manual_parameters=[output_param], responses={200: "Accounting entries stream"})
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+@traced
+def generate_accounting_entries_batch(request):
+    try:
+        output_format = request.GET.get("output", "ndjson")
+
+        if request.method == "POST":
+            data = json.loads(request.body)
+            invoice_ids = data.get("ids", []) if isinstance(data, dict) else data
+        else:
+            invoice_ids = [value for value in request.GET.get("ids", "").split(",") if value.strip()]
+
+        try:
+            invoice_ids = [int(invoice_id) for invoice_id in invoice_ids]
+        except (TypeError, ValueError):
+            return FastJsonResponse({"error": "Invoice ids must be integers."}, status=400)
+
+        if invoice_ids:
+            queryset = InvoiceModel.objects.filter(id__in=invoice_ids)
+        else:
+            queryset = InvoiceFilter(request.GET).queryset()
+
+        service = AccountingEntryService(queryset)
+        return StreamingHttpResponse(service.render(output_format), content_type=service.content_type(output_format))
+
+    except json.JSONDecodeError:
+        return FastJsonResponse({"error": "Invalid JSON"}, status=400)
+
+    except (InvalidFilter, InvalidExportFormat) as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
 
     except Exception as e:
         logger.error(f"Error generating accounting entries: {str(e)}")
-        return JsonResponse({"error": "An error occurred while generating accounting entries."}, status=500)
+        return FastJsonResponse({"error": "An error occurred while generating accounting entries."}, status=500)
+
+
+def parse_date_range(params):
+    start_date = params.get("start_date")
+    end_date = params.get("end_date")
+
+    if not start_date and not end_date:
+        return None, None
+
+    start_date = parse_date(start_date or "")
+    end_date = parse_date(end_date or "")
 
+    if not start_date or not end_date:
+        raise ValueError("start_date and end_date must both be valid dates (YYYY-MM-DD).")
+
+    return start_date, end_date
+
+
+@swagger_auto_schema(method='get', manual_parameters=[account_param, start_date_param, end_date_param, limit_param, cursor_param], responses={200: "Ledger entries"})
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@traced
+def get_account_ledger(request, account):
+    try:
+        if account not in AccountingCodes.values:
+            return FastJsonResponse({"error": "Invalid account. Allowed values: " + ", ".join(AccountingCodes.values)}, status=400)
+
+        start_date, end_date = parse_date_range(request.GET)
+        limit = KeysetPaginator.parse_limit(request.GET.get("limit"))
+
+        page = KeysetPaginator(LedgerService.ledger(account, start_date, end_date)).page(limit, request.GET.get("cursor"))
+
+        return FastJsonResponse(page)
+
+    except ValueError as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except Exception as e:
+        logger.error(f"Error retrieving ledger: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while retrieving the ledger."}, status=500)
+
+
+@swagger_auto_schema(method='get', manual_parameters=[start_date_param, end_date_param], responses={200: "Trial balance"})
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@traced
+def get_trial_balance(request):
+    try:
+        start_date, end_date = parse_date_range(request.GET)
+
+        return FastJsonResponse(LedgerService.trial_balance(start_date, end_date))
+
+    except ValueError as e:
+        return FastJsonResponse({"error": str(e)}, status=400)
+
+    except Exception as e:
+        logger.error(f"Error computing trial balance: {str(e)}")
+        return FastJsonResponse({"error": "An error occurred while computing the trial balance."}, status=500)
+
+
+@swagger_auto_schema(method='get', responses={200: "Upstream circuit breakers and retry counts"})
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@traced
+def upstream_health(request):
+    breakers = circuit_breakers.stats()
+    healthy = all(breaker["state"] == "closed" for breaker in breakers)
+
+    return FastJsonResponse(
+        {"healthy": healthy, "breakers": breakers, "single_flight": single_flight.stats()},
+        status=200 if healthy else 503,
+    )
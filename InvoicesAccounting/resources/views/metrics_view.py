@@ -0,0 +1,11 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from InvoicesAccounting.app.metrics.invoice_metrics import metrics_registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics(request):
+    return HttpResponse(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.test import TestCase
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.async_invoice_service import AsyncInvoiceService
+from InvoicesAccounting.app.services.resilience import operation_timeout
+
+class AsyncInvoiceServiceTest(TestCase):
+
+    @patch("httpx.AsyncClient.get")
+    async def test_async_invoice_service_finds_invoice_by_id(self, mock_get):
+        # Arrange
+        invoice_data = {"id": 1, "provider": "Provider A", "state": InvoiceStates.PENDING.value}
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = invoice_data
+
+        # Act
+        retrieved_invoice = await AsyncInvoiceService().get_invoice(1)
+
+        # Assert
+        self.assertEqual(retrieved_invoice, invoice_data)
+        mock_get.assert_awaited_once_with("invoices/1/", timeout=operation_timeout("default"))
+
+    @patch("httpx.AsyncClient.get")
+    async def test_async_invoice_service_lists_and_syncs_invoices(self, mock_get):
+        # Arrange
+        invoices_data = [
+            {
+                "id": 10,
+                "provider": "Provider A",
+                "concept": "Concept A",
+                "base_value": "100.00",
+                "vat": "21.00",
+                "total_value": "121.00",
+                "date": "2025-02-08",
+                "state": InvoiceStates.PENDING.value
+            },
+        ]
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = invoices_data
+
+        # Act
+        response = await AsyncInvoiceService().list_invoices()
+
+        # Assert
+        self.assertEqual(len(response), 1)
+        self.assertTrue(await InvoiceModel.objects.filter(id=10).aexists())
+        state = await SyncStateModel.objects.aget(source=AsyncInvoiceService.BASE_URL)
+        self.assertEqual(state.last_seen_id, 10)
+        self.assertIsNotNone(state.synced_at)
+
+    @patch("httpx.AsyncClient.get")
+    async def test_async_invoice_service_generates_accounting_entries(self, mock_get):
+        # Arrange
+        mock_get.return_value = MagicMock(status_code=200)
+        mock_get.return_value.json.return_value = {
+            "entries": [{"account": AccountingCodes.PURCHASES.value, "description": AccountingCodes.PURCHASES.label, "amount": "100.00"}]
+        }
+
+        # Act
+        response = await AsyncInvoiceService().generate_accounting_entries(1)
+
+        # Assert
+        self.assertEqual(response["entries"][0]["amount"], Decimal("100.00"))
@@ -0,0 +1,156 @@
+import base64
+import json
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+class AsyncInvoiceViewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        # Arrange
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpassword"
+        )
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100.0,
+            vat=20.0,
+            total_value=120.0,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+
+        # Arrange
+        self.valid_payload = {
+            "provider": "Provider B",
+            "concept": "New Invoice",
+            "base_value": 200.0,
+            "vat": 40.0,
+            "total_value": 240.0,
+            "date": "2025-02-11",
+            "state": InvoiceStates.PENDING.value,
+        }
+
+    async def test_async_list_invoices_returns_local_page(self):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-list"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [self.invoice.id])
+
+    async def test_async_list_invoices_streams_ndjson(self):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-list"), {"stream": "ndjson"})
+        lines = b"".join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(lines[0])["provider"], self.invoice.provider)
+
+    async def test_async_get_invoice_detail_from_database(self):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["id"], self.invoice.id)
+        self.assertEqual(response.json()["total_value"], "120.00")
+
+    @patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.get_invoice")
+    async def test_async_get_invoice_detail_not_found(self, mock_get_invoice):
+        # Arrange
+        mock_get_invoice.return_value = None
+
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-detail", args=[self.invoice.id + 100]))
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["error"], "Invoice not found")
+
+    @patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.create_invoice")
+    async def test_async_create_invoice_needs_authentication(self, mock_create_invoice):
+        # Arrange
+        mock_create_invoice.return_value = {**self.valid_payload, "id": 2}
+
+        # Act
+        anonymous_response = await self.async_client.post(
+            reverse("async-invoice-create"),
+            data=json.dumps(self.valid_payload),
+            content_type="application/json"
+        )
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            reverse("async-invoice-create"),
+            data=json.dumps(self.valid_payload),
+            content_type="application/json"
+        )
+
+        # Assert
+        self.assertEqual(anonymous_response.status_code, 403)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["provider"], self.valid_payload["provider"])
+
+    @patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.create_invoice")
+    async def test_async_create_invoice_accepts_basic_auth_without_csrf_token(self, mock_create_invoice):
+        # Arrange
+        mock_create_invoice.return_value = {**self.valid_payload, "id": 2}
+        client = AsyncClient(enforce_csrf_checks=True)
+        credentials = base64.b64encode(b"testuser:testpassword").decode()
+
+        # Act
+        response = await client.post(
+            reverse("async-invoice-create"),
+            data=json.dumps(self.valid_payload),
+            content_type="application/json",
+            headers={"authorization": f"Basic {credentials}"},
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 201)
+
+    @patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.create_invoice")
+    async def test_async_create_invoice_needs_csrf_token_with_session_auth(self, mock_create_invoice):
+        # Arrange
+        client = AsyncClient(enforce_csrf_checks=True)
+        await client.aforce_login(self.user)
+
+        # Act
+        response = await client.post(
+            reverse("async-invoice-create"),
+            data=json.dumps(self.valid_payload),
+            content_type="application/json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("CSRF Failed", response.json()["detail"])
+        mock_create_invoice.assert_not_called()
+
+    async def test_async_generate_accounting_entries_from_database(self):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-accounting-entries", args=[self.invoice.id]))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry["amount"] for entry in response.json()["entries"]], ["100.00", "20.00", "120.00"])
+
+    @patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.filter_invoices")
+    async def test_async_filter_invoices_invalid_state(self, mock_filter_invoices):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-filter"), {"state": "INVALID_STATE"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        mock_filter_invoices.assert_not_called()
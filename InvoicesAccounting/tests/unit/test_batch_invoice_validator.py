@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+from django.test import SimpleTestCase
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.validators.batch_invoice_validator import BatchInvoiceValidator
+from InvoicesAccounting.app.validators.validate_invoice import ValidateInvoice
+
+class BatchInvoiceValidatorTest(SimpleTestCase):
+
+    def setUp(self):
+        self.validator = BatchInvoiceValidator()
+
+        # Arrange
+        self.valid_row = {
+            "id": 7,
+            "provider": "Provider A",
+            "concept": "Concept A",
+            "base_value": "100.00",
+            "vat": "21.00",
+            "total_value": "121.00",
+            "date": "2025-02-08",
+            "state": InvoiceStates.PENDING.value,
+        }
+
+    def test_returns_typed_valid_rows_and_row_indexed_errors(self):
+        # Arrange
+        rows = [self.valid_row, {**self.valid_row, "total_value": "130.00"}]
+
+        # Act
+        valid_rows, errors = self.validator.validate(rows)
+
+        # Assert
+        self.assertEqual(valid_rows, [{
+            **self.valid_row,
+            "base_value": Decimal("100.00"),
+            "vat": Decimal("21.00"),
+            "total_value": Decimal("121.00"),
+            "date": date(2025, 2, 8),
+        }])
+        self.assertEqual(errors, {1: {"total_value": ["Total value must be 121.00."]}})
+
+    def test_ids_are_coerced_or_reported(self):
+        # Arrange
+        rows = [
+            {**self.valid_row, "id": "7"},
+            {**self.valid_row, "id": None},
+            {**self.valid_row, "id": "abc"},
+            {**self.valid_row, "id": -3},
+            {**self.valid_row, "id": True},
+        ]
+
+        # Act
+        valid_rows, errors = self.validator.validate(rows)
+
+        # Assert
+        self.assertEqual([row["id"] for row in valid_rows], [7, None])
+        self.assertEqual(errors, {
+            2: {"id": ["A valid integer is required."]},
+            3: {"id": ["Ensure this value is greater than or equal to 1."]},
+            4: {"id": ["A valid integer is required."]},
+        })
+
+    def test_matches_serializer_errors(self):
+        # Arrange
+        rows = [
+            {**self.valid_row, "base_value": "0", "total_value": "21.00"},
+            {**self.valid_row, "vat": "-1.00", "total_value": "99.00"},
+            {**self.valid_row, "vat": 0, "total_value": "100.00"},
+            {**self.valid_row, "base_value": "1.234"},
+            {**self.valid_row, "date": "2025-02-30"},
+            {**self.valid_row, "state": "UNKNOWN"},
+            {key: value for key, value in self.valid_row.items() if key != "provider"},
+        ]
+
+        for row in rows:
+            serializer = ValidateInvoice(data=row)
+            serializer.is_valid()
+
+            # Act
+            _, errors = self.validator.validate_row(row)
+
+            # Assert
+            self.assertEqual(errors, {field: [str(message) for message in messages] for field, messages in serializer.errors.items()})
@@ -0,0 +1,32 @@
+from django.test import TestCase
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.accounting_entry_model import AccountingEntryModel
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.invoice_rollup_model import InvoiceRollupModel
+from InvoicesAccounting.management.bench import purge_invoices
+
+class BenchCleanupTest(TestCase):
+
+    def setUp(self):
+        # Arrange
+        self.kept = InvoiceModel.objects.create(
+            provider="Provider A", concept="Kept", base_value=100, vat=21, total_value=121,
+            date="2025-02-10", state=InvoiceStates.PENDING.value,
+        )
+        for _ in range(3):
+            InvoiceModel.objects.create(
+                provider="bench-provider-1", concept="Seeded", base_value=100, vat=21, total_value=121,
+                date="2025-02-10", state=InvoiceStates.PENDING.value,
+            )
+
+    def test_purge_deletes_rows_and_ledger_without_per_row_queries(self):
+        # Act
+        with self.assertNumQueries(10):
+            deleted = purge_invoices(InvoiceModel.objects.filter(provider__startswith="bench-provider-"))
+
+        # Assert
+        self.assertEqual(deleted, 3)
+        self.assertEqual(list(InvoiceModel.objects.values_list("id", flat=True)), [self.kept.id])
+        self.assertEqual(set(AccountingEntryModel.objects.values_list("invoice_id", flat=True)), {self.kept.id})
+        self.assertEqual(list(InvoiceRollupModel.objects.values_list("provider", "invoice_count")), [("Provider A", 1)])
+
@@ -0,0 +1,167 @@
+import json
+from unittest.mock import patch
+import httpx
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.services.bulk_invoice_service import BulkInvoiceService
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+
+class BulkInvoiceServiceTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+        # Arrange
+        User.objects.create_user(username="testuser", password="testpassword")
+        self.client.login(username="testuser", password="testpassword")
+
+        # Arrange
+        self.valid_payload = {
+            "provider": "Provider B",
+            "concept": "New Invoice",
+            "base_value": "200.00",
+            "vat": "40.00",
+            "total_value": "240.00",
+            "date": "2025-02-11",
+            "state": InvoiceStates.PENDING.value,
+        }
+
+    def echo(self, invoices):
+        return [{**invoice, "id": invoice.get("id", 100 + position)} for position, invoice in enumerate(invoices)]
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_create_invoices")
+    def test_create_sends_one_upstream_call_per_chunk(self, mock_bulk_create):
+        # Arrange
+        mock_bulk_create.side_effect = self.echo
+        items = [{**self.valid_payload, "concept": f"Invoice {position}"} for position in range(5)]
+
+        # Act
+        report = BulkInvoiceService(chunk_size=2, max_workers=2).create(items)
+
+        # Assert
+        self.assertEqual(mock_bulk_create.call_count, 3)
+        self.assertEqual(report["summary"], {"created": 5})
+        self.assertEqual([result["invoice"]["concept"] for result in report["results"]], [item["concept"] for item in items])
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_create_invoices")
+    def test_create_reports_invalid_items_and_forwards_the_rest(self, mock_bulk_create):
+        # Arrange
+        mock_bulk_create.side_effect = self.echo
+        items = [self.valid_payload, {**self.valid_payload, "total_value": "999.00"}]
+
+        # Act
+        report = BulkInvoiceService().create(items)
+
+        # Assert
+        self.assertEqual(report["summary"], {"created": 1, "invalid": 1})
+        self.assertIn("total_value", report["results"][1]["errors"])
+        self.assertEqual(len(mock_bulk_create.call_args.args[0]), 1)
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_update_invoices")
+    def test_failed_chunk_does_not_abort_the_batch(self, mock_bulk_update):
+        # Arrange
+        def update(invoices):
+            if invoices[0]["id"] == 1:
+                raise httpx.ConnectError("Connection refused")
+            return self.echo(invoices)
+
+        mock_bulk_update.side_effect = update
+        items = [{**self.valid_payload, "id": invoice_id} for invoice_id in (1, 2)] + [self.valid_payload]
+
+        # Act
+        report = BulkInvoiceService(chunk_size=1).update(items)
+
+        # Assert
+        self.assertEqual([result["status"] for result in report["results"]], ["failed", "updated", "invalid"])
+        self.assertEqual(report["results"][1]["invoice"]["id"], 2)
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_delete_invoices")
+    def test_bulk_delete_view_accepts_ndjson(self, mock_bulk_delete):
+        # Arrange
+        mock_bulk_delete.return_value = {"message": "2 invoices deleted successfully", "deleted": 2}
+        body = "\n".join(json.dumps(item) for item in [{"id": 1}, 2, "x"]) + "\n"
+
+        # Act
+        response = self.client.delete(reverse("invoice-bulk"), data=body, content_type="application/x-ndjson")
+
+        # Assert
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()["summary"], {"deleted": 2, "invalid": 1})
+        mock_bulk_delete.assert_called_once_with([1, 2])
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_create_invoices")
+    def test_bulk_create_view_returns_per_item_results(self, mock_bulk_create):
+        # Arrange
+        mock_bulk_create.side_effect = self.echo
+
+        # Act
+        response = self.client.post(reverse("invoice-bulk"), data=json.dumps([self.valid_payload]), content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["status"], "created")
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024)
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_create_invoices")
+    def test_bulk_view_accepts_arrays_above_the_upload_memory_limit(self, mock_bulk_create):
+        # Arrange
+        mock_bulk_create.side_effect = self.echo
+        body = json.dumps([self.valid_payload] * 50)
+
+        # Act
+        response = self.client.post(reverse("invoice-bulk"), data=body, content_type="application/json")
+
+        # Assert
+        self.assertGreater(len(body), 1024)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["summary"], {"created": 50})
+
+    @patch("InvoicesAccounting.app.services.invoice_service.InvoiceService.bulk_delete_invoices")
+    def test_bulk_delete_view_accepts_an_ids_object(self, mock_bulk_delete):
+        # Arrange
+        mock_bulk_delete.return_value = {"message": "2 invoices deleted successfully", "deleted": 2}
+
+        # Act
+        response = self.client.delete(reverse("invoice-bulk"), data=json.dumps({"ids": [1, 2]}), content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        mock_bulk_delete.assert_called_once_with([1, 2])
+
+    def test_bulk_view_needs_authentication(self):
+        # Arrange
+        self.client.logout()
+
+        # Act
+        response = self.client.post(reverse("invoice-bulk"), data=json.dumps([self.valid_payload]), content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_view_rejects_non_array_bodies(self):
+        # Act
+        response = self.client.post(reverse("invoice-bulk"), data=json.dumps(self.valid_payload), content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create_invoices_posts_serialized_chunk(self):
+        # Arrange
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(201, json=[{"id": 1}])
+
+        service = InvoiceService(base_url="http://upstream.test/")
+        service.client = httpx.Client(base_url="http://upstream.test/", transport=httpx.MockTransport(handler))
+
+        # Act
+        created = service.bulk_create_invoices([{**self.valid_payload}])
+
+        # Assert
+        self.assertEqual(created, [{"id": 1}])
+        self.assertEqual(requests[0].url.path, "/invoices/bulk/")
+        self.assertEqual(json.loads(requests[0].content)[0]["total_value"], "240.00")
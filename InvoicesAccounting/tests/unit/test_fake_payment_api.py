@@ -0,0 +1,144 @@
+import random
+import httpx
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from InvoicesAccounting.app.fake_api.fake_payment_api import FakePaymentApi, FakePaymentApiConfig, parse_latency
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.bulk_invoice_service import BulkInvoiceService
+from InvoicesAccounting.app.services.http_client_registry import http_client_registry
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.resilience import circuit_breakers
+
+FAKE_BASE_URL = "http://fake-payment-api.test/"
+
+class FakePaymentApiTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        circuit_breakers.reset()
+
+    def tearDown(self):
+        client = http_client_registry.register(FAKE_BASE_URL, None)
+        if client is not None:
+            client.close()
+        circuit_breakers.reset()
+
+    def build_service(self, **config) -> InvoiceService:
+        self.api = FakePaymentApi(FakePaymentApiConfig(**config))
+        http_client_registry.register(FAKE_BASE_URL, httpx.Client(base_url=FAKE_BASE_URL, transport=httpx.WSGITransport(app=self.api)))
+        return InvoiceService(base_url=FAKE_BASE_URL)
+
+    def test_sync_follows_pages_until_the_dataset_is_synced(self):
+        # Arrange
+        service = self.build_service(invoices=25, page_size=10)
+
+        # Act
+        report = service.sync_invoices(incremental=False)
+
+        # Assert
+        self.assertEqual(report.inserted, 25)
+        self.assertEqual(InvoiceModel.objects.count(), 25)
+        self.assertEqual(self.api.stats()["requests"], 3)
+
+    def test_detail_and_accounting_entries_are_revalidated_with_etags(self):
+        # Arrange
+        service = self.build_service(invoices=3)
+
+        # Act
+        first = service.get_invoice(2)
+        second = service.get_invoice(2)
+        entries = service.generate_accounting_entries(2)
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(str(entries["entries"][2]["amount"]), first["total_value"])
+
+    def test_filter_applies_state_amount_and_pagination(self):
+        # Arrange
+        service = self.build_service(invoices=200)
+
+        # Act
+        invoices = service.filter_invoices(state="PAID", min_amount="1000", ordering="-total_value", limit=5, offset=0)
+
+        # Assert
+        self.assertLessEqual(len(invoices), 5)
+        self.assertTrue(all(invoice["state"] == "PAID" for invoice in invoices))
+        totals = [float(invoice["total_value"]) for invoice in invoices]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        self.assertTrue(all(total >= 1000 for total in totals))
+
+    @override_settings(PAYMENT_API_MAX_RETRIES=2)
+    def test_injected_errors_are_retried_then_reported(self):
+        # Arrange
+        delays = []
+        service = self.build_service(invoices=3, error_rate=1.0, error_statuses=(503,))
+        service.sleep = delays.append
+
+        # Act
+        with self.assertRaises(httpx.HTTPStatusError) as error:
+            service.get_invoice(1)
+
+        # Assert
+        self.assertEqual(error.exception.response.status_code, 503)
+        self.assertEqual(self.api.stats()["injected_errors"], 3)
+        self.assertEqual(len(delays), 2)
+
+    def test_bulk_items_upstream_skips_are_not_reported_as_applied(self):
+        # Arrange
+        service = BulkInvoiceService(invoice_service=self.build_service(invoices=3), max_workers=1)
+        payload = {
+            "provider": "Provider A", "concept": "Concept", "base_value": "100.00", "vat": "21.00",
+            "total_value": "121.00", "date": "2025-02-10", "state": "PAID",
+        }
+
+        # Act
+        updated = service.update([{**payload, "id": 1}, {**payload, "id": 999}])
+        deleted = service.delete([2, 999])
+
+        # Assert
+        self.assertEqual([result["status"] for result in updated["results"]], ["updated", "unknown"])
+        self.assertEqual(updated["results"][0]["invoice"]["state"], "PAID")
+        self.assertEqual(deleted["summary"], {"unknown": 2})
+        self.assertEqual(deleted["results"][0]["error"], "Upstream confirmed 1 of 2 invoices in this chunk.")
+
+    def test_slow_body_is_delivered_in_chunks(self):
+        # Arrange
+        service = self.build_service(invoices=50, slow_body_ms=1, chunk_size=256)
+
+        # Act
+        invoices = service.list_invoices()
+
+        # Assert
+        self.assertEqual(len(invoices), 50)
+
+    def test_crud_round_trip(self):
+        # Arrange
+        service = self.build_service(invoices=0)
+        payload = {
+            "provider": "Provider A", "concept": "Concept", "base_value": "100.00", "vat": "21.00",
+            "total_value": "121.00", "date": "2025-02-10", "state": "PENDING",
+        }
+
+        # Act
+        created = service.create_invoice(payload)
+        updated = service.update_invoice(created["id"], {"state": "PAID"})
+        service.delete_invoice(created["id"])
+
+        # Assert
+        self.assertEqual(updated["state"], "PAID")
+        with self.assertRaises(httpx.HTTPStatusError):
+            service.get_invoice(created["id"])
+
+    def test_latency_specs(self):
+        # Arrange
+        rng = random.Random(1)
+
+        # Assert
+        self.assertEqual(parse_latency(None)(rng), 0.0)
+        self.assertEqual(parse_latency("fixed:50")(rng), 0.05)
+        self.assertTrue(0.01 <= parse_latency("uniform:10:20")(rng) <= 0.02)
+        self.assertGreaterEqual(parse_latency("normal:5:50")(rng), 0.0)
+        with self.assertRaises(ValueError):
+            parse_latency("pareto:1")
+        with self.assertRaises(ValueError):
+            parse_latency("uniform:10")
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import httpx
+from django.test import TestCase, override_settings
+from InvoicesAccounting.app.services.async_invoice_service import AsyncInvoiceService
+from InvoicesAccounting.app.services.fan_out_executor import FanOutExecutor, agather
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.resilience import circuit_breakers
+
+class FanOutExecutorTest(TestCase):
+
+    def setUp(self):
+        circuit_breakers.reset()
+
+    def test_map_keeps_item_order_and_captures_errors(self):
+        # Arrange
+        def work(item):
+            time.sleep(0.01 * (5 - item))
+            if item == 2:
+                raise ValueError("boom")
+            return item * 10
+
+        # Act
+        results = FanOutExecutor(max_concurrency=5).map(work, range(5))
+
+        # Assert
+        self.assertEqual([result.item for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual([result.value for result in results if result.ok], [0, 10, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+
+    def test_map_never_exceeds_max_concurrency(self):
+        # Arrange
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def work(item):
+            with lock:
+                in_flight.append(item)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(item)
+
+        # Act
+        FanOutExecutor(max_concurrency=3).map(work, range(12))
+
+        # Assert
+        self.assertLessEqual(max(peak), 3)
+
+    @override_settings(PAYMENT_API_MAX_CONCURRENCY=0)
+    def test_rejects_invalid_concurrency(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            FanOutExecutor()
+
+    async def test_agather_bounds_concurrency_and_keeps_order(self):
+        # Arrange
+        in_flight = []
+        peak = []
+
+        async def work(item):
+            in_flight.append(item)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(item)
+            if item == 1:
+                raise RuntimeError("boom")
+            return item
+
+        # Act
+        results = await agather(work, range(6), max_concurrency=2)
+
+        # Assert
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual([result.value for result in results], [0, None, 2, 3, 4, 5])
+        self.assertFalse(results[1].ok)
+
+    @override_settings(PAYMENT_API_MAX_RETRIES=0)
+    @patch("httpx.Client.get")
+    def test_get_invoices_fetches_every_id(self, mock_get):
+        # Arrange
+        def get(url, **kwargs):
+            if url == "invoices/2/":
+                raise httpx.ConnectError("Connection refused")
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = {"id": int(url.split("/")[1])}
+            return response
+
+        mock_get.side_effect = get
+
+        # Act
+        results = InvoiceService().get_invoices([1, 2, 3])
+
+        # Assert
+        self.assertEqual([result.value for result in results], [{"id": 1}, None, {"id": 3}])
+        self.assertIsInstance(results[1].error, httpx.ConnectError)
+
+    @patch("httpx.AsyncClient.delete")
+    async def test_async_delete_invoices_fans_out(self, mock_delete):
+        # Arrange
+        mock_delete.return_value = MagicMock(status_code=200)
+
+        # Act
+        results = await AsyncInvoiceService().delete_invoices([1, 2], max_concurrency=2)
+
+        # Assert
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(mock_delete.await_count, 2)
@@ -0,0 +1,107 @@
+import httpx
+from unittest.mock import patch
+from django.test import SimpleTestCase, override_settings
+from InvoicesAccounting.app.middleware.lifespan_middleware import LifespanMiddleware
+from InvoicesAccounting.app.services.http_client_registry import HttpClientRegistry, async_http_client_registry
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+
+class HttpClientRegistryTest(SimpleTestCase):
+
+    def setUp(self):
+        self.registry = HttpClientRegistry()
+
+    def tearDown(self):
+        self.registry.close_all()
+
+    def test_registry_reuses_client_per_base_url(self):
+        # Act
+        first_client = self.registry.get_client("http://api-a.test")
+        second_client = self.registry.get_client("http://api-a.test")
+        other_client = self.registry.get_client("http://api-b.test")
+
+        # Assert
+        self.assertIs(first_client, second_client)
+        self.assertIsNot(first_client, other_client)
+
+    def test_registry_closes_clients_and_rebuilds_on_demand(self):
+        # Arrange
+        client = self.registry.get_client("http://api-a.test")
+
+        # Act
+        self.registry.close_all()
+        new_client = self.registry.get_client("http://api-a.test")
+
+        # Assert
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(client, new_client)
+        self.assertFalse(new_client.is_closed)
+
+    def test_registry_swaps_in_registered_client_and_returns_previous(self):
+        # Arrange
+        original = self.registry.get_client("http://api-a.test")
+        stub = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+        # Act
+        previous = self.registry.register("http://api-a.test", stub)
+        current = self.registry.get_client("http://api-a.test")
+        restored = self.registry.register("http://api-a.test", previous)
+
+        # Assert
+        self.assertIs(previous, original)
+        self.assertIs(current, stub)
+        self.assertIs(restored, stub)
+        self.assertIs(self.registry.get_client("http://api-a.test"), original)
+        stub.close()
+
+    @override_settings(PAYMENT_API_MAX_CONNECTIONS=7, PAYMENT_API_MAX_KEEPALIVE_CONNECTIONS=3)
+    def test_registry_builds_configured_limits(self):
+        # Act
+        limits = self.registry.build_limits()
+
+        # Assert
+        self.assertEqual(limits.max_connections, 7)
+        self.assertEqual(limits.max_keepalive_connections, 3)
+
+    @override_settings(PAYMENT_API_HTTP2=True)
+    @patch("InvoicesAccounting.app.services.http_client_registry.importlib.util.find_spec", return_value=None)
+    def test_registry_falls_back_to_http1_without_h2(self, mock_find_spec):
+        # Act / Assert
+        self.assertFalse(self.registry.http2_enabled())
+
+    def test_invoice_services_share_the_same_client(self):
+        # Act / Assert
+        self.assertIs(InvoiceService().client, InvoiceService().client)
+
+class LifespanMiddlewareTest(SimpleTestCase):
+
+    async def test_shutdown_closes_async_clients(self):
+        # Arrange
+        client = async_http_client_registry.get_client("http://api-lifespan.test")
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        # Act
+        await LifespanMiddleware(None)({"type": "lifespan"}, receive, send)
+
+        # Assert
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        self.assertTrue(client.is_closed)
+
+    async def test_other_scopes_reach_the_application(self):
+        # Arrange
+        calls = []
+
+        async def application(scope, receive, send):
+            calls.append(scope["type"])
+
+        # Act
+        await LifespanMiddleware(application)({"type": "http"}, None, None)
+
+        # Assert
+        self.assertEqual(calls, ["http"])
@@ -0,0 +1,91 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+from django.core.cache import cache
+from django.test import TestCase
+from InvoicesAccounting.app.cache.invoice_cache import InvoiceCache, invoice_cache
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+class InvoiceCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.invoice_cache = InvoiceCache(ttl=60, negative_ttl=5)
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=Decimal("100.00"),
+            vat=Decimal("21.00"),
+            total_value=Decimal("121.00"),
+            date=date(2025, 2, 10),
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def test_cache_serves_hot_entries_without_calling_loader(self):
+        # Arrange
+        loader = Mock(return_value={"id": self.invoice.id})
+
+        # Act
+        first = self.invoice_cache.get_or_load(self.invoice.id, loader)
+        second = self.invoice_cache.get_or_load(self.invoice.id, loader)
+
+        # Assert
+        self.assertEqual(first, second)
+        loader.assert_called_once_with(self.invoice.id)
+        self.assertEqual(self.invoice_cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_cache_remembers_missing_invoices(self):
+        # Arrange
+        loader = Mock(return_value=None)
+
+        # Act
+        first = self.invoice_cache.get_or_load(999, loader)
+        second = self.invoice_cache.get_or_load(999, loader)
+
+        # Assert
+        self.assertIsNone(first)
+        self.assertIsNone(second)
+        loader.assert_called_once_with(999)
+
+    def test_cache_is_invalidated_when_invoice_is_saved_or_deleted(self):
+        # Arrange
+        invoice_cache.get_or_load(self.invoice.id, lambda invoice_id: {"id": invoice_id})
+
+        # Act
+        self.invoice.state = InvoiceStates.PAID.value
+        self.invoice.save()
+
+        # Assert
+        self.assertIsNone(cache.get(invoice_cache.key(self.invoice.id)))
+
+        # Act
+        invoice_cache.get_or_load(self.invoice.id, lambda invoice_id: {"id": invoice_id})
+        invoice_id = self.invoice.id
+        self.invoice.delete()
+
+        # Assert
+        self.assertIsNone(cache.get(invoice_cache.key(invoice_id)))
+
+    def test_cache_is_invalidated_by_bulk_sync(self):
+        # Arrange
+        invoice_cache.get_or_load(self.invoice.id, lambda invoice_id: {"id": invoice_id})
+        row = {
+            "id": self.invoice.id,
+            "provider": "Provider Z",
+            "concept": self.invoice.concept,
+            "base_value": Decimal("100.00"),
+            "vat": Decimal("21.00"),
+            "total_value": Decimal("121.00"),
+            "date": date(2025, 2, 10),
+            "state": InvoiceStates.PENDING.value,
+        }
+
+        # Act
+        InvoiceSyncService().sync([row])
+
+        # Assert
+        self.assertIsNone(cache.get(invoice_cache.key(self.invoice.id)))
@@ -0,0 +1,199 @@
+import httpx
+from django.core.cache import cache
+from django.db.models import F
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils.http import http_date
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+class InvoiceConditionsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100,
+            vat=21,
+            total_value=121,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+        self.detail_url = reverse("invoice-detail", args=[self.invoice.id])
+
+    def test_detail_answers_304_while_invoice_is_unchanged(self):
+        # Arrange
+        first = self.client.get(self.detail_url)
+
+        # Act
+        second = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(first["ETag"], f'"{self.invoice.id}-1"')
+        self.assertIn("Last-Modified", first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+    def test_detail_etag_changes_when_invoice_is_saved(self):
+        # Arrange
+        first = self.client.get(self.detail_url)
+
+        # Act
+        self.invoice.state = InvoiceStates.PAID.value
+        self.invoice.save()
+        second = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second["ETag"], f'"{self.invoice.id}-2"')
+        self.assertEqual(second.json()["state"], InvoiceStates.PAID.value)
+
+    def test_cached_detail_answers_304_without_touching_the_database(self):
+        # Arrange
+        first = self.client.get(self.detail_url)
+
+        # Act
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(second.status_code, 304)
+
+    def test_stale_instances_never_save_the_same_version(self):
+        # Arrange
+        first = InvoiceModel.objects.get(pk=self.invoice.pk)
+        second = InvoiceModel.objects.get(pk=self.invoice.pk)
+
+        # Act
+        first.concept = "First"
+        first.save()
+        second.concept = "Second"
+        second.save()
+
+        # Assert
+        self.invoice.refresh_from_db()
+        self.assertEqual((first.version, second.version, self.invoice.version), (2, 3, 3))
+
+    def test_detail_honours_if_modified_since(self):
+        # Act
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=http_date(self.invoice.updated_at.timestamp() + 60))
+
+        # Assert
+        self.assertEqual(response.status_code, 304)
+
+    def test_accounting_entries_have_their_own_etag(self):
+        # Arrange
+        url = reverse("invoice-accounting-entries", args=[self.invoice.id])
+        first = self.client.get(url)
+
+        # Act
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(first["ETag"], f'"{self.invoice.id}-1-entries"')
+        self.assertEqual(second.status_code, 304)
+
+    def test_list_etag_follows_inserts_and_deletes(self):
+        # Arrange
+        first = self.client.get(reverse("invoice-list"))
+        unchanged = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Act
+        self.invoice.delete()
+        InvoiceModel.objects.create(
+            provider="Provider B", concept="Other", base_value=100, vat=21, total_value=121,
+            date="2025-02-10", state=InvoiceStates.PENDING.value,
+        )
+        changed = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_list_etag_follows_updates_with_a_single_query(self):
+        # Arrange
+        first = self.client.get(reverse("invoice-list"))
+
+        # Act
+        with self.assertNumQueries(1):
+            unchanged = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.invoice.state = InvoiceStates.PAID.value
+        self.invoice.save()
+        changed = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+
+    def test_list_etag_follows_writes_that_bypass_this_process(self):
+        # Arrange
+        first = self.client.get(reverse("invoice-list"))
+
+        # Act
+        InvoiceModel.objects.filter(id=self.invoice.id).update(state=InvoiceStates.PAID.value, version=F("version") + 1)
+        changed = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(changed.status_code, 200)
+
+    def test_saving_an_unloaded_instance_bumps_the_stored_version(self):
+        # Arrange
+        self.invoice.save()
+
+        # Act
+        replacement = InvoiceModel(id=self.invoice.id, **{field: value for field, value in self.invoice.to_dict().items() if field != "id"})
+        replacement.save()
+
+        # Assert
+        self.invoice.refresh_from_db()
+        self.assertEqual((replacement.version, self.invoice.version), (3, 3))
+
+    def test_list_etag_follows_bulk_sync(self):
+        # Arrange
+        first = self.client.get(reverse("invoice-list"))
+
+        # Act
+        InvoiceSyncService().sync_batch([{**self.invoice.to_dict(), "state": InvoiceStates.PAID.value}])
+        changed = self.client.get(reverse("invoice-list"), HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Assert
+        self.assertEqual(changed.status_code, 200)
+
+    def test_bulk_sync_bumps_versions(self):
+        # Arrange
+        row = {**self.invoice.to_dict(), "state": InvoiceStates.PAID.value}
+
+        # Act
+        InvoiceSyncService().sync_batch([row])
+
+        # Assert
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.version, 2)
+
+    def test_service_revalidates_upstream_with_if_none_match(self):
+        # Arrange
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": 1}, headers={"ETag": '"v1"'})
+
+        service = InvoiceService(base_url="http://conditional.test/")
+        service.client = httpx.Client(base_url="http://conditional.test/", transport=httpx.MockTransport(handler))
+
+        # Act
+        first = service.get_invoice(1)
+        second = service.get_invoice(1)
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual([request.headers.get("If-None-Match") for request in requests], [None, '"v1"'])
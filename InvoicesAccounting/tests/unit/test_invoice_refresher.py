@@ -0,0 +1,144 @@
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+import httpx
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.invoice_refresher import InvoiceRefresher
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+
+class InvoiceRefresherTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.refresher = InvoiceRefresher(stale_after=60, max_workers=0)
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100,
+            vat=21,
+            total_value=121,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def make_stale(self):
+        InvoiceModel.objects.filter(id=self.invoice.id).update(updated_at=timezone.now() - timedelta(seconds=120))
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.sync_invoices")
+    def test_stale_list_is_refreshed_once(self, mock_sync_invoices):
+        # Act
+        first = self.refresher.refresh_list_if_stale()
+        second = self.refresher.refresh_list_if_stale()
+
+        # Assert
+        self.assertTrue(first)
+        self.assertFalse(second)
+        mock_sync_invoices.assert_called_once_with(incremental=True)
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.sync_invoices")
+    def test_fresh_list_or_disabled_policy_skips_refresh(self, mock_sync_invoices):
+        # Arrange
+        SyncStateModel.mark_synced(InvoiceService.BASE_URL)
+
+        # Act
+        fresh = self.refresher.refresh_list_if_stale()
+        disabled = InvoiceRefresher(stale_after=0).refresh_invoice_if_stale(self.invoice.id)
+
+        # Assert
+        self.assertFalse(fresh)
+        self.assertFalse(disabled)
+        mock_sync_invoices.assert_not_called()
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.get_invoice")
+    def test_detail_serves_local_copy_and_refreshes_it(self, mock_get_invoice):
+        # Arrange
+        mock_get_invoice.return_value = {**self.invoice.to_dict(), "state": InvoiceStates.PAID.value}
+        self.make_stale()
+
+        # Act
+        with patch("InvoicesAccounting.resources.views.invoice_view.invoice_refresher", self.refresher):
+            response = self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        self.assertEqual(response.json()["state"], InvoiceStates.PENDING.value)
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.state, InvoiceStates.PAID.value)
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.get_invoice")
+    def test_fresh_invoice_is_not_refreshed(self, mock_get_invoice):
+        # Act
+        refreshed = self.refresher.refresh_invoice_if_stale(self.invoice.id)
+
+        # Assert
+        self.assertFalse(refreshed)
+        mock_get_invoice.assert_not_called()
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.get_invoice")
+    def test_refresh_removes_invoices_only_after_confirmed_404s(self, mock_get_invoice):
+        # Arrange
+        refresher = InvoiceRefresher(stale_after=60, max_workers=0, missing_confirmations=2)
+        response = httpx.Response(404, request=httpx.Request("GET", "http://upstream.test/"))
+        mock_get_invoice.side_effect = httpx.HTTPStatusError("Not found", request=response.request, response=response)
+        self.make_stale()
+
+        # Act
+        refresher.refresh_invoice(self.invoice.id)
+        kept = InvoiceModel.objects.filter(id=self.invoice.id).exists()
+        refresher.refresh_invoice(self.invoice.id)
+
+        # Assert
+        self.assertTrue(kept)
+        self.assertFalse(InvoiceModel.objects.filter(id=self.invoice.id).exists())
+
+    @patch("InvoicesAccounting.app.services.invoice_refresher.InvoiceService.get_invoice")
+    def test_successful_refresh_resets_missing_count(self, mock_get_invoice):
+        # Arrange
+        refresher = InvoiceRefresher(stale_after=60, max_workers=0, missing_confirmations=2)
+        response = httpx.Response(404, request=httpx.Request("GET", "http://upstream.test/"))
+        missing = httpx.HTTPStatusError("Not found", request=response.request, response=response)
+        mock_get_invoice.side_effect = [missing, self.invoice.to_dict(), missing]
+
+        # Act
+        for _ in range(3):
+            refresher.refresh_invoice(self.invoice.id)
+
+        # Assert
+        self.assertTrue(InvoiceModel.objects.filter(id=self.invoice.id).exists())
+
+    def test_failed_refresh_can_be_retried(self):
+        # Arrange
+        refresh = MagicMock(side_effect=[Exception("Upstream down"), None])
+
+        # Act
+        self.refresher.schedule("list", refresh)
+        self.refresher.schedule("list", refresh)
+
+        # Assert
+        self.assertEqual(refresh.call_count, 2)
+
+    def test_concurrent_requests_share_one_background_refresh(self):
+        # Arrange
+        refresher = InvoiceRefresher(stale_after=60, max_workers=2)
+        release = threading.Event()
+        refresh = MagicMock(side_effect=lambda: release.wait(1))
+
+        # Act
+        threads = [threading.Thread(target=refresher.schedule, args=("list", refresh)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        release.set()
+        refresher.shutdown(wait=True)
+
+        # Assert
+        self.assertEqual(refresh.call_count, 1)
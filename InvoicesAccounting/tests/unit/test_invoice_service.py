@@ -1,10 +1,15 @@
+import json
 from decimal import Decimal
-from unittest.mock import patch
+import httpx
+from unittest.mock import MagicMock, patch
 from django.test import TestCase
 from Inmatic import settings
 from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
 from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
 from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+from InvoicesAccounting.app.services.resilience import operation_timeout
 
 class InvoiceServiceTest(TestCase):
 
@@ -105,6 +110,7 @@ class InvoiceServiceTest(TestCase):
         }
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = invoice_data
+        mock_get.return_value.headers = {}
 
         # Act
         retrieved_invoice = self.service.get_invoice(invoice_id)
@@ -138,6 +144,7 @@ class InvoiceServiceTest(TestCase):
 
         # Assert
         self.assertEqual(updated_invoice, updated_invoice_data)
+        self.assertEqual(json.loads(mock_put.call_args.kwargs["content"]), {"concept": "Updated Concept", "total_value": "150.00"})
 
     @patch("httpx.Client.delete")
     def test_invoice_service_deletes_invoice(self, mock_delete):
@@ -216,6 +223,7 @@ class InvoiceServiceTest(TestCase):
         ]
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = accounting_entries_data 
+        mock_get.return_value.headers = {}
 
         # Act
         response = self.service.generate_accounting_entries(invoice_id)
@@ -228,17 +236,151 @@ class InvoiceServiceTest(TestCase):
         first_entry = response["entries"][0]
         self.assertEqual(first_entry["account"], AccountingCodes.PURCHASES.value)
         self.assertEqual(first_entry["description"], AccountingCodes.PURCHASES.label)
-        self.assertEqual(first_entry["amount"], float(Decimal("100.00")))
+        self.assertEqual(first_entry["amount"], Decimal("100.00"))
 
         # Validate second entry (VAT Supported)
         second_entry = response["entries"][1]
         self.assertEqual(second_entry["account"], AccountingCodes.VAT_SUPPORTED.value)
         self.assertEqual(second_entry["description"], AccountingCodes.VAT_SUPPORTED.label)
-        self.assertEqual(second_entry["amount"], float(Decimal("21.00")))
+        self.assertEqual(second_entry["amount"], Decimal("21.00"))
 
         # Validate third entry (Suppliers)
         third_entry = response["entries"][2]
         self.assertEqual(third_entry["account"], AccountingCodes.SUPPLIERS.value)
         self.assertEqual(third_entry["description"], AccountingCodes.SUPPLIERS.label)
-        self.assertEqual(third_entry["amount"], float(Decimal("121.00")))
+        self.assertEqual(third_entry["amount"], Decimal("121.00"))
 
+
+    @patch("httpx.Client.get")
+    def test_invoice_service_incremental_sync_sends_watermark_and_etag(self, mock_get):
+        # Arrange
+        SyncStateModel.objects.create(source=self.service.base_url, last_seen_id=10, etag='"v1"')
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"ETag": '"v2"'}
+        mock_get.return_value.json.return_value = [
+            {
+                "id": 11,
+                "provider": "Provider A",
+                "concept": "Concept A",
+                "base_value": "100.00",
+                "vat": "21.00",
+                "total_value": "121.00",
+                "date": "2025-02-08",
+                "state": InvoiceStates.PENDING.value,
+                "updated_at": "2025-02-09T10:00:00+00:00",
+            },
+        ]
+
+        # Act
+        report = self.service.sync_invoices()
+
+        # Assert
+        mock_get.assert_called_once_with(
+            "invoices/", params={"since_id": 10}, headers={"If-None-Match": '"v1"'}, timeout=operation_timeout("sync")
+        )
+        self.assertEqual(report.inserted, 1)
+
+        state = SyncStateModel.objects.get(source=self.service.base_url)
+        self.assertEqual(state.last_seen_id, 11)
+        self.assertEqual(state.etag, '"v2"')
+        self.assertEqual(state.delta_params(), {"updated_since": "2025-02-09T10:00:00+00:00"})
+
+    @patch("httpx.Client.get")
+    def test_invoice_service_incremental_sync_skips_unchanged_source(self, mock_get):
+        # Arrange
+        SyncStateModel.objects.create(source=self.service.base_url, last_seen_id=10, etag='"v1"')
+        mock_get.return_value.status_code = 304
+
+        # Act
+        report = self.service.sync_invoices()
+
+        # Assert
+        self.assertEqual(report.total, 0)
+        mock_get.return_value.json.assert_not_called()
+        self.assertTrue(SyncStateModel.is_fresh(self.service.base_url, 60))
+
+    @patch("httpx.Client.get")
+    def test_invoice_service_sync_follows_next_pages(self, mock_get):
+        # Arrange
+        row = {
+            "provider": "Provider A",
+            "concept": "Concept A",
+            "base_value": "100.00",
+            "vat": "21.00",
+            "total_value": "121.00",
+            "date": "2025-02-08",
+            "state": InvoiceStates.PENDING.value,
+        }
+        first_page, second_page = MagicMock(status_code=200, headers={}), MagicMock(status_code=200, headers={})
+        first_page.json.return_value = {"results": [{**row, "id": 1}], "next": "invoices/?page=2"}
+        second_page.json.return_value = {"results": [{**row, "id": 2}], "next": None}
+        mock_get.side_effect = [first_page, second_page]
+
+        # Act
+        report = self.service.sync_invoices(incremental=False)
+
+        # Assert
+        self.assertEqual(report.inserted, 2)
+        self.assertEqual(mock_get.call_args_list[1].args, ("invoices/?page=2",))
+
+    def test_invoice_service_stream_sync_upserts_in_batches(self):
+        # Arrange
+        rows = [
+            {
+                "id": index,
+                "provider": f"Provider {index}",
+                "concept": "Concept",
+                "base_value": "100.00",
+                "vat": "21.00",
+                "total_value": "121.00",
+                "date": "2025-02-08",
+                "state": InvoiceStates.PENDING.value,
+            }
+            for index in range(1, 6)
+        ]
+        body = json.dumps(rows).encode()
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, stream=httpx.ByteStream(body))
+        )
+        service = InvoiceService(base_url="http://stream.test", sync_batch_size=2)
+        service.client = httpx.Client(base_url="http://stream.test", transport=transport)
+
+        # Act
+        with patch.object(InvoiceSyncService, "sync_batch", wraps=InvoiceSyncService(2).sync_batch) as mock_sync_batch:
+            report = service.stream_sync_invoices()
+
+        # Assert
+        self.assertEqual(report.inserted, 5)
+        self.assertEqual([len(call.args[0]) for call in mock_sync_batch.call_args_list], [2, 2, 1])
+        self.assertEqual(SyncStateModel.objects.get(source="http://stream.test").last_seen_id, 5)
+
+    def test_invoice_service_stream_sync_keeps_watermarks_below_invalid_rows(self):
+        # Arrange
+        rows = [
+            {
+                "id": index,
+                "provider": f"Provider {index}",
+                "concept": "Concept",
+                "base_value": "100.00",
+                "vat": "21.00",
+                "total_value": "121.00" if index != 2 else "999.00",
+                "date": "2025-02-08",
+                "state": InvoiceStates.PENDING.value,
+                "updated_at": f"2025-02-08T10:0{index}:00+00:00",
+            }
+            for index in range(1, 4)
+        ]
+        body = json.dumps(rows).encode()
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, stream=httpx.ByteStream(body))
+        )
+        service = InvoiceService(base_url="http://stream.test", sync_batch_size=2)
+        service.client = httpx.Client(base_url="http://stream.test", transport=transport)
+
+        # Act
+        report = service.stream_sync_invoices(incremental=True)
+
+        # Assert
+        state = SyncStateModel.objects.get(source="http://stream.test")
+        self.assertEqual((report.inserted, report.invalid), (2, 1))
+        self.assertEqual((state.last_seen_id, state.last_modified), (None, None))
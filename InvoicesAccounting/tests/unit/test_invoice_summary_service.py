@@ -0,0 +1,130 @@
+import importlib
+from datetime import date
+from decimal import Decimal
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.invoice_rollup_model import InvoiceRollupModel
+from InvoicesAccounting.app.services.invoice_summary_service import InvoiceSummaryService
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+class InvoiceSummaryServiceTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        # Arrange
+        self.invoice = self.create_invoice()
+        self.create_invoice(provider="Provider B", state=InvoiceStates.PAID.value, date=date(2025, 3, 5))
+        self.create_invoice(state=InvoiceStates.PAID.value, date=date(2025, 3, 20))
+
+    def create_invoice(self, **overrides):
+        return InvoiceModel.objects.create(**self.build_row(**overrides))
+
+    def build_row(self, **overrides):
+        return {
+            "provider": "Provider A",
+            "concept": "Test Concept",
+            "base_value": Decimal("100.00"),
+            "vat": Decimal("21.00"),
+            "total_value": Decimal("121.00"),
+            "date": date(2025, 2, 10),
+            "state": InvoiceStates.PENDING.value,
+            **overrides,
+        }
+
+    def summarize(self, **params):
+        response = self.client.get(reverse("invoice-summary"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_summary_groups_by_state_from_the_rollup(self):
+        # Act
+        summary = self.summarize(group_by="state")
+
+        # Assert
+        self.assertEqual(summary["source"], "rollup")
+        self.assertEqual(summary["groups"], [
+            {"state": InvoiceStates.PAID.value, "count": 2, "base_value": "200.00", "vat": "42.00", "total_value": "242.00"},
+            {"state": InvoiceStates.PENDING.value, "count": 1, "base_value": "100.00", "vat": "21.00", "total_value": "121.00"},
+        ])
+        self.assertEqual(summary["totals"]["total_value"], "363.00")
+
+    def test_summary_groups_by_month_and_provider(self):
+        # Act
+        summary = self.summarize(group_by="month,provider")
+
+        # Assert
+        self.assertEqual(
+            [(group["month"], group["provider"], group["count"]) for group in summary["groups"]],
+            [("2025-02", "Provider A", 1), ("2025-03", "Provider A", 1), ("2025-03", "Provider B", 1)],
+        )
+
+    def test_summary_with_amount_filters_aggregates_the_invoices(self):
+        # Arrange
+        self.create_invoice(base_value=Decimal("500.00"), vat=Decimal("105.00"), total_value=Decimal("605.00"))
+
+        # Act
+        summary = self.summarize(group_by="provider", min_amount="200")
+
+        # Assert
+        self.assertEqual(summary["source"], "invoices")
+        self.assertEqual(summary["totals"], {"count": 1, "base_value": "500.00", "vat": "105.00", "total_value": "605.00"})
+
+    def test_summary_rejects_unknown_group_by(self):
+        # Act
+        response = self.client.get(reverse("invoice-summary"), {"group_by": "concept"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    def test_rollup_follows_invoices_moving_to_another_day(self):
+        # Act
+        self.invoice.date = date(2025, 3, 5)
+        self.invoice.save()
+
+        # Assert
+        self.assertFalse(InvoiceRollupModel.objects.filter(date=date(2025, 2, 10)).exists())
+        self.assertEqual(InvoiceRollupModel.objects.get(date=date(2025, 3, 5), provider="Provider A").invoice_count, 1)
+
+    def test_rollup_is_refreshed_after_delete_and_bulk_sync(self):
+        # Arrange
+        rows = [self.build_row(id=self.invoice.id + 100, date=date(2025, 3, 5), provider="Provider B")]
+
+        # Act
+        self.invoice.delete()
+        InvoiceSyncService().sync(rows)
+
+        # Assert
+        self.assertEqual(
+            [(group["date"], group["count"]) for group in self.summarize(group_by="date")["groups"]],
+            [("2025-03-05", 2), ("2025-03-20", 1)],
+        )
+
+    def test_rebuild_matches_the_incremental_rollup(self):
+        # Arrange
+        incremental = self.summarize(group_by="date,state,provider")
+
+        # Act
+        InvoiceSummaryService(batch_size=1).rebuild()
+
+        # Assert
+        self.assertEqual(self.summarize(group_by="date,state,provider"), incremental)
+
+    def test_migration_backfills_the_rollup_of_existing_invoices(self):
+        # Arrange
+        migration = importlib.import_module("InvoicesAccounting.migrations.0013_backfill_invoice_rollups")
+        incremental = self.summarize(group_by="date,state,provider")
+        InvoiceRollupModel.objects.all().delete()
+
+        # Act
+        migration.backfill_invoice_rollups(apps, connection.schema_editor())
+
+        # Assert
+        self.assertEqual(self.summarize(group_by="date,state,provider"), incremental)
@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+class InvoiceSyncServiceTest(TestCase):
+
+    def setUp(self):
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=Decimal("100.00"),
+            vat=Decimal("21.00"),
+            total_value=Decimal("121.00"),
+            date=date(2025, 2, 10),
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def build_row(self, **overrides):
+        return {
+            "provider": self.invoice.provider,
+            "concept": self.invoice.concept,
+            "base_value": Decimal("100.00"),
+            "vat": Decimal("21.00"),
+            "total_value": Decimal("121.00"),
+            "date": date(2025, 2, 10),
+            "state": InvoiceStates.PENDING.value,
+            **overrides,
+        }
+
+    def test_sync_reports_inserted_updated_and_unchanged(self):
+        # Arrange
+        other_invoice = InvoiceModel.objects.create(**self.build_row(provider="Provider B"))
+        rows = [
+            self.build_row(id=self.invoice.id),
+            self.build_row(id=other_invoice.id, state=InvoiceStates.PAID.value),
+            self.build_row(id=other_invoice.id + 100, provider="Provider C"),
+        ]
+
+        # Act
+        report = InvoiceSyncService(batch_size=2).sync(rows)
+
+        # Assert
+        self.assertEqual(report.as_dict(), {"inserted": 1, "updated": 1, "unchanged": 1, "invalid": 0})
+        self.assertEqual(InvoiceModel.objects.get(id=other_invoice.id).state, InvoiceStates.PAID.value)
+        self.assertTrue(InvoiceModel.objects.filter(id=other_invoice.id + 100, provider="Provider C").exists())
+
+    def test_sync_inserts_rows_without_id(self):
+        # Act
+        report = InvoiceSyncService().sync([self.build_row(provider="Provider D")])
+
+        # Assert
+        self.assertEqual(report.inserted, 1)
+        self.assertEqual(InvoiceModel.objects.count(), 2)
+
+    def test_sync_runs_constant_queries_per_chunk(self):
+        # Arrange
+        rows = [self.build_row(id=self.invoice.id + offset, provider=f"Provider {offset}") for offset in range(1, 51)]
+
+        # Act / Assert: one SELECT + one INSERT, plus the savepoint pair of the chunk transaction,
+        # then the ledger and rollup refreshes (SELECT, DELETE, INSERT and a savepoint pair each)
+        with self.assertNumQueries(14):
+            report = InvoiceSyncService(batch_size=100).sync(rows)
+
+        self.assertEqual(report.inserted, 50)
+
+    def test_sync_rejects_invalid_batch_size(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            InvoiceSyncService(batch_size=0)
+
+    def test_sync_batch_skips_and_counts_invalid_rows(self):
+        # Arrange
+        rows = [
+            {**self.build_row(provider="Provider E"), "base_value": "100.00", "vat": "21.00", "total_value": "121.00", "date": "2025-02-10"},
+            {**self.build_row(provider="Provider F"), "total_value": "500.00"},
+        ]
+
+        # Act
+        report = InvoiceSyncService().sync_batch(rows)
+
+        # Assert
+        self.assertEqual(report.inserted, 1)
+        self.assertEqual(report.invalid, 1)
+        self.assertFalse(InvoiceModel.objects.filter(provider="Provider F").exists())
+
+    def test_sync_batch_matches_string_ids_and_skips_invalid_ids(self):
+        # Arrange
+        rows = [
+            self.build_row(id=str(self.invoice.id), state=InvoiceStates.PAID.value),
+            self.build_row(id="abc", provider="Provider G"),
+            self.build_row(id=0, provider="Provider H"),
+        ]
+
+        # Act
+        report = InvoiceSyncService().sync_batch(rows)
+
+        # Assert
+        self.invoice.refresh_from_db()
+        self.assertEqual(report.updated, 1)
+        self.assertEqual(report.inserted, 0)
+        self.assertEqual(report.invalid, 2)
+        self.assertEqual(self.invoice.state, InvoiceStates.PAID.value)
+        self.assertFalse(InvoiceModel.objects.filter(provider__in=["Provider G", "Provider H"]).exists())
+
+    def test_sync_state_advances_past_string_ids_and_ignores_invalid_ones(self):
+        # Arrange
+        state = SyncStateModel(source="http://upstream.test/", last_seen_id=10)
+
+        # Act
+        state.advance([{"id": "12"}, {"id": "abc"}, {"id": 3}])
+
+        # Assert
+        self.assertEqual(state.last_seen_id, 12)
@@ -1,17 +1,22 @@
 from datetime import date
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
 from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
 from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.models.sync_state_model import SyncStateModel
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+import httpx
 import json
 
 class InvoiceViewTest(TestCase):
 
     def setUp(self):
         self.client = Client()
+        cache.clear()
 
         # Arrange
         self.user = User.objects.create_user(
@@ -240,6 +245,7 @@ class InvoiceViewTest(TestCase):
     @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices")
     def test_filter_invoices_with_invalid_filters(self, mock_filter_invoices):
         # Arrange
+        InvoiceModel.objects.all().delete()
         mock_filter_invoices.side_effect = Exception("Invalid filters")
 
         # Act
@@ -269,17 +275,17 @@ class InvoiceViewTest(TestCase):
                 {
                     "account": AccountingCodes.PURCHASES.value, 
                     "description": AccountingCodes.PURCHASES.label,  
-                    "amount": float(self.invoice.base_value) 
+                    "amount": "100.00"
                 },
                 {
                     "account": AccountingCodes.VAT_SUPPORTED.value, 
                     "description": AccountingCodes.VAT_SUPPORTED.label, 
-                    "amount": float(self.invoice.vat)  
+                    "amount": "20.00"
                 },
                 {
                     "account": AccountingCodes.SUPPLIERS.value, 
                     "description": AccountingCodes.SUPPLIERS.label,  
-                    "amount": float(self.invoice.total_value) 
+                    "amount": "120.00"
                 }
             ]
         }
@@ -303,17 +309,17 @@ class InvoiceViewTest(TestCase):
                 {
                     "account": AccountingCodes.PURCHASES.value,
                     "description": AccountingCodes.PURCHASES.label,
-                    "amount": 150.00
+                    "amount": "150.00"
                 },
                 {
                     "account": AccountingCodes.VAT_SUPPORTED.value,
                     "description": AccountingCodes.VAT_SUPPORTED.label,
-                    "amount": 30.00
+                    "amount": "30.00"
                 },
                 {
                     "account": AccountingCodes.SUPPLIERS.value,
                     "description": AccountingCodes.SUPPLIERS.label,
-                    "amount": 180.00
+                    "amount": "180.00"
                 }
             ]
         }
@@ -497,6 +503,7 @@ class InvoiceViewTest(TestCase):
     @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices")
     def test_filter_invoices_by_state_and_date_range(self, mock_filter_invoices):
         # Arrange
+        InvoiceModel.objects.all().delete()
         mock_filter_invoices.return_value = [
             {
                 "id": 999,
@@ -527,6 +534,26 @@ class InvoiceViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["provider"], "Provider C")
+        mock_filter_invoices.assert_called_once_with(
+            state=InvoiceStates.PAID.value, start_date=start_date, end_date=end_date, ordering="id", limit=100, offset=0
+        )
+
+    @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices")
+    def test_filter_invoices_runs_locally_when_data_is_fresh(self, mock_filter_invoices):
+        # Arrange
+        SyncStateModel.mark_synced(InvoiceService.BASE_URL)
+        InvoiceModel.objects.create(**{**self.valid_payload, "state": InvoiceStates.PAID.value})
+
+        # Act
+        response = self.client.get(
+            reverse('invoice-filter'),
+            data={"state": InvoiceStates.PAID.value, "start_date": "2025-02-01", "end_date": "2025-02-20"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["provider"] for row in response.json()], [self.valid_payload["provider"]])
+        mock_filter_invoices.assert_not_called()
 
     @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices")
     def test_filter_invoices_invalid_state(self, mock_filter_invoices):
@@ -541,3 +568,188 @@ class InvoiceViewTest(TestCase):
         self.assertIn("Invalid state filter", response.json()["error"])
 
 
+
+    def test_list_invoices_paginates_with_cursor(self):
+        # Arrange
+        second_invoice = InvoiceModel.objects.create(**{**self.valid_payload, "date": date(2025, 2, 11)})
+
+        # Act
+        first_page = self.client.get(reverse("invoice-list"), data={"limit": 1}).json()
+        second_page = self.client.get(reverse("invoice-list"), data={"limit": 1, "cursor": first_page["next_cursor"]}).json()
+
+        # Assert
+        self.assertEqual([row["id"] for row in first_page["results"]], [self.invoice.id])
+        self.assertIsNotNone(first_page["next_cursor"])
+        self.assertEqual([row["id"] for row in second_page["results"]], [second_invoice.id])
+        self.assertIsNone(second_page["next_cursor"])
+
+    @patch("httpx.Client.get")
+    def test_list_invoices_fallback_applies_limit_and_cursor(self, mock_get):
+        # Arrange
+        self.invoice.delete()
+        mock_get.return_value = MagicMock(status_code=200, headers={})
+        mock_get.return_value.json.return_value = [
+            {**self.valid_payload, "id": invoice_id, "base_value": "200.00", "vat": "40.00", "total_value": "240.00"}
+            for invoice_id in (101, 102, 103)
+        ]
+
+        # Act
+        first_page = self.client.get(reverse("invoice-list"), data={"limit": 2}).json()
+        second_page = self.client.get(reverse("invoice-list"), data={"limit": 2, "cursor": first_page["next_cursor"]}).json()
+
+        # Assert
+        self.assertEqual([row["id"] for row in first_page["results"]], [101, 102])
+        self.assertEqual([row["id"] for row in second_page["results"]], [103])
+        self.assertIsNone(second_page["next_cursor"])
+
+    def test_list_invoices_invalid_cursor(self):
+        # Act
+        response = self.client.get(reverse("invoice-list"), data={"cursor": "not-a-cursor"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Invalid cursor.")
+
+    def test_list_invoices_streams_ndjson(self):
+        # Act
+        response = self.client.get(reverse("invoice-list"), data={"stream": "ndjson"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["provider"], self.invoice.provider)
+
+    def test_list_invoices_streams_json_array(self):
+        # Act
+        response = self.client.get(reverse("invoice-list"), data={"stream": "json"})
+        body = json.loads(b"".join(response.streaming_content))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in body], [self.invoice.id])
+
+    @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.get_invoice")
+    def test_retrieve_invoice_upstream_404_is_cached(self, mock_get_invoice):
+        # Arrange
+        request = httpx.Request("GET", "http://testserver/invoices/999/")
+        mock_get_invoice.side_effect = httpx.HTTPStatusError("Not found", request=request, response=httpx.Response(404, request=request))
+
+        # Act
+        first_response = self.client.get(reverse('invoice-detail', args=[999]))
+        second_response = self.client.get(reverse('invoice-detail', args=[999]))
+
+        # Assert
+        self.assertEqual(first_response.status_code, 404)
+        self.assertEqual(second_response.status_code, 404)
+        mock_get_invoice.assert_called_once_with(999)
+
+    @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices")
+    def test_filter_invoices_supports_states_amounts_ordering_and_pagination(self, mock_filter_invoices):
+        # Arrange
+        SyncStateModel.mark_synced(InvoiceService.BASE_URL)
+        paid = InvoiceModel.objects.create(**{**self.valid_payload, "state": InvoiceStates.PAID.value})
+        InvoiceModel.objects.create(**{**self.valid_payload, "state": InvoiceStates.DRAFT.value})
+        big = InvoiceModel.objects.create(**{
+            **self.valid_payload, "base_value": 1000.0, "vat": 210.0, "total_value": 1210.0, "state": InvoiceStates.PAID.value
+        })
+
+        # Act
+        response = self.client.get(reverse('invoice-filter'), data={
+            "state": f"{InvoiceStates.PENDING.value},{InvoiceStates.PAID.value}",
+            "min_amount": "100",
+            "ordering": "-total_value",
+            "limit": 2,
+        })
+        next_page = self.client.get(reverse('invoice-filter'), data={
+            "state": f"{InvoiceStates.PENDING.value},{InvoiceStates.PAID.value}",
+            "min_amount": "100",
+            "ordering": "-total_value",
+            "limit": 2,
+            "offset": 2,
+        })
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], [big.id, paid.id])
+        self.assertEqual([row["id"] for row in next_page.json()], [self.invoice.id])
+        mock_filter_invoices.assert_not_called()
+
+    def test_filter_invoices_invalid_ordering(self):
+        # Act
+        response = self.client.get(reverse('invoice-filter'), data={"ordering": "concept"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid ordering", response.json()["error"])
+
+    def test_filter_invoices_invalid_amount(self):
+        # Act
+        response = self.client.get(reverse('invoice-filter'), data={"max_amount": "abc"})
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid max_amount", response.json()["error"])
+
+    def test_generate_accounting_entries_batch_streams_ndjson_for_ids(self):
+        # Arrange
+        other_invoice = InvoiceModel.objects.create(**self.valid_payload)
+
+        # Act
+        response = self.client.get(reverse("invoice-accounting-entries-batch"), data={"ids": f"{self.invoice.id},{other_invoice.id}"})
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(lines[0], {
+            "invoice_id": self.invoice.id,
+            "date": "2025-02-10",
+            "account": AccountingCodes.PURCHASES.value,
+            "description": AccountingCodes.PURCHASES.label,
+            "amount": "100.00",
+        })
+        self.assertEqual(lines[-1]["summary"]["invoices"], 2)
+        self.assertEqual(lines[-1]["summary"]["entries"], 6)
+
+    def test_generate_accounting_entries_batch_exports_csv_for_filter(self):
+        # Arrange
+        InvoiceModel.objects.create(**{**self.valid_payload, "state": InvoiceStates.PAID.value})
+
+        # Act
+        response = self.client.get(
+            reverse("invoice-accounting-entries-batch"),
+            data={"state": InvoiceStates.PENDING.value, "output": "csv"}
+        )
+        rows = b"".join(response.streaming_content).decode().splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(rows[0], "invoice_id,date,account,description,amount")
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[3], f"{self.invoice.id},2025-02-10,{AccountingCodes.SUPPLIERS.value},{AccountingCodes.SUPPLIERS.label},120.00")
+
+    def test_generate_accounting_entries_batch_accepts_posted_ids(self):
+        # Act
+        response = self.client.post(
+            reverse("invoice-accounting-entries-batch"),
+            data=json.dumps({"ids": [self.invoice.id]}),
+            content_type="application/json"
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lines), 4)
+
+    def test_generate_accounting_entries_batch_rejects_invalid_input(self):
+        # Act
+        invalid_ids = self.client.get(reverse("invoice-accounting-entries-batch"), data={"ids": "1,abc"})
+        invalid_output = self.client.get(reverse("invoice-accounting-entries-batch"), data={"output": "xml"})
+
+        # Assert
+        self.assertEqual(invalid_ids.status_code, 400)
+        self.assertEqual(invalid_output.status_code, 400)
+        self.assertIn("Invalid format", invalid_output.json()["error"])
@@ -0,0 +1,38 @@
+import json
+from django.test import SimpleTestCase
+from InvoicesAccounting.app.parsers.json_array_stream import JsonArrayStreamError, iter_json_array
+
+class JsonArrayStreamTest(SimpleTestCase):
+
+    def split(self, payload: bytes, size: int):
+        return [payload[index:index + size] for index in range(0, len(payload), size)]
+
+    def test_parses_elements_across_any_chunk_boundary(self):
+        # Arrange
+        elements = [{"id": index, "concept": "Concepto ü" * index, "total_value": "121.00"} for index in range(20)]
+        elements += [123, 45.6, True, None]
+        payload = json.dumps(elements).encode()
+
+        for size in (1, 2, 5, 64, len(payload)):
+            # Act
+            parsed = list(iter_json_array(self.split(payload, size)))
+
+            # Assert
+            self.assertEqual(parsed, elements)
+
+    def test_yields_elements_before_the_array_is_complete(self):
+        # Arrange
+        chunks = iter([b'[{"id": 1}, ', b'{"id": 2}'])
+        stream = iter_json_array(chunks)
+
+        # Act
+        first = next(stream)
+
+        # Assert
+        self.assertEqual(first, {"id": 1})
+
+    def test_rejects_malformed_arrays(self):
+        for payload in (b'{"id": 1}', b'[1,]', b'[1 2]', b'[1', b'[1] 2'):
+            # Act / Assert
+            with self.assertRaises(JsonArrayStreamError):
+                list(iter_json_array([payload]))
@@ -0,0 +1,57 @@
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import skipIf
+from django.test import TestCase, override_settings
+from InvoicesAccounting.app.renderers.json_renderer import FastJsonResponse, JSON_ENCODERS, dumps, get_encoder, orjson, to_money
+
+class JsonRendererTest(TestCase):
+
+    def setUp(self):
+        self.payload = {"id": 1, "base_value": Decimal("100.00"), "date": date(2025, 2, 10), "provider": "Proveedor Ñ"}
+
+    def test_every_encoder_renders_money_as_strings_and_dates_as_iso(self):
+        for name in JSON_ENCODERS:
+            with self.subTest(encoder=name):
+                # Act
+                rendered = json.loads(get_encoder(name)(self.payload))
+
+                # Assert
+                self.assertEqual(rendered, {"id": 1, "base_value": "100.00", "date": "2025-02-10", "provider": "Proveedor Ñ"})
+
+    @override_settings(JSON_RENDERER="stdlib")
+    def test_renderer_setting_selects_the_encoder(self):
+        # Act
+        rendered = dumps(self.payload)
+
+        # Assert
+        self.assertEqual(rendered, JSON_ENCODERS["stdlib"](self.payload))
+
+    @skipIf(orjson is None, "orjson is not installed")
+    @override_settings(JSON_RENDERER="auto")
+    def test_auto_prefers_orjson(self):
+        # Assert
+        self.assertIs(get_encoder(), JSON_ENCODERS["orjson"])
+
+    def test_unknown_encoder_is_rejected(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            get_encoder("yaml")
+
+    def test_to_money_quantizes_to_cents(self):
+        # Assert
+        self.assertEqual(str(to_money(100)), "100.00")
+        self.assertEqual(str(to_money(21.5)), "21.50")
+        self.assertEqual(str(to_money("121.005")), "121.00")
+
+    def test_response_behaves_like_json_response(self):
+        # Act
+        response = FastJsonResponse([self.payload], safe=False, status=201)
+
+        # Assert
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content)[0]["base_value"], "100.00")
+
+        with self.assertRaises(TypeError):
+            FastJsonResponse([self.payload])
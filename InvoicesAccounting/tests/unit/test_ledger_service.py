@@ -0,0 +1,150 @@
+import importlib
+from datetime import date
+from decimal import Decimal
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from InvoicesAccounting.app.enums.accounting_codes import AccountingCodes
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.accounting_entry_model import AccountingEntryModel
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+from InvoicesAccounting.app.services.ledger_service import LedgerService
+
+class LedgerServiceTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=Decimal("100.00"),
+            vat=Decimal("21.00"),
+            total_value=Decimal("121.00"),
+            date=date(2025, 2, 10),
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def build_row(self, **overrides):
+        return {
+            "provider": "Provider B",
+            "concept": "Synced Concept",
+            "base_value": Decimal("200.00"),
+            "vat": Decimal("42.00"),
+            "total_value": Decimal("242.00"),
+            "date": date(2025, 3, 1),
+            "state": InvoiceStates.PAID.value,
+            **overrides,
+        }
+
+    def test_saving_an_invoice_writes_its_ledger_entries(self):
+        # Act
+        entries = LedgerService.entries_for_invoice(self.invoice.id)
+
+        # Assert
+        self.assertEqual(entries, self.invoice.accounting_entries())
+        self.assertEqual(AccountingEntryModel.objects.filter(invoice=self.invoice).count(), 3)
+
+    def test_updating_an_invoice_refreshes_its_ledger_entries(self):
+        # Act
+        self.invoice.total_value = Decimal("150.00")
+        self.invoice.save()
+
+        # Assert
+        entry = AccountingEntryModel.objects.get(invoice=self.invoice, account=AccountingCodes.SUPPLIERS.value)
+        self.assertEqual(entry.amount, Decimal("150.00"))
+        self.assertEqual(AccountingEntryModel.objects.filter(invoice=self.invoice).count(), 3)
+
+    def test_deleting_an_invoice_removes_its_ledger_entries(self):
+        # Act
+        self.invoice.delete()
+
+        # Assert
+        self.assertFalse(AccountingEntryModel.objects.exists())
+
+    def test_bulk_sync_maintains_the_ledger(self):
+        # Arrange
+        rows = [
+            self.build_row(id=self.invoice.id, total_value=Decimal("130.00")),
+            self.build_row(id=self.invoice.id + 100),
+        ]
+
+        # Act
+        InvoiceSyncService().sync(rows)
+
+        # Assert
+        self.assertEqual(AccountingEntryModel.objects.count(), 6)
+        updated = AccountingEntryModel.objects.get(invoice_id=self.invoice.id, account=AccountingCodes.SUPPLIERS.value)
+        self.assertEqual(updated.amount, Decimal("130.00"))
+
+    def test_rebuild_recreates_missing_entries(self):
+        # Arrange
+        AccountingEntryModel.objects.all().delete()
+
+        # Act
+        written = LedgerService(batch_size=1).rebuild()
+
+        # Assert
+        self.assertEqual(written, 3)
+        self.assertEqual(LedgerService.entries_for_invoice(self.invoice.id), self.invoice.accounting_entries())
+
+    def test_trial_balance_balances_debits_and_credits(self):
+        # Arrange
+        InvoiceModel.objects.create(**self.build_row())
+
+        # Act
+        balance = LedgerService.trial_balance()
+
+        # Assert
+        self.assertTrue(balance["balanced"])
+        self.assertEqual(balance["total_debit"], "363.00")
+        self.assertEqual(balance["total_credit"], "363.00")
+
+    def test_trial_balance_endpoint_respects_date_range(self):
+        # Arrange
+        InvoiceModel.objects.create(**self.build_row())
+
+        # Act
+        response = self.client.get(reverse("accounting-trial-balance"), {"start_date": "2025-03-01", "end_date": "2025-03-31"})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_credit"], "242.00")
+
+    def test_ledger_endpoint_pages_entries_of_one_account(self):
+        # Arrange
+        InvoiceModel.objects.create(**self.build_row())
+        url = reverse("accounting-ledger", args=[AccountingCodes.PURCHASES.value])
+
+        # Act
+        first_page = self.client.get(url, {"limit": 1}).json()
+        second_page = self.client.get(url, {"limit": 1, "cursor": first_page["next_cursor"]}).json()
+
+        # Assert
+        self.assertEqual([entry["amount"] for entry in first_page["results"]], ["100.00"])
+        self.assertEqual([entry["amount"] for entry in second_page["results"]], ["200.00"])
+        self.assertIsNone(second_page["next_cursor"])
+
+    def test_ledger_endpoint_rejects_unknown_accounts(self):
+        # Act
+        response = self.client.get(reverse("accounting-ledger", args=["9999"]))
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    def test_migration_backfills_the_ledger_of_existing_invoices(self):
+        # Arrange
+        migration = importlib.import_module("InvoicesAccounting.migrations.0012_backfill_accounting_ledger")
+        AccountingEntryModel.objects.all().delete()
+
+        # Act
+        migration.backfill_accounting_ledger(apps, connection.schema_editor())
+
+        # Assert
+        self.assertEqual(LedgerService.entries_for_invoice(self.invoice.id), self.invoice.accounting_entries())
@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.metrics.invoice_metrics import endpoint_template, metrics_registry
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.invoice_sync_service import InvoiceSyncService
+
+class MetricsEndpointTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        metrics_registry.clear()
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100,
+            vat=21,
+            total_value=121,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def test_metrics_are_served_as_prometheus_text(self):
+        # Act
+        response = self.client.get(reverse("metrics"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        self.assertIn("# TYPE http_request_duration_seconds histogram", response.content.decode())
+
+    def test_requests_are_counted_by_route_not_path(self):
+        # Arrange
+        self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Act
+        output = self.client.get(reverse("metrics")).content.decode()
+
+        # Assert
+        self.assertIn('http_requests_total{method="GET",route="invoices/<int:invoice_id>/",status="200"} 1.0', output)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="invoices/<int:invoice_id>/"} 1.0', output)
+
+    @patch("httpx.Client.get")
+    def test_upstream_cache_and_breaker_metrics_are_exposed(self, mock_get):
+        # Arrange
+        mock_get.return_value = MagicMock(status_code=200, headers={})
+        mock_get.return_value.json.return_value = {"id": 999, "provider": "Remote"}
+        self.client.get(reverse("invoice-detail", args=[999]))
+
+        # Act
+        output = self.client.get(reverse("metrics")).content.decode()
+
+        # Assert
+        self.assertIn('upstream_requests_total{endpoint="invoices/{id}/",method="GET",status="200"} 1.0', output)
+        self.assertIn('invoice_cache_lookups_total{result="miss"}', output)
+        self.assertIn("# TYPE invoice_cache_hit_ratio gauge", output)
+        self.assertIn("# TYPE upstream_circuit_state gauge", output)
+        self.assertIn("db_connections_open", output)
+
+    def test_sync_rows_are_counted_by_result(self):
+        # Arrange
+        row = {
+            "provider": "Provider B",
+            "concept": "Synced",
+            "base_value": Decimal("100.00"),
+            "vat": Decimal("21.00"),
+            "total_value": Decimal("121.00"),
+            "date": date(2025, 2, 10),
+            "state": InvoiceStates.PENDING.value,
+        }
+        InvoiceSyncService().sync([row, {**row, "id": self.invoice.id}])
+
+        # Act
+        output = self.client.get(reverse("metrics")).content.decode()
+
+        # Assert
+        self.assertIn('invoice_sync_rows_total{result="inserted"} 1.0', output)
+        self.assertIn('invoice_sync_rows_total{result="updated"} 1.0', output)
+        self.assertIn("invoice_sync_batch_duration_seconds_count 1.0", output)
+
+    def test_endpoint_template_collapses_ids(self):
+        # Act / Assert
+        self.assertEqual(endpoint_template("invoices/42/"), "invoices/{id}/")
+        self.assertEqual(endpoint_template("/invoices/42/accounting-entries/?page=2"), "invoices/{id}/accounting-entries/")
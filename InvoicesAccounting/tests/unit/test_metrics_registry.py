@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+from django.test import SimpleTestCase
+from InvoicesAccounting.app.metrics.metrics_registry import MetricsRegistry
+
+class MetricsRegistryTest(SimpleTestCase):
+
+    def setUp(self):
+        # Arrange
+        self.registry = MetricsRegistry()
+
+    def test_counters_render_in_prometheus_text_format(self):
+        # Arrange
+        requests = self.registry.counter("requests_total", "Requests served.", ["route", "status"])
+        requests.inc(route="invoices/", status=200)
+        requests.inc(2, route="invoices/", status=200)
+        requests.inc(route='say "hi"', status=404)
+
+        # Act
+        output = self.registry.render()
+
+        # Assert
+        self.assertIn("# HELP requests_total Requests served.\n# TYPE requests_total counter\n", output)
+        self.assertIn('requests_total{route="invoices/",status="200"} 3.0\n', output)
+        self.assertIn('requests_total{route="say \\"hi\\"",status="404"} 1.0\n', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        # Arrange
+        duration = self.registry.histogram("duration_seconds", "Durations.", ["route"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            duration.observe(value, route="a")
+
+        # Act
+        output = self.registry.render()
+
+        # Assert
+        self.assertIn('duration_seconds_bucket{route="a",le="0.1"} 2.0\n', output)
+        self.assertIn('duration_seconds_bucket{route="a",le="1.0"} 3.0\n', output)
+        self.assertIn('duration_seconds_bucket{route="a",le="+Inf"} 4.0\n', output)
+        self.assertIn('duration_seconds_sum{route="a"} 2.65\n', output)
+        self.assertIn('duration_seconds_count{route="a"} 4.0\n', output)
+
+    def test_wrong_labels_are_rejected(self):
+        # Arrange
+        requests = self.registry.counter("requests_total", "Requests served.", ["route"])
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            requests.inc(status=200)
+
+    def test_registering_a_name_twice_returns_the_same_metric(self):
+        # Act
+        first = self.registry.counter("requests_total", "Requests served.")
+        second = self.registry.counter("requests_total", "Requests served.")
+
+        # Assert
+        self.assertIs(first, second)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests_total", "Requests served.")
+
+    def test_multiprocess_files_are_merged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            registry = MetricsRegistry(directory)
+            registry.counter("requests_total", "Requests served.", ["route"]).inc(2, route="a")
+            registry.histogram("duration_seconds", "Durations.", buckets=(1.0,)).observe(0.5)
+            registry.gauge("queue_depth", "Queue depth.", aggregation="max").set(3)
+
+            # Another worker that already flushed its samples
+            with open(os.path.join(directory, "metrics-1.json"), "w") as output:
+                json.dump({"pid": 1, "families": [
+                    {"name": "requests_total", "kind": "counter", "help": "Requests served.", "samples": [[{"route": "a"}, 5]]},
+                    {"name": "duration_seconds", "kind": "histogram", "help": "Durations.", "bounds": [1.0],
+                     "samples": [[{}, {"buckets": [0, 1], "sum": 4.0, "count": 1}]]},
+                    {"name": "queue_depth", "kind": "gauge", "help": "Queue depth.", "aggregation": "max", "samples": [[{}, 7]]},
+                ]}, output)
+
+            # Act
+            output = registry.render()
+
+            # Assert
+            self.assertIn('requests_total{route="a"} 7.0\n', output)
+            self.assertIn('duration_seconds_bucket{le="1.0"} 1.0\n', output)
+            self.assertIn('duration_seconds_bucket{le="+Inf"} 2.0\n', output)
+            self.assertIn("duration_seconds_count 2.0\n", output)
+            self.assertIn("queue_depth 7.0\n", output)
+            self.assertTrue(os.path.exists(os.path.join(directory, f"metrics-{os.getpid()}.json")))
+
+    def test_derived_families_are_computed_after_merging(self):
+        # Arrange
+        lookups = self.registry.counter("lookups_total", "Lookups.", ["result"])
+        lookups.inc(3, result="hit")
+        lookups.inc(result="miss")
+        self.registry.register_derived(lambda families: [{
+            "name": "hit_ratio",
+            "kind": "gauge",
+            "help": "Hit ratio.",
+            "samples": [[{}, families["lookups_total"]["samples"][0][1] / 4]],
+        }])
+
+        # Act
+        output = self.registry.render()
+
+        # Assert
+        self.assertIn("hit_ratio 0.75\n", output)
@@ -0,0 +1,121 @@
+import re
+from unittest.mock import MagicMock, patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.instrumentation.request_metrics import current_metrics, install_query_timer, time_query, timed
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+
+def timing_entries(response) -> dict:
+    return {
+        match.group(1): (float(match.group(2)), match.group(3))
+        for match in re.finditer(r'(\w+);dur=([\d.]+)(?:;desc="(\d+)")?', response["Server-Timing"])
+    }
+
+class PerformanceMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100,
+            vat=21,
+            total_value=121,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def test_server_timing_reports_queries_rendering_and_total(self):
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        entries = timing_entries(response)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db", entries)
+        self.assertGreaterEqual(int(entries["db"][1]), 1)
+        self.assertEqual(entries["render"][1], "1")
+        self.assertIn("total", entries)
+
+    @patch("httpx.Client.get")
+    def test_upstream_calls_are_counted(self, mock_get):
+        # Arrange
+        mock_get.return_value = MagicMock(status_code=200, headers={})
+        mock_get.return_value.json.return_value = {"id": 999, "provider": "Remote"}
+
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[999]))
+
+        # Assert
+        self.assertEqual(timing_entries(response)["upstream"][1], "1")
+
+    @patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.create_invoice")
+    def test_validation_is_timed(self, mock_create_invoice):
+        # Arrange
+        self.client.force_login(User.objects.create_user(username="perf", password="secret"))
+        payload = {**self.invoice.to_dict(), "id": None}
+        mock_create_invoice.return_value = {"id": 2}
+
+        # Act
+        response = self.client.post(reverse("invoice-create"), payload, content_type="application/json")
+
+        # Assert
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(timing_entries(response)["validation"][1], "1")
+
+    async def test_async_view_queries_are_counted(self):
+        # Act
+        response = await self.async_client.get(reverse("async-invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        self.assertGreaterEqual(int(timing_entries(response)["db"][1]), 1)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged_with_their_phases(self):
+        # Act
+        with self.assertLogs("InvoicesAccounting.app.middleware.performance_middleware", level="WARNING") as logs:
+            self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        record = logs.records[0].performance
+        self.assertEqual(record["view"], "invoice-detail")
+        self.assertEqual(record["status"], 200)
+        self.assertIn("db", record["phases"])
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_can_be_disabled(self):
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        self.assertNotIn("Server-Timing", response)
+
+    def test_timed_is_a_no_op_outside_requests(self):
+        # Act
+        with timed("db"):
+            pass
+
+        # Assert
+        self.assertIsNone(current_metrics())
+
+    def test_query_timer_installed_inside_an_execute_wrapper_survives_it(self):
+        # Arrange
+        def count_queries(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        connection.ensure_connection()
+        connection.execute_wrappers[:] = [wrapper for wrapper in connection.execute_wrappers if wrapper is not time_query]
+
+        # Act
+        with connection.execute_wrapper(count_queries):
+            install_query_timer(connection)
+
+        # Assert
+        self.assertIn(time_query, connection.execute_wrappers)
+        self.assertNotIn(count_queries, connection.execute_wrappers)
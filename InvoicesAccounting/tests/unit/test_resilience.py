@@ -0,0 +1,195 @@
+import json
+from unittest.mock import patch
+import httpx
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.async_invoice_service import AsyncInvoiceService
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.resilience import CircuitBreaker, CircuitOpenError, circuit_breakers
+
+@override_settings(PAYMENT_API_RETRY_BACKOFF=1, PAYMENT_API_RETRY_BACKOFF_MAX=4, PAYMENT_API_MAX_RETRIES=2, PAYMENT_API_BREAKER_FAILURES=2)
+class ResilienceTest(TestCase):
+
+    def setUp(self):
+        circuit_breakers.reset()
+        self.client = Client()
+        self.requests = []
+        self.delays = []
+
+    def tearDown(self):
+        circuit_breakers.reset()
+
+    def build_handler(self, responses):
+        def handler(request):
+            self.requests.append(request)
+            response = responses[min(len(self.requests), len(responses)) - 1]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        return handler
+
+    def build_service(self, responses):
+        service = InvoiceService(base_url="http://upstream.test/")
+        service.client = httpx.Client(base_url="http://upstream.test/", transport=httpx.MockTransport(self.build_handler(responses)))
+        service.sleep = self.delays.append
+        return service
+
+    def build_async_service(self, responses):
+        async def sleep(delay):
+            self.delays.append(delay)
+
+        handler = self.build_handler(responses)
+
+        async def async_handler(request):
+            return handler(request)
+
+        service = AsyncInvoiceService(base_url="http://upstream.test/")
+        service.client = httpx.AsyncClient(base_url="http://upstream.test/", transport=httpx.MockTransport(async_handler))
+        service.sleep = sleep
+        return service
+
+    def test_idempotent_calls_are_retried_on_server_errors(self):
+        # Arrange
+        service = self.build_service([httpx.Response(503), httpx.ConnectError("refused"), httpx.Response(200, json={"id": 1})])
+
+        # Act
+        invoice = service.get_invoice(1)
+
+        # Assert
+        self.assertEqual(invoice, {"id": 1})
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(len(self.delays), 2)
+        self.assertTrue(0 <= self.delays[0] <= 1 and 0 <= self.delays[1] <= 2)
+        self.assertEqual(service.breaker.stats()["retries"], 2)
+        self.assertEqual(service.breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_async_idempotent_calls_are_retried_on_server_errors(self):
+        # Arrange
+        service = self.build_async_service([httpx.Response(502), httpx.Response(200, json={"id": 1})])
+
+        # Act
+        invoice = await service.get_invoice(1)
+        await service.client.aclose()
+
+        # Assert
+        self.assertEqual(invoice, {"id": 1})
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(len(self.delays), 1)
+
+    def test_creates_are_never_retried(self):
+        # Arrange
+        service = self.build_service([httpx.Response(503)])
+
+        # Act / Assert
+        with self.assertRaises(httpx.HTTPStatusError):
+            service.create_invoice({
+                "provider": "Provider A", "concept": "New", "base_value": "100.00", "vat": "21.00",
+                "total_value": "121.00", "date": "2025-02-10", "state": InvoiceStates.PENDING.value,
+            })
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.delays, [])
+
+    def test_bulk_updates_send_partial_items_as_given(self):
+        # Arrange
+        service = self.build_service([httpx.Response(200, json=[{"id": 1}, {"id": 2}])])
+
+        # Act
+        result = service.bulk_update_invoices([{"id": 1, "state": InvoiceStates.PAID.value}, {"id": 2, "concept": "Renamed"}])
+
+        # Assert
+        self.assertEqual(result, [{"id": 1}, {"id": 2}])
+        self.assertEqual(self.requests[0].method, "PUT")
+        self.assertEqual(json.loads(self.requests[0].content), [{"id": 1, "state": InvoiceStates.PAID.value}, {"id": 2, "concept": "Renamed"}])
+
+    def test_bulk_deletes_are_sent_with_retries(self):
+        # Arrange
+        service = self.build_service([httpx.Response(503), httpx.Response(200, json={})])
+
+        # Act
+        result = service.bulk_delete_invoices([1, 2])
+
+        # Assert
+        self.assertEqual(result, {"message": "2 invoices deleted successfully", "deleted": 2})
+        self.assertEqual([request.method for request in self.requests], ["DELETE", "DELETE"])
+        self.assertEqual(json.loads(self.requests[1].content), {"ids": [1, 2]})
+
+    def test_breaker_opens_and_fails_fast(self):
+        # Arrange
+        service = self.build_service([httpx.ConnectError("refused")])
+
+        # Act
+        for _ in range(2):
+            with self.assertRaises(httpx.ConnectError):
+                service.get_invoice(1)
+
+        # Assert
+        with self.assertRaises(CircuitOpenError):
+            service.get_invoice(1)
+
+        self.assertEqual(len(self.requests), 6)
+        self.assertEqual(service.breaker.stats()["rejected"], 1)
+
+    def test_half_open_breaker_closes_after_a_successful_probe(self):
+        # Arrange
+        breaker = CircuitBreaker("probe", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        # Act
+        allowed = breaker.allow()
+        breaker.record_success()
+
+        # Assert
+        self.assertTrue(allowed)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_filter_serves_local_invoices_while_breaker_is_open(self):
+        # Arrange
+        invoice = InvoiceModel.objects.create(
+            provider="Provider A", concept="Local", base_value=100, vat=21, total_value=121,
+            date="2025-02-10", state=InvoiceStates.PENDING.value,
+        )
+        breaker = circuit_breakers.get(InvoiceService.BASE_URL)
+        for _ in range(2):
+            breaker.record_failure()
+
+        # Act
+        with patch("InvoicesAccounting.resources.views.invoice_view.InvoiceService.filter_invoices") as mock_filter:
+            response = self.client.get(reverse("invoice-filter"))
+
+        # Assert
+        self.assertEqual([row["id"] for row in response.json()], [invoice.id])
+        mock_filter.assert_not_called()
+
+        health = self.client.get(reverse("upstream-health"))
+        self.assertEqual(health.status_code, 503)
+        self.assertEqual(health.json()["breakers"][0]["state"], CircuitBreaker.OPEN)
+
+    async def test_async_filter_serves_local_invoices_while_breaker_is_open(self):
+        # Arrange
+        breaker = circuit_breakers.get(AsyncInvoiceService.BASE_URL)
+        for _ in range(2):
+            breaker.record_failure()
+
+        # Act
+        with patch("InvoicesAccounting.resources.views.async_invoice_view.AsyncInvoiceService.filter_invoices") as mock_filter:
+            response = await self.async_client.get(reverse("async-invoice-filter"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        mock_filter.assert_not_called()
+
+    def test_open_breaker_returns_503_from_views(self):
+        # Arrange
+        breaker = circuit_breakers.get(InvoiceService.BASE_URL)
+        for _ in range(2):
+            breaker.record_failure()
+
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[999]))
+
+        # Assert
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from django.test import TestCase
+from InvoicesAccounting.app.services.async_invoice_service import AsyncInvoiceService
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.single_flight import SingleFlight
+
+class SingleFlightTest(TestCase):
+
+    def run_threads(self, target, count=8):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_one_execution(self):
+        # Arrange
+        flight = SingleFlight()
+        func = MagicMock(side_effect=lambda: time.sleep(0.05) or {"id": 1})
+
+        # Act
+        results = self.run_threads(lambda: flight.do("invoice:1", func))
+
+        # Assert
+        func.assert_called_once()
+        self.assertEqual(results, [{"id": 1}] * 8)
+        self.assertEqual(flight.stats(), {"executed": 1, "shared": 7})
+
+    def test_errors_are_shared_and_not_cached(self):
+        # Arrange
+        flight = SingleFlight()
+        errors = []
+
+        def fail():
+            time.sleep(0.05)
+            raise ValueError("Upstream down")
+
+        def call():
+            try:
+                flight.do("invoice:1", fail)
+            except ValueError as e:
+                errors.append(e)
+
+        # Act
+        self.run_threads(call, count=4)
+        result = flight.do("invoice:1", lambda: "recovered")
+
+        # Assert
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(result, "recovered")
+
+    def test_different_keys_run_separately(self):
+        # Arrange
+        flight = SingleFlight()
+
+        # Act
+        first = flight.do("invoice:1", lambda: 1)
+        second = flight.do("invoice:2", lambda: 2)
+
+        # Assert
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(flight.stats()["executed"], 2)
+
+    async def test_async_calls_share_one_task(self):
+        # Arrange
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        # Act
+        results = await asyncio.gather(*(flight.ado("invoice:1", fetch) for _ in range(5)))
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"id": 1}] * 5)
+
+    @patch("httpx.Client.get")
+    def test_invoice_service_coalesces_identical_detail_fetches(self, mock_get):
+        # Arrange
+        def get(url, **kwargs):
+            time.sleep(0.05)
+            response = MagicMock(status_code=200, headers={})
+            response.json.return_value = {"id": 1}
+            return response
+
+        mock_get.side_effect = get
+
+        # Act
+        results = self.run_threads(lambda: InvoiceService().get_invoice(1))
+
+        # Assert
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(results, [{"id": 1}] * 8)
+
+    @patch("httpx.AsyncClient.get", new_callable=AsyncMock)
+    async def test_async_invoice_service_coalesces_accounting_entries(self, mock_get):
+        # Arrange
+        async def get(url, **kwargs):
+            await asyncio.sleep(0.01)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"entries": [{"account": "6000", "description": "Purchases", "amount": "100.00"}]}
+            return response
+
+        mock_get.side_effect = get
+
+        # Act
+        results = await asyncio.gather(*(AsyncInvoiceService().generate_accounting_entries(1) for _ in range(4)))
+
+        # Assert
+        self.assertEqual(mock_get.await_count, 1)
+        self.assertEqual(results[0]["entries"][0]["amount"], Decimal("100.00"))
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+import httpx
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from InvoicesAccounting.app.enums.invoice_states import InvoiceStates
+from InvoicesAccounting.app.models.invoice_model import InvoiceModel
+from InvoicesAccounting.app.services.http_client_registry import http_client_registry
+from InvoicesAccounting.app.services.invoice_service import InvoiceService
+from InvoicesAccounting.app.services.resilience import circuit_breakers
+from InvoicesAccounting.app.tracing.span_exporters import FileSpanExporter, build_exporter
+from InvoicesAccounting.app.tracing.tracer import Sampler, inject_traceparent, install_query_tracer, parse_traceparent, trace_query, traced, tracer
+
+TRACED_BASE_URL = "http://traced-payment-api.test/"
+INCOMING_TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+def spans_by_name(spans) -> dict:
+    return {span["name"]: span for span in spans}
+
+@override_settings(TRACING_ENABLED=True)
+class TracingTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        circuit_breakers.reset()
+        tracer.exporter.clear()
+        self.sampler = tracer.sampler
+        tracer.sampler = Sampler(1.0)
+
+        # Arrange
+        self.invoice = InvoiceModel.objects.create(
+            provider="Provider A",
+            concept="Test Concept",
+            base_value=100,
+            vat=21,
+            total_value=121,
+            date="2025-02-10",
+            state=InvoiceStates.PENDING.value,
+        )
+
+    def tearDown(self):
+        tracer.sampler = self.sampler
+        client = http_client_registry.register(TRACED_BASE_URL, None)
+        if client is not None:
+            client.close()
+
+    @patch("httpx.Client.get")
+    def test_request_spans_nest_view_service_upstream_and_sql(self, mock_get):
+        # Arrange
+        mock_get.return_value = MagicMock(status_code=200, headers={})
+        mock_get.return_value.json.return_value = {"id": 999, "provider": "Remote"}
+
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[999]))
+
+        # Assert
+        spans = tracer.exporter.spans()
+        named = spans_by_name(spans)
+        server = named["GET invoices/<int:invoice_id>/"]
+        view = named["get_invoice_detail"]
+        service = named["InvoiceService.get_invoice"]
+        upstream = named["HTTP GET"]
+
+        self.assertEqual(response["X-Trace-Id"], server["trace_id"])
+        self.assertEqual({span["trace_id"] for span in spans}, {server["trace_id"]})
+        self.assertIsNone(server["parent_id"])
+        self.assertEqual(view["parent_id"], server["span_id"])
+        self.assertEqual(service["parent_id"], view["span_id"])
+        self.assertEqual(upstream["parent_id"], service["span_id"])
+        self.assertEqual(upstream["attributes"]["http.status_code"], 200)
+        self.assertEqual(server["attributes"]["http.status_code"], 200)
+        self.assertTrue(any(span["name"] == "SQL SELECT" and span["kind"] == "client" for span in spans))
+
+    def test_incoming_traceparent_continues_the_trace(self):
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[self.invoice.id]), HTTP_TRACEPARENT=INCOMING_TRACEPARENT)
+
+        # Assert
+        server = spans_by_name(tracer.exporter.spans())["GET invoices/<int:invoice_id>/"]
+        self.assertEqual(response["X-Trace-Id"], "4bf92f3577b34da6a3ce929d0e0e4736")
+        self.assertEqual(server["trace_id"], "4bf92f3577b34da6a3ce929d0e0e4736")
+        self.assertEqual(server["parent_id"], "00f067aa0ba902b7")
+
+    def test_unsampled_traces_are_not_exported(self):
+        # Act
+        response = self.client.get(
+            reverse("invoice-detail", args=[self.invoice.id]),
+            HTTP_TRACEPARENT=INCOMING_TRACEPARENT[:-2] + "00",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Trace-Id"], "4bf92f3577b34da6a3ce929d0e0e4736")
+        self.assertEqual(tracer.exporter.spans(), [])
+
+    @override_settings(TRACING_ENABLED=False)
+    def test_disabled_tracing_records_nothing(self):
+        # Act
+        response = self.client.get(reverse("invoice-detail", args=[self.invoice.id]))
+
+        # Assert
+        self.assertNotIn("X-Trace-Id", response)
+        self.assertEqual(tracer.exporter.spans(), [])
+
+    def test_traceparent_is_propagated_to_upstream(self):
+        # Arrange
+        received = []
+
+        def handler(request):
+            received.append(request.headers.get("traceparent"))
+            return httpx.Response(200, json={"id": 1})
+
+        http_client_registry.register(TRACED_BASE_URL, httpx.Client(
+            base_url=TRACED_BASE_URL,
+            transport=httpx.MockTransport(handler),
+            event_hooks={"request": [inject_traceparent]},
+        ))
+
+        # Act
+        with tracer.start_span("job"):
+            InvoiceService(base_url=TRACED_BASE_URL).get_invoice(1)
+
+        # Assert
+        upstream = spans_by_name(tracer.exporter.spans())["HTTP GET"]
+        self.assertEqual(received, [f"00-{upstream['trace_id']}-{upstream['span_id']}-01"])
+        self.assertEqual(upstream["attributes"]["http.url"], f"{TRACED_BASE_URL}invoices/1/")
+
+    def test_stream_sync_is_traced_and_retried_like_other_upstream_calls(self):
+        # Arrange
+        received = []
+        body = json.dumps([{
+            "id": 7, "provider": "Provider A", "concept": "Concept", "base_value": "100.00", "vat": "21.00",
+            "total_value": "121.00", "date": "2025-02-10", "state": InvoiceStates.PENDING.value,
+        }]).encode()
+
+        def handler(request):
+            received.append(request.headers.get("traceparent"))
+            if len(received) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, stream=httpx.ByteStream(body))
+
+        http_client_registry.register(TRACED_BASE_URL, httpx.Client(
+            base_url=TRACED_BASE_URL,
+            transport=httpx.MockTransport(handler),
+            event_hooks={"request": [inject_traceparent]},
+        ))
+        service = InvoiceService(base_url=TRACED_BASE_URL)
+        service.sleep = lambda delay: None
+
+        # Act
+        report = service.stream_sync_invoices()
+
+        # Assert
+        spans = spans_by_name(tracer.exporter.spans())
+        upstream = spans["HTTP GET"]
+        self.assertEqual(report.inserted, 1)
+        self.assertEqual(upstream["parent_id"], spans["InvoiceService.stream_sync_invoices"]["span_id"])
+        self.assertEqual(upstream["attributes"]["http.status_code"], 200)
+        self.assertEqual(received, [f"00-{upstream['trace_id']}-{upstream['span_id']}-01"] * 2)
+        self.assertEqual(service.breaker.stats()["retries"], 1)
+
+    def test_built_clients_inject_traceparent(self):
+        # Act
+        client = http_client_registry.build_client(TRACED_BASE_URL)
+
+        # Assert
+        self.assertIn(inject_traceparent, client.event_hooks["request"])
+        client.close()
+
+    def test_async_functions_keep_their_parent(self):
+        # Arrange
+        @traced
+        async def child():
+            return tracer.current_span().name
+
+        async def run():
+            with tracer.start_span("root"):
+                return await asyncio.gather(child(), child())
+
+        # Act
+        names = asyncio.run(run())
+
+        # Assert
+        spans = spans_by_name(tracer.exporter.spans())
+        self.assertEqual(names, [child.__qualname__] * 2)
+        self.assertEqual(spans[child.__qualname__]["parent_id"], spans["root"]["span_id"])
+
+    def test_errors_mark_the_span(self):
+        # Act
+        with self.assertRaises(RuntimeError):
+            with tracer.start_span("failing"):
+                raise RuntimeError("boom")
+
+        # Assert
+        span = tracer.exporter.spans()[0]
+        self.assertEqual(span["status"], "error")
+        self.assertEqual(span["error"], "RuntimeError: boom")
+
+    def test_spans_beyond_the_trace_limit_are_dropped(self):
+        # Arrange
+        max_spans = tracer.max_spans_per_trace
+        tracer.max_spans_per_trace = 3
+
+        # Act
+        try:
+            with tracer.start_span("root"):
+                for index in range(5):
+                    with tracer.start_span(f"child-{index}"):
+                        pass
+        finally:
+            tracer.max_spans_per_trace = max_spans
+
+        # Assert
+        spans = spans_by_name(tracer.exporter.spans())
+        self.assertEqual(len(spans), 3)
+        self.assertEqual(spans["root"]["attributes"]["tracing.dropped_spans"], 3)
+
+class TracingPrimitivesTest(TestCase):
+
+    def test_query_tracer_installed_inside_an_execute_wrapper_survives_it(self):
+        # Arrange
+        def count_queries(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        connection.ensure_connection()
+        connection.execute_wrappers[:] = [wrapper for wrapper in connection.execute_wrappers if wrapper is not trace_query]
+
+        # Act
+        with connection.execute_wrapper(count_queries):
+            install_query_tracer(connection)
+
+        # Assert
+        self.assertIn(trace_query, connection.execute_wrappers)
+        self.assertNotIn(count_queries, connection.execute_wrappers)
+
+    def test_parse_traceparent(self):
+        # Act / Assert
+        self.assertEqual(parse_traceparent(INCOMING_TRACEPARENT), ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True))
+        self.assertIsNone(parse_traceparent(None))
+        self.assertIsNone(parse_traceparent("00-xyz-00f067aa0ba902b7-01"))
+        self.assertIsNone(parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01"))
+
+    def test_sampler_follows_the_parent_and_the_rate(self):
+        # Arrange
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+        # Act / Assert
+        self.assertTrue(Sampler(1.0).should_sample(trace_id))
+        self.assertFalse(Sampler(0.0).should_sample(trace_id))
+        self.assertTrue(Sampler(0.0).should_sample(trace_id, parent_sampled=True))
+        self.assertFalse(Sampler(1.0).should_sample(trace_id, parent_sampled=False))
+        with self.assertRaises(ValueError):
+            Sampler(1.5)
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "traces.jsonl")
+            exporter = FileSpanExporter(path)
+            span = MagicMock()
+            span.as_dict.return_value = {"name": "root", "trace_id": "abc"}
+
+            # Act
+            exporter.export([span, span])
+
+            # Assert
+            with open(path) as source:
+                lines = [json.loads(line) for line in source]
+            self.assertEqual(lines, [{"name": "root", "trace_id": "abc"}] * 2)
+
+    def test_unknown_exporter_is_rejected(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            build_exporter("InvoicesAccounting.missing.Exporter")